@@ -8,12 +8,27 @@ through Spider plugin FDEP output, providing 29 powerful analysis tools.
 __version__ = "0.1.0"
 __author__ = "FDEP MCP Team"
 
-import asyncio
-from .server import main as async_main
-from .config import config
+from .config import get_config
 
 def main():
     """Entry point that handles async main function."""
-    asyncio.run(async_main())
+    # Imported here so that importing the package stays cheap
+    import asyncio
+    from .server import main as async_main
+
+    # uvloop is an optional speedup (pip install fdep-mcp-server[speedups]);
+    # fall back to the default asyncio loop where it isn't installed
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(async_main())
+    else:
+        uvloop.run(async_main())
+
+def __getattr__(name):
+    """Lazily expose the global config so importing the package doesn't load .env"""
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = ["main", "config"]
\ No newline at end of file
@@ -4,108 +4,264 @@ Configuration management for FDEP MCP Server
 
 import os
 import sys
+import stat
+import queue
+import atexit
+import threading
 import logging
-from pathlib import Path
-from typing import Optional
-from dotenv import load_dotenv
+import functools
+from types import MappingProxyType
+from logging.handlers import QueueHandler, QueueListener
+from typing import Mapping, Optional
+from urllib.parse import quote, urlunsplit
 
-# Load environment variables
-load_dotenv()
+_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+_LOG_LEVEL_NAMES = tuple(_LEVELS)
+_VALID_LOG_LEVELS = frozenset(_LOG_LEVEL_NAMES)
+
+# libpq SSL parameter names passed through as connect_args
+_SSL_KEYS = ("sslmode", "sslcert", "sslkey", "sslrootcert")
+
+def _to_bool(value: str) -> bool:
+    """Parse a "true"/"false" environment value"""
+    # Canonical spellings are decided without allocating a lowered copy
+    if value == "true" or value == "false":
+        return value == "true"
+    return value.lower() == "true"
+
+def _to_log_level(value: str) -> str:
+    """Normalize a log level name to upper case"""
+    return value if value in _VALID_LOG_LEVELS else value.upper()
+
+def _find_dotenv() -> Optional[str]:
+    """Find the nearest .env walking up from this package, like python-dotenv"""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(directory, ".env")
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+def _load_dotenv(path: Optional[str] = None):
+    """Load KEY=value lines from a .env file without overriding existing variables"""
+    path = path or _find_dotenv()
+    if not path:
+        return
+    try:
+        f = open(path, encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("export "):
+                line = line[7:]
+            key, sep, value = line.partition("=")
+            if not sep:
+                continue
+            value = value.strip()
+            if value[:1] in ("\"", "'"):
+                # A quoted value ends at its matching closing quote, so '#'
+                # inside it is kept and a trailing comment after it is dropped
+                quote = value[0]
+                end = value.find(quote, 1)
+                while quote == '"' and end > 0 and value[end - 1] == "\\":
+                    end = value.find(quote, end + 1)
+                if end > 0:
+                    value = value[1:end]
+                    if quote == '"':
+                        value = value.replace('\\"', '"')
+            elif " #" in value:
+                # Unquoted values may carry a trailing comment
+                value = value.split(" #", 1)[0].rstrip()
+            os.environ.setdefault(key.strip(), value)
 
 class Config:
     """Configuration class for FDEP MCP Server"""
     
-    def __init__(self):
-        self.load_config()
-    
-    def load_config(self):
-        """Load configuration from environment variables"""
+    # (attribute, environment variable, default, converter) for every setting;
+    # a converter of None keeps the raw string (or None when unset)
+    _SCHEMA = (
         # Database configuration
-        self.db_user = os.getenv("DB_USER", "postgres")
-        self.db_password = os.getenv("DB_PASSWORD", "postgres")
-        self.db_host = os.getenv("DB_HOST", "localhost")
-        self.db_port = int(os.getenv("DB_PORT", "5432"))
-        self.db_name = os.getenv("DB_NAME", "code_as_data")
-        self.db_pool_size = int(os.getenv("DB_POOL_SIZE", "10"))
-        self.db_max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "20"))
-        self.db_pool_timeout = int(os.getenv("DB_POOL_TIMEOUT", "30"))
-        self.db_pool_recycle = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+        ("db_user", "DB_USER", "postgres", None),
+        ("db_password", "DB_PASSWORD", "postgres", None),
+        ("db_host", "DB_HOST", "localhost", None),
+        ("db_port", "DB_PORT", "5432", int),
+        ("db_name", "DB_NAME", "code_as_data", None),
+        ("db_pool_size", "DB_POOL_SIZE", "10", int),
+        ("db_max_overflow", "DB_MAX_OVERFLOW", "20", int),
+        ("db_pool_timeout", "DB_POOL_TIMEOUT", "30", int),
+        ("db_pool_recycle", "DB_POOL_RECYCLE", "1800", int),
+        ("db_create_search_indexes", "DB_CREATE_SEARCH_INDEXES", "false", _to_bool),
         
         # SSL configuration
-        self.db_ssl_mode = os.getenv("DB_SSL_MODE", "prefer")
-        self.db_ssl_cert = os.getenv("DB_SSL_CERT")
-        self.db_ssl_key = os.getenv("DB_SSL_KEY")
-        self.db_ssl_rootcert = os.getenv("DB_SSL_ROOTCERT")
+        ("db_ssl_mode", "DB_SSL_MODE", "prefer", None),
+        ("db_ssl_cert", "DB_SSL_CERT", None, None),
+        ("db_ssl_key", "DB_SSL_KEY", None, None),
+        ("db_ssl_rootcert", "DB_SSL_ROOTCERT", None, None),
         
         # FDEP data path
-        self.fdep_path = os.getenv("FDEP_PATH")
+        ("fdep_path", "FDEP_PATH", None, None),
         
         # Server configuration
-        self.log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-        self.log_file = os.getenv("LOG_FILE")
-        self.dev_mode = os.getenv("DEV_MODE", "false").lower() == "true"
+        ("log_level", "LOG_LEVEL", "INFO", _to_log_level),
+        ("log_file", "LOG_FILE", None, None),
+        ("dev_mode", "DEV_MODE", "false", _to_bool),
+    )
+    
+    # No per-instance __dict__: one slot per setting plus internal state
+    __slots__ = tuple(name for name, *_ in _SCHEMA) + (
+        "_database_url",
+        "_db_config_cache",
+        "_log_listener",
+        "_logging_configured_sig",
+        "_log_atexit_registered",
+    )
+    
+    def __init__(self):
+        self._log_listener: Optional[QueueListener] = None
+        self._logging_configured_sig: Optional[tuple] = None
+        self._log_atexit_registered = False
+        self.load_config()
+    
+    def load_config(self):
+        """Load configuration from environment variables"""
+        env_get = os.environ.get
+        values = {
+            name: value if convert is None or value is None else convert(value)
+            for name, env_name, default, convert in self._SCHEMA
+            for value in (env_get(env_name, default),)
+        }
+        # Config uses __slots__, so values are stored slot by slot rather than
+        # through a single __dict__.update()
+        for name, value in values.items():
+            setattr(self, name, value)
+        
+        # Derived values (built once per load instead of on every access);
+        # credentials are percent-encoded so '@', ':' or '/' can't break the URL
+        netloc = f"{quote(self.db_user, safe='')}:{quote(self.db_password, safe='')}@{self.db_host}:{self.db_port}"
+        self._database_url = urlunsplit(("postgresql", netloc, f"/{self.db_name}", "", ""))
+        self._db_config_cache: Optional[Mapping] = None
     
     @property
     def database_url(self) -> str:
         """Get PostgreSQL database URL"""
-        return f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+        return self._database_url
     
     def validate_config(self) -> tuple[bool, list[str]]:
         """Validate configuration and return (is_valid, errors)"""
+        is_valid, errors = self._validate(self.fdep_path, self.log_level, self.db_port)
+        return is_valid, list(errors)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _validate(fdep_path: Optional[str], log_level: str, db_port: int) -> tuple[bool, tuple[str, ...]]:
+        """Validate the given settings; memoized since they rarely change between calls"""
         errors = []
         
         # Check FDEP path if provided
-        if self.fdep_path:
-            fdep_path = Path(self.fdep_path)
-            if not fdep_path.exists():
-                errors.append(f"FDEP_PATH does not exist: {self.fdep_path}")
-            elif not fdep_path.is_dir():
-                errors.append(f"FDEP_PATH is not a directory: {self.fdep_path}")
+        if fdep_path:
+            # A single stat() answers both "exists" and "is a directory"
+            try:
+                st = os.stat(fdep_path)
+            except (FileNotFoundError, NotADirectoryError):
+                errors.append(f"FDEP_PATH does not exist: {fdep_path}")
+            else:
+                if not stat.S_ISDIR(st.st_mode):
+                    errors.append(f"FDEP_PATH is not a directory: {fdep_path}")
         else:
             # FDEP path is optional for basic server operation
             pass
         
         # Validate log level
-        valid_log_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        if self.log_level not in valid_log_levels:
-            errors.append(f"Invalid LOG_LEVEL: {self.log_level}. Must be one of {valid_log_levels}")
+        if log_level not in _VALID_LOG_LEVELS:
+            errors.append(f"Invalid LOG_LEVEL: {log_level}. Must be one of {list(_LOG_LEVEL_NAMES)}")
         
         # Validate database port
-        if not (1 <= self.db_port <= 65535):
-            errors.append(f"Invalid DB_PORT: {self.db_port}. Must be between 1 and 65535")
+        if not (1 <= db_port <= 65535):
+            errors.append(f"Invalid DB_PORT: {db_port}. Must be between 1 and 65535")
         
-        return len(errors) == 0, errors
+        return len(errors) == 0, tuple(errors)
     
     def setup_logging(self):
         """Setup logging based on configuration"""
+        # Nothing to do if logging is already running with these settings
+        sig = (self.log_level, self.log_file, self.dev_mode)
+        if sig == self._logging_configured_sig and self._log_listener is not None:
+            return
+        
         # Configure log level
-        log_level = getattr(logging, self.log_level, logging.INFO)
+        log_level = _LEVELS.get(self.log_level, logging.INFO)
         
-        # Configure logging format
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
+        # Configure logging format; outside dev mode the supervisor (journald,
+        # k8s) timestamps lines, so skip the per-record strftime
+        if self.dev_mode:
+            fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        else:
+            fmt = '%(name)s - %(levelname)s - %(message)s'
+        formatter = logging.Formatter(fmt)
         
         # Configure handler - ALWAYS use stderr for MCP protocol compliance
         if self.log_file:
-            handler = logging.FileHandler(self.log_file)
+            # delay=True defers opening the file until the first record is written
+            handler = logging.FileHandler(self.log_file, delay=True)
         else:
             handler = logging.StreamHandler(sys.stderr)
         
         handler.setFormatter(formatter)
+        handler.setLevel(log_level)
+        
+        # Our format doesn't use thread/process fields, so skip computing them per record
+        logging.logThreads = False
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
         
         # Configure root logger
         root_logger = logging.getLogger()
         root_logger.setLevel(log_level)
         
         # Clear existing handlers
-        for existing_handler in root_logger.handlers[:]:
-            root_logger.removeHandler(existing_handler)
+        root_logger.handlers.clear()
         
-        root_logger.addHandler(handler)
+        # Write records from a background listener thread so logging calls on
+        # the event loop only enqueue; stopping the listener flushes the queue
+        self.stop_logging()
+        if not self._log_atexit_registered:
+            atexit.register(self.stop_logging)
+            self._log_atexit_registered = True
+        log_queue = queue.SimpleQueue()
+        self._log_listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        self._log_listener.start()
+        
+        root_logger.addHandler(QueueHandler(log_queue))
+        self._logging_configured_sig = sig
+    
+    def stop_logging(self):
+        """Flush pending log records, stop the background logging thread and close its handlers"""
+        if self._log_listener is not None:
+            self._log_listener.stop()
+            # Releases the log file descriptor; closing stderr's handler leaves the stream open
+            for handler in self._log_listener.handlers:
+                handler.close()
+            self._log_listener = None
+            self._logging_configured_sig = None
     
-    def get_database_config(self) -> dict:
-        """Get database configuration dictionary"""
+    def get_database_config(self) -> Mapping:
+        """Get database configuration as a read-only mapping, built once per load"""
+        if self._db_config_cache is not None:
+            return self._db_config_cache
+        
         config = {
             "url": self.database_url,
             "pool_size": self.db_pool_size,
@@ -114,20 +270,51 @@ class Config:
             "pool_recycle": self.db_pool_recycle,
         }
         
-        # Add SSL configuration if provided
+        # Add SSL configuration if provided; leave connect_args out entirely
+        # otherwise so the driver has no options to parse
         if self.db_ssl_cert:
-            config["connect_args"] = {
-                "sslmode": self.db_ssl_mode,
-                "sslcert": self.db_ssl_cert,
-                "sslkey": self.db_ssl_key,
-                "sslrootcert": self.db_ssl_rootcert,
-            }
-        
-        return config
+            config["connect_args"] = dict(zip(_SSL_KEYS, (
+                self.db_ssl_mode,
+                self.db_ssl_cert,
+                self.db_ssl_key,
+                self.db_ssl_rootcert,
+            )))
+        
+        self._db_config_cache = MappingProxyType(config)
+        return self._db_config_cache
+    
+    def log_summary(self, logger: logging.Logger):
+        """Log the non-sensitive settings; use this instead of logging the repr"""
+        # %-style args are only formatted if the record is actually emitted
+        logger.info(
+            "Config db_host=%s db_port=%s db_name=%s fdep_path=%s",
+            self.db_host, self.db_port, self.db_name, self.fdep_path,
+        )
     
     def __repr__(self) -> str:
-        """String representation of config (hiding sensitive data)"""
+        """String representation of config (hiding sensitive data), mainly for debuggers"""
         return f"Config(db_host={self.db_host}, db_port={self.db_port}, db_name={self.db_name}, fdep_path={self.fdep_path})"
 
-# Global config instance
-config = Config()
\ No newline at end of file
+# Global config instance, created on first use
+_config: Optional[Config] = None
+_config_lock = threading.Lock()
+
+def get_config() -> Config:
+    """Get the global config, loading .env and environment variables on first call"""
+    global _config
+    if _config is None:
+        with _config_lock:
+            if _config is None:
+                # FDEP_SKIP_DOTENV=1 skips the .env lookup when the environment
+                # is already injected (containers, systemd); FDEP_DOTENV_PATH
+                # names the file directly instead of searching parent dirs
+                if os.environ.get("FDEP_SKIP_DOTENV") != "1":
+                    _load_dotenv(os.environ.get("FDEP_DOTENV_PATH"))
+                _config = Config()
+    return _config
+
+def __getattr__(name: str):
+    """Materialize the module-level ``config`` lazily on first access"""
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,30 +7,115 @@ stored in PostgreSQL via the code analysis tool.
 """
 
 import asyncio
+import heapq
 import logging
 import os
 import sys
+import threading
+import time
 import warnings
-from typing import Any, Dict, List
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional
 
+import anyio
 import mcp.types as types
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
-from dotenv import load_dotenv
 
-from .config import config
+from .config import get_config
 
-# Suppress warnings that might contaminate stdout (MCP protocol requirement)
-warnings.filterwarnings("ignore", category=DeprecationWarning)
-warnings.filterwarnings("ignore", message=".*declarative_base.*")
+# Load environment variables before code_as_data reads its database settings
+config = get_config()
 
-# Import required code analysis library components
-from code_as_data.db.connection import SessionLocal
-from code_as_data.services.query_service import QueryService
-from code_as_data.db.models import Function, Module
+# Suppress warnings that might contaminate stdout (MCP protocol requirement);
+# SQLAlchemy's declarative_base notice is a DeprecationWarning subclass, so a
+# single category filter covers it without a message regex
+warnings.simplefilter("ignore", DeprecationWarning)
 
-# Load environment variables
-load_dotenv()
+from sqlalchemy import bindparam, create_engine, desc, literal, null, select, text, union_all
+from sqlalchemy import func as sql_func
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import aliased, contains_eager, joinedload, load_only, sessionmaker
+
+# Code analysis library components, imported on first initialize() so that
+# starting the server or listing tools doesn't load code_as_data's models
+QueryService = None
+Function = None
+Module = None
+FunctionCalled = None
+# Optional models; a code_as_data without them leaves these as None, which the
+# handlers that use them check for
+Import = None
+Type = None
+Class = None
+Instance = None
+Constructor = None
+Field = None
+TypeDependency = None
+WhereFunction = None
+
+# Hot search statements, built once with bound parameters so every call reuses
+# the same cached compiled SQL instead of building and compiling a new query
+_SEARCH_FUNCTIONS_STMT = None
+_SEARCH_MODULES_STMT = None
+_MOST_CALLED_STMT = None
+_MODULE_BY_NAME_STMT = None
+
+# execute_advanced_query's query type -> model, resolved once at load
+_ADVANCED_QUERY_MODELS = {}
+
+def _load_code_as_data():
+    """Import code_as_data components and build the statements that depend on them"""
+    global QueryService, Function, Module, FunctionCalled, Import, Type, Class, Instance
+    global Constructor, Field, TypeDependency, WhereFunction
+    global _SEARCH_FUNCTIONS_STMT, _SEARCH_MODULES_STMT, _MOST_CALLED_STMT, _MODULE_BY_NAME_STMT
+    global _ADVANCED_QUERY_MODELS
+    if QueryService is not None:
+        return
+    
+    from code_as_data.services.query_service import QueryService
+    from code_as_data.db.models import Function, Module, FunctionCalled
+    
+    # Searches return plain rows holding just the displayed columns; the
+    # module name arrives through the join instead of a lazy load per function
+    _SEARCH_FUNCTIONS_STMT = (select(Function.name, Module.name)
+                              .outerjoin(Module, Function.module_id == Module.id)
+                              .where(Function.name.like(bindparam("pattern")))
+                              .limit(bindparam("limit")))
+    _SEARCH_MODULES_STMT = (select(Module.name, Module.path)
+                            .where(Module.name.like(bindparam("pattern")))
+                            .limit(bindparam("limit")))
+    _MODULE_BY_NAME_STMT = select(Module.id, Module.name, Module.path).where(Module.name == bindparam("name"))
+    # Call counts are aggregated and ranked by the database; only the top
+    # rows come back, as plain (name, module_name, calls) tuples
+    calls = sql_func.count().label("calls")
+    _MOST_CALLED_STMT = (select(FunctionCalled.name, FunctionCalled.module_name, calls)
+                         .group_by(FunctionCalled.name, FunctionCalled.module_name)
+                         .order_by(desc(calls))
+                         .limit(bindparam("limit")))
+    
+    try:
+        from code_as_data.db.models import Class, Constructor, Field, Import, Instance, Type
+    except ImportError:
+        pass
+    try:
+        from code_as_data.db.models import TypeDependency
+    except ImportError:
+        pass
+    try:
+        from code_as_data.db.models import WhereFunction
+    except ImportError:
+        pass
+    
+    _ADVANCED_QUERY_MODELS = {"function": Function, "module": Module}
+    if Type is not None:
+        _ADVANCED_QUERY_MODELS.update({
+            "type": Type,
+            "class": Class,
+            "import": Import,
+            "instance": Instance
+        })
 
 # Setup logging from config
 config.setup_logging()
@@ -39,26 +124,65 @@ logger = logging.getLogger(__name__)
 # Initialize MCP server
 mcp_server = Server("fdep-mcp-server")
 
+class ModuleRef(NamedTuple):
+    """The columns of a module that tools read after looking it up by name"""
+    id: int
+    name: str
+    path: Optional[str]
+
 class CodeAnalysisService:
     """Service for managing code analysis operations"""
     
     def __init__(self):
-        self.db_session = None
-        self.query_service = None
+        self.engine = None
+        self.session_factory = None
+        # Tool calls run on worker threads, each with its own session
+        self._local = threading.local()
         self.dump_service = None
         self.initialized = False
+    
+    @property
+    def db_session(self):
+        """Session of the tool call running on the current thread"""
+        return getattr(self._local, "db_session", None)
+    
+    @db_session.setter
+    def db_session(self, value):
+        self._local.db_session = value
+    
+    @property
+    def query_service(self):
+        """QueryService of the tool call running on the current thread"""
+        return getattr(self._local, "query_service", None)
+    
+    @query_service.setter
+    def query_service(self, value):
+        self._local.query_service = value
         
     def initialize(self) -> bool:
         """Initialize database connection and services"""
         logger.debug("Starting code analysis service initialization...")
         try:
-            logger.debug("Creating database session...")
-            self.db_session = SessionLocal()
-            logger.debug("Database session created successfully")
+            logger.debug("Loading code analysis library...")
+            _load_code_as_data()
+            
+            # One pooled engine for the process; pool_pre_ping replaces stale
+            # connections on checkout, so sessions never need manual recovery
+            logger.debug("Creating database engine...")
+            db_config = dict(config.get_database_config())
+            self.engine = create_engine(db_config.pop("url"), pool_pre_ping=True, **db_config)
+            
+            # Keep the session factory rather than one long-lived session;
+            # each tool call gets its own short-lived session (see session())
+            self.session_factory = sessionmaker(autoflush=False, bind=self.engine)
             
-            logger.debug("Creating QueryService...")
-            self.query_service = QueryService(self.db_session)
-            logger.debug("QueryService created successfully")
+            logger.debug("Checking database connectivity...")
+            with self.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            logger.debug("Database connection verified")
+            
+            if config.db_create_search_indexes:
+                self.create_search_indexes()
             
             # Don't initialize DumpService here as it requires paths
             self.dump_service = None
@@ -72,6 +196,96 @@ class CodeAnalysisService:
             self.cleanup()
             return False
     
+    def create_search_indexes(self):
+        """Create trigram GIN indexes so '*foo*' (contains) searches avoid sequential scans, plus B-tree call-edge and per-module indexes"""
+        logger.info("Ensuring search indexes exist (the first run may take a while)...")
+        indexes = []
+        
+        # Missing privileges for CREATE EXTENSION shouldn't stop the server,
+        # nor the B-tree indexes below, which don't need pg_trgm
+        if self._run_index_statement("the pg_trgm extension", "CREATE EXTENSION IF NOT EXISTS pg_trgm"):
+            # function_signature serves analyze_type_usage's '%Type%' signature scan
+            columns = [Function.name, Module.name, Function.function_signature]
+            if Type is not None:
+                columns += [Type.type_name, Class.class_name]
+            for attribute in columns:
+                column = attribute.expression
+                table_name, column_name = column.table.name, column.name
+                indexes.append((f"ix_{table_name}_{column_name}_trgm", table_name,
+                                f"USING gin ({column_name} gin_trgm_ops)"))
+        
+        # Prefix searches ('foo%', the default for patterns without
+        # wildcards) are served best by a B-tree; text_pattern_ops makes
+        # it usable for LIKE under any database collation
+        for attribute in (Function.name, Module.name):
+            column = attribute.expression
+            table_name, column_name = column.table.name, column.name
+            indexes.append((f"ix_{table_name}_{column_name}_prefix", table_name,
+                            f"({column_name} text_pattern_ops)"))
+        
+        # Serves the callee grouping behind get_most_called_functions
+        # and the caller lookups by function name
+        calls_table = FunctionCalled.name.expression.table.name
+        indexes.append((f"ix_{calls_table}_name_module_name", calls_table, "(name, module_name)"))
+        
+        # Composite indexes for the cross-module call filter, the per-module
+        # type listing and per-module function scans
+        functions_table = Function.module_id.expression.table.name
+        indexes.append((f"ix_{calls_table}_module_name_prefix", calls_table, "(module_name text_pattern_ops)"))
+        indexes.append((f"ix_{functions_table}_module_id", functions_table, "(module_id)"))
+        if Type is not None:
+            types_table = Type.type_name.expression.table.name
+            indexes.append((f"ix_{types_table}_module_id_type_of_type_type_name", types_table,
+                            "(module_id, type_of_type, type_name)"))
+        
+        # One transaction per index, so a failure only costs that index
+        for index_name, table_name, definition in indexes:
+            self._run_index_statement(
+                f"index {index_name}", f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} {definition}"
+            )
+        logger.info("Search index setup finished")
+    
+    def _run_index_statement(self, label: str, statement: str) -> bool:
+        """Run one index DDL statement in its own transaction, logging rather than raising on failure"""
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(text(statement))
+            return True
+        except Exception as e:
+            logger.warning(f"Could not create {label}: {e}")
+            return False
+    
+    def _open_session(self):
+        """Check out a new session from the pool along with a QueryService bound to it"""
+        session = self.session_factory()
+        return session, QueryService(session)
+    
+    @contextmanager
+    def session(self):
+        """Open a short-lived session and QueryService for the duration of one tool call"""
+        self.db_session, self.query_service = self._open_session()
+        try:
+            yield self.db_session
+        finally:
+            try:
+                self.db_session.close()
+            except Exception as e:
+                logger.warning(f"Error closing database session: {e}")
+            self.db_session = None
+            self.query_service = None
+    
+    def get_module_by_name(self, module_name: str) -> Optional[ModuleRef]:
+        """Look up a module by name, remembering hits for a short while across tool calls"""
+        # Plain values rather than ORM instances, so the cached entry isn't tied
+        # to the session that loaded it and can be shared between worker threads
+        module = _MODULE_CACHE.get(module_name)
+        if module is None:
+            row = self.db_session.execute(_MODULE_BY_NAME_STMT, {"name": module_name}).first()
+            if row is not None:
+                module = ModuleRef(*row)
+                _MODULE_CACHE.set(module_name, module)
+        return module
+    
     def cleanup(self):
         """Clean up database connections and resources"""
         try:
@@ -80,35 +294,20 @@ class CodeAnalysisService:
                 logger.debug("Database session closed")
         except Exception as e:
             logger.warning(f"Error closing database session: {e}")
+        try:
+            if self.engine:
+                self.engine.dispose()
+                logger.debug("Database engine disposed")
+        except Exception as e:
+            logger.warning(f"Error disposing database engine: {e}")
         finally:
+            self.engine = None
+            self.session_factory = None
             self.db_session = None
             self.query_service = None
             self.dump_service = None
             self.initialized = False
-    
-    def recover_session(self) -> bool:
-        """Recover from a corrupted database session"""
-        logger.debug("Attempting to recover database session...")
-        try:
-            # Close existing session if it exists
-            if self.db_session:
-                try:
-                    self.db_session.rollback()
-                    self.db_session.close()
-                    logger.debug("Closed existing session")
-                except Exception as e:
-                    logger.debug(f"Error closing existing session: {e}")
-            
-            # Create new session
-            self.db_session = SessionLocal()
-            self.query_service = QueryService(self.db_session)
-            logger.debug("Database session recovered successfully")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to recover database session: {e}")
-            self.cleanup()
-            return False
-    
+            clear_caches()
     
     def __enter__(self):
         """Context manager entry"""
@@ -121,9 +320,91 @@ class CodeAnalysisService:
 # Global service instance
 code_service = CodeAnalysisService()
 
+# Shared reply for tool calls made while the database is unavailable; nothing
+# downstream mutates tool results, so one instance serves every handler
+_NOT_INITIALIZED_RESPONSE = [types.TextContent(
+    type="text",
+    text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
+)]
+
+class _TTLCache:
+    """Small size- and time-bounded cache for tool results"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+    
+    def set(self, key, value):
+        """Store a value, evicting the oldest entry when full"""
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                del self._data[next(iter(self._data))]
+            self._data[key] = (time.monotonic() + self.ttl, value)
+    
+    def clear(self):
+        """Drop all cached values"""
+        with self._lock:
+            self._data.clear()
+
+# Results of these tools only change when FDEP data is re-imported, so they
+# are served from memory for a short while instead of re-querying; searches
+# are included because agents tend to repeat the same few patterns
+_CACHEABLE_TOOLS = frozenset({
+    "list_modules", "get_code_statistics", "get_most_called_functions",
+    "search_functions", "search_modules", "execute_query",
+})
+_RESULT_CACHE = _TTLCache(maxsize=256, ttl=60)
+
+# Module name -> ModuleRef for get_module_by_name; ids change when FDEP data
+# is re-imported, so entries expire on the same schedule as tool results
+_MODULE_CACHE = _TTLCache(maxsize=4096, ttl=60)
+
+# Results of QueryService's whole-codebase scans (pairwise similarity, code
+# pattern search), keyed by their inputs; these are the most expensive
+# computations behind any tool
+_ANALYSIS_CACHE = _TTLCache(maxsize=32, ttl=300)
+
+# Import statements generated per (element, source module, element type)
+_IMPORTS_CACHE = _TTLCache(maxsize=1024, ttl=300)
+
+# The full type dependency graph, which QueryService builds from every type
+# and dependency row; shared by the type graph tools instead of rebuilt per call
+_TYPE_GRAPH_CACHE = _TTLCache(maxsize=1, ttl=300)
+
+def get_type_dependency_graph() -> Dict[str, Any]:
+    """Get QueryService's type dependency graph, building it at most once per TTL"""
+    graph_data = _TYPE_GRAPH_CACHE.get("graph")
+    if graph_data is None:
+        graph_data = code_service.query_service.build_type_dependency_graph()
+        _TYPE_GRAPH_CACHE.set("graph", graph_data)
+    return graph_data
+
+def clear_caches():
+    """Drop every cached result, e.g. when the database connection is torn down"""
+    for cache in (_RESULT_CACHE, _MODULE_CACHE, _ANALYSIS_CACHE, _IMPORTS_CACHE, _TYPE_GRAPH_CACHE):
+        cache.clear()
+
 # Validation helper functions
 
+# LLM-style '*' wildcard -> SQL LIKE '%' wildcard
+_WILDCARD_TABLE = str.maketrans({'*': '%'})
+
 # Search pattern normalization helper
+@lru_cache(maxsize=1024)
 def normalize_search_pattern(pattern: str) -> str:
     """
     Normalize search patterns by converting LLM-style wildcards (*) to SQL wildcards (%)
@@ -132,22 +413,22 @@ def normalize_search_pattern(pattern: str) -> str:
     - '*card*' -> '%card%'
     - 'card*' -> 'card%'  
     - '*card' -> '%card'
-    - 'card' -> 'card' (will get %card% added by existing logic)
+    - 'card' -> 'card' (will get card% added by build_like_pattern)
     """
     if not pattern:
         return pattern
     
     # Convert * wildcards to % wildcards for SQL LIKE
-    normalized = pattern.replace('*', '%')
-    
-    return normalized
+    return pattern.translate(_WILDCARD_TABLE)
 
+@lru_cache(maxsize=1024)
 def build_like_pattern(pattern: str) -> str:
     """
     Build a SQL LIKE pattern from user input, handling both wildcard and non-wildcard cases
     
     If pattern already contains wildcards (%), use as-is
-    Otherwise, wrap with % for contains matching
+    Otherwise, append % for prefix matching, which an index can serve;
+    callers wanting contains matching pass '*foo*' explicitly
     """
     normalized = normalize_search_pattern(pattern)
     
@@ -155,1282 +436,1151 @@ def build_like_pattern(pattern: str) -> str:
     if '%' in normalized:
         return normalized
     
-    # Otherwise, wrap with % for contains matching
-    return f"%{normalized}%"
+    # Otherwise, anchor at the start for prefix matching
+    return f"{normalized}%"
 
-@mcp_server.list_tools()
-async def list_tools() -> List[types.Tool]:
-    """List available MCP tools"""
-    return [
-        types.Tool(
-            name="list_modules",
-            description="Get list of all modules in the database",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of modules to return",
-                        "default": 100
-                    }
+# Tool definitions are static, so build them once at import time
+# Property schemas shared by several tools; the tool list is static, so the
+# same dict objects can be referenced from every schema that uses them
+_LIMIT_50_PROP = {
+    "type": "integer",
+    "description": "Maximum number of results",
+    "default": 50
+}
+_LIMIT_100_PROP = {
+    "type": "integer",
+    "description": "Maximum number of results",
+    "default": 100
+}
+_FUNCTION_NAME_PROP = {
+    "type": "string",
+    "description": "Name of the function"
+}
+_FUNCTION_MODULE_PROP = {
+    "type": "string",
+    "description": "Module containing the function (optional)"
+}
+_MODULE_NAME_PROP = {
+    "type": "string",
+    "description": "Name of the module"
+}
+_ANALYZE_MODULE_PROP = {
+    "type": "string",
+    "description": "Module to analyze (optional, analyzes all if not specified)"
+}
+_SEARCH_PATTERN_PROP = {
+    "type": "string",
+    "description": "Search pattern: 'foo' matches names starting with foo, '*foo*' matches names containing foo"
+}
+
+_TOOLS: List[types.Tool] = [
+    types.Tool(
+        name="list_modules",
+        description="Get list of all modules in the database",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of modules to return",
+                    "default": 100
+                }
+            },
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="get_function_details",
+        description="Get detailed information about a specific function",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "function_name": _FUNCTION_NAME_PROP,
+                "module_name": _FUNCTION_MODULE_PROP
+            },
+            "required": ["function_name"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="search_functions",
+        description="Search for functions by name pattern",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "pattern": _SEARCH_PATTERN_PROP,
+                "limit": _LIMIT_50_PROP
+            },
+            "required": ["pattern"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="get_most_called_functions",
+        description="Get the most frequently called functions",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Number of functions to return",
+                    "default": 20
+                }
+            },
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="execute_query",
+        description="Execute a basic SQL query on the code database",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query_type": {
+                    "type": "string",
+                    "enum": ["modules", "functions", "types", "imports"],
+                    "description": "Type of query to execute"
                 },
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="get_function_details",
-            description="Get detailed information about a specific function",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "function_name": {
-                        "type": "string",
-                        "description": "Name of the function"
-                    },
-                    "module_name": {
-                        "type": "string",
-                        "description": "Module containing the function (optional)"
+                "filters": {
+                    "type": "object",
+                    "description": "Filters to apply to the query",
+                    "properties": {
+                        "name_pattern": {
+                            "type": "string",
+                            "description": "'foo' matches function names starting with foo, '*foo*' matches names containing foo"
+                        },
+                        "module_id": {"type": "integer"},
+                        "limit": {"type": "integer", "default": 100}
                     }
+                }
+            },
+            "required": ["query_type"],
+            "additionalProperties": False
+        }
+    ),
+    # Phase 1: Module Enhancement Tools
+    types.Tool(
+        name="get_module_details",
+        description="Get detailed information about a specific module including function counts and statistics",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "module_name": _MODULE_NAME_PROP
+            },
+            "required": ["module_name"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="get_functions_by_module",
+        description="Get all functions defined in a specific module",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "module_name": _MODULE_NAME_PROP,
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of functions to return",
+                    "default": 100
                 },
-                "required": ["function_name"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="search_functions",
-            description="Search for functions by name pattern",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "pattern": {
-                        "type": "string",
-                        "description": "Search pattern (supports wildcards)"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of results",
-                        "default": 50
-                    }
+                "include_signatures": {
+                    "type": "boolean",
+                    "description": "Include function signatures in output",
+                    "default": False
+                }
+            },
+            "required": ["module_name"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="search_modules",
+        description="Search for modules by name pattern",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "pattern": _SEARCH_PATTERN_PROP,
+                "limit": _LIMIT_50_PROP
+            },
+            "required": ["pattern"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="get_module_dependencies",
+        description="Analyze module dependencies and imports",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "module_name": _MODULE_NAME_PROP,
+                "include_imports": {
+                    "type": "boolean",
+                    "description": "Include detailed import information",
+                    "default": True
                 },
-                "required": ["pattern"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="get_most_called_functions",
-            description="Get the most frequently called functions",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {
-                        "type": "integer",
-                        "description": "Number of functions to return",
-                        "default": 20
-                    }
+                "include_dependents": {
+                    "type": "boolean",
+                    "description": "Include modules that depend on this module",
+                    "default": False
+                }
+            },
+            "required": ["module_name"],
+            "additionalProperties": False
+        }
+    ),
+    # Phase 1: Function Analysis Enhancement Tools  
+    types.Tool(
+        name="get_function_call_graph",
+        description="Get function call hierarchy showing what functions this function calls and what calls it",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "function_name": _FUNCTION_NAME_PROP,
+                "module_name": {
+                    "type": "string", 
+                    "description": "Module containing the function (optional but recommended)"
                 },
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="execute_query",
-            description="Execute a basic SQL query on the code database",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query_type": {
-                        "type": "string",
-                        "enum": ["modules", "functions", "types", "imports"],
-                        "description": "Type of query to execute"
-                    },
-                    "filters": {
-                        "type": "object",
-                        "description": "Filters to apply to the query",
-                        "properties": {
-                            "name_pattern": {"type": "string"},
-                            "module_id": {"type": "integer"},
-                            "limit": {"type": "integer", "default": 100}
-                        }
-                    }
+                "depth": {
+                    "type": "integer",
+                    "description": "Maximum depth to traverse (default: 2)",
+                    "default": 2
                 },
-                "required": ["query_type"],
-                "additionalProperties": False
-            }
-        ),
-        # Phase 1: Module Enhancement Tools
-        types.Tool(
-            name="get_module_details",
-            description="Get detailed information about a specific module including function counts and statistics",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "module_name": {
-                        "type": "string",
-                        "description": "Name of the module"
-                    }
+                "include_callers": {
+                    "type": "boolean",
+                    "description": "Include functions that call this function",
+                    "default": True
                 },
-                "required": ["module_name"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="get_functions_by_module",
-            description="Get all functions defined in a specific module",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "module_name": {
-                        "type": "string",
-                        "description": "Name of the module"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of functions to return",
-                        "default": 100
+                "include_callees": {
+                    "type": "boolean", 
+                    "description": "Include functions called by this function",
+                    "default": True
+                }
+            },
+            "required": ["function_name"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="get_function_callers",
+        description="Get all functions that call a specific function",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "function_name": _FUNCTION_NAME_PROP,
+                "module_name": _FUNCTION_MODULE_PROP,
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of callers to return",
+                    "default": 50
+                }
+            },
+            "required": ["function_name"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="get_function_callees",
+        description="Get all functions called by a specific function",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "function_name": _FUNCTION_NAME_PROP,
+                "module_name": _FUNCTION_MODULE_PROP,
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of callees to return",
+                    "default": 50
+                }
+            },
+            "required": ["function_name"],
+            "additionalProperties": False
+        }
+    ),
+    # Phase 1: Advanced Query Capabilities Tools
+    types.Tool(
+        name="execute_advanced_query",
+        description="Execute complex JSON-based queries with joins and advanced conditions",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "object",
+                    "description": "JSON query with type, conditions, and optional joins",
+                    "properties": {
+                        "type": {
+                            "type": "string",
+                            "enum": ["function", "module", "type", "class", "import", "instance"],
+                            "description": "Entity type to query"
+                        },
+                        "conditions": {
+                            "type": "array",
+                            "description": "Array of condition objects",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "field": {"type": "string"},
+                                    "operator": {"type": "string", "enum": ["eq", "ne", "gt", "lt", "ge", "le", "like", "ilike", "contains", "startswith", "endswith", "in", "not_in", "between", "is_null"]},
+                                    "value": {"type": ["string", "number", "boolean", "null"]}
+                                }
+                            }
+                        },
+                        "limit": {"type": "integer", "default": 100}
                     },
-                    "include_signatures": {
-                        "type": "boolean",
-                        "description": "Include function signatures in output",
-                        "default": False
-                    }
+                    "required": ["type"]
+                }
+            },
+            "required": ["query"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="find_cross_module_calls",
+        description="Find function calls that cross module boundaries",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "source_module": {
+                    "type": "string",
+                    "description": "Source module pattern (optional): 'Foo' matches modules starting with Foo, '*Foo*' matches modules containing Foo"
                 },
-                "required": ["module_name"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="search_modules",
-            description="Search for modules by name pattern",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "pattern": {
-                        "type": "string",
-                        "description": "Search pattern (supports wildcards)"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of results",
-                        "default": 50
-                    }
+                "target_module": {
+                    "type": "string", 
+                    "description": "Target module pattern (optional): 'Foo' matches modules starting with Foo, '*Foo*' matches modules containing Foo"
                 },
-                "required": ["pattern"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="get_module_dependencies",
-            description="Analyze module dependencies and imports",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "module_name": {
-                        "type": "string",
-                        "description": "Name of the module"
-                    },
-                    "include_imports": {
-                        "type": "boolean",
-                        "description": "Include detailed import information",
-                        "default": True
-                    },
-                    "include_dependents": {
-                        "type": "boolean",
-                        "description": "Include modules that depend on this module",
-                        "default": False
-                    }
+                "limit": _LIMIT_100_PROP
+            },
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="analyze_function_complexity",
+        description="Analyze function complexity metrics including call count and signature complexity",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "module_name": _ANALYZE_MODULE_PROP,
+                "min_complexity": {
+                    "type": "integer",
+                    "description": "Minimum complexity threshold",
+                    "default": 5
                 },
-                "required": ["module_name"],
-                "additionalProperties": False
-            }
-        ),
-        # Phase 1: Function Analysis Enhancement Tools  
-        types.Tool(
-            name="get_function_call_graph",
-            description="Get function call hierarchy showing what functions this function calls and what calls it",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "function_name": {
-                        "type": "string",
-                        "description": "Name of the function"
-                    },
-                    "module_name": {
-                        "type": "string", 
-                        "description": "Module containing the function (optional but recommended)"
-                    },
-                    "depth": {
-                        "type": "integer",
-                        "description": "Maximum depth to traverse (default: 2)",
-                        "default": 2
-                    },
-                    "include_callers": {
-                        "type": "boolean",
-                        "description": "Include functions that call this function",
-                        "default": True
-                    },
-                    "include_callees": {
-                        "type": "boolean", 
-                        "description": "Include functions called by this function",
-                        "default": True
-                    }
+                "limit": _LIMIT_50_PROP
+            },
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="get_code_statistics", 
+        description="Get comprehensive statistics about the codebase",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "include_details": {
+                    "type": "boolean",
+                    "description": "Include detailed breakdowns",
+                    "default": False
+                }
+            },
+            "additionalProperties": False
+        }
+    ),
+    # Phase 2: Type System Analysis Tools
+    types.Tool(
+        name="list_types",
+        description="Get types by module or pattern with support for different type categories",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "module_name": {
+                    "type": "string",
+                    "description": "Module to search in (optional)"
                 },
-                "required": ["function_name"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="get_function_callers",
-            description="Get all functions that call a specific function",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "function_name": {
-                        "type": "string",
-                        "description": "Name of the function"
-                    },
-                    "module_name": {
-                        "type": "string",
-                        "description": "Module containing the function (optional)"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of callers to return",
-                        "default": 50
-                    }
+                "pattern": {
+                    "type": "string",
+                    "description": "Type name pattern to match (optional): 'Foo' matches names starting with Foo, '*Foo*' matches names containing Foo"
                 },
-                "required": ["function_name"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="get_function_callees",
-            description="Get all functions called by a specific function",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "function_name": {
-                        "type": "string",
-                        "description": "Name of the function"
-                    },
-                    "module_name": {
-                        "type": "string",
-                        "description": "Module containing the function (optional)"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of callees to return",
-                        "default": 50
-                    }
+                "type_category": {
+                    "type": "string",
+                    "enum": ["DATA", "SUMTYPE", "TYPE", "NEWTYPE", "CLASS", "INSTANCE"],
+                    "description": "Filter by type category (optional)"
                 },
-                "required": ["function_name"],
-                "additionalProperties": False
-            }
-        ),
-        # Phase 1: Advanced Query Capabilities Tools
-        types.Tool(
-            name="execute_advanced_query",
-            description="Execute complex JSON-based queries with joins and advanced conditions",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "object",
-                        "description": "JSON query with type, conditions, and optional joins",
-                        "properties": {
-                            "type": {
-                                "type": "string",
-                                "enum": ["function", "module", "type", "class", "import", "instance"],
-                                "description": "Entity type to query"
-                            },
-                            "conditions": {
-                                "type": "array",
-                                "description": "Array of condition objects",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "field": {"type": "string"},
-                                        "operator": {"type": "string", "enum": ["eq", "ne", "gt", "lt", "ge", "le", "like", "ilike", "contains", "startswith", "endswith", "in", "not_in", "between", "is_null"]},
-                                        "value": {"type": ["string", "number", "boolean", "null"]}
-                                    }
-                                }
-                            },
-                            "limit": {"type": "integer", "default": 100}
-                        },
-                        "required": ["type"]
-                    }
+                "limit": _LIMIT_100_PROP
+            },
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="get_type_details",
+        description="Get detailed information about a specific type including constructors and fields",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "type_name": {
+                    "type": "string",
+                    "description": "Name of the type"
                 },
-                "required": ["query"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="find_cross_module_calls",
-            description="Find function calls that cross module boundaries",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "source_module": {
-                        "type": "string",
-                        "description": "Source module pattern (optional)"
-                    },
-                    "target_module": {
-                        "type": "string", 
-                        "description": "Target module pattern (optional)"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of results",
-                        "default": 100
-                    }
+                "module_name": {
+                    "type": "string",
+                    "description": "Module containing the type (optional)"
                 },
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="analyze_function_complexity",
-            description="Analyze function complexity metrics including call count and signature complexity",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "module_name": {
-                        "type": "string",
-                        "description": "Module to analyze (optional, analyzes all if not specified)"
-                    },
-                    "min_complexity": {
-                        "type": "integer",
-                        "description": "Minimum complexity threshold",
-                        "default": 5
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of results",
-                        "default": 50
-                    }
+                "include_constructors": {
+                    "type": "boolean",
+                    "description": "Include constructor details",
+                    "default": True
                 },
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="get_code_statistics", 
-            description="Get comprehensive statistics about the codebase",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "include_details": {
-                        "type": "boolean",
-                        "description": "Include detailed breakdowns",
-                        "default": False
-                    }
+                "include_fields": {
+                    "type": "boolean",
+                    "description": "Include field details for constructors",
+                    "default": True
+                }
+            },
+            "required": ["type_name"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="search_types",
+        description="Search for types by name pattern with advanced filtering",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "pattern": {
+                    "type": "string",
+                    "description": "Search pattern for type names: 'Foo' matches names starting with Foo, '*Foo*' matches names containing Foo"
                 },
-                "additionalProperties": False
-            }
-        ),
-        # Phase 2: Type System Analysis Tools
-        types.Tool(
-            name="list_types",
-            description="Get types by module or pattern with support for different type categories",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "module_name": {
-                        "type": "string",
-                        "description": "Module to search in (optional)"
-                    },
-                    "pattern": {
-                        "type": "string",
-                        "description": "Type name pattern to match (optional)"
-                    },
-                    "type_category": {
-                        "type": "string",
-                        "enum": ["DATA", "SUMTYPE", "TYPE", "NEWTYPE", "CLASS", "INSTANCE"],
-                        "description": "Filter by type category (optional)"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of results",
-                        "default": 100
-                    }
+                "module_pattern": {
+                    "type": "string",
+                    "description": "Module name pattern to filter by (optional): 'Foo' matches modules starting with Foo, '*Foo*' matches modules containing Foo"
                 },
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="get_type_details",
-            description="Get detailed information about a specific type including constructors and fields",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "type_name": {
-                        "type": "string",
-                        "description": "Name of the type"
-                    },
-                    "module_name": {
-                        "type": "string",
-                        "description": "Module containing the type (optional)"
-                    },
-                    "include_constructors": {
-                        "type": "boolean",
-                        "description": "Include constructor details",
-                        "default": True
-                    },
-                    "include_fields": {
-                        "type": "boolean",
-                        "description": "Include field details for constructors",
-                        "default": True
-                    }
+                "type_category": {
+                    "type": "string",
+                    "enum": ["DATA", "SUMTYPE", "TYPE", "NEWTYPE", "CLASS", "INSTANCE"],
+                    "description": "Filter by type category (optional)"
                 },
-                "required": ["type_name"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="search_types",
-            description="Search for types by name pattern with advanced filtering",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "pattern": {
-                        "type": "string",
-                        "description": "Search pattern for type names"
-                    },
-                    "module_pattern": {
-                        "type": "string",
-                        "description": "Module name pattern to filter by (optional)"
-                    },
-                    "type_category": {
-                        "type": "string",
-                        "enum": ["DATA", "SUMTYPE", "TYPE", "NEWTYPE", "CLASS", "INSTANCE"],
-                        "description": "Filter by type category (optional)"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of results",
-                        "default": 50
-                    }
+                "limit": _LIMIT_50_PROP
+            },
+            "required": ["pattern"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="get_type_dependencies",
+        description="Analyze type dependencies and relationships",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "type_name": {
+                    "type": "string",
+                    "description": "Name of the type"
                 },
-                "required": ["pattern"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="get_type_dependencies",
-            description="Analyze type dependencies and relationships",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "type_name": {
-                        "type": "string",
-                        "description": "Name of the type"
-                    },
-                    "module_name": {
-                        "type": "string",
-                        "description": "Module containing the type (optional)"
-                    },
-                    "include_dependents": {
-                        "type": "boolean",
-                        "description": "Include types that depend on this type",
-                        "default": False
-                    },
-                    "depth": {
-                        "type": "integer",
-                        "description": "Maximum dependency depth to traverse",
-                        "default": 2
-                    }
+                "module_name": {
+                    "type": "string",
+                    "description": "Module containing the type (optional)"
                 },
-                "required": ["type_name"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="analyze_type_usage",
-            description="Analyze how types are used throughout the codebase",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "type_name": {
-                        "type": "string",
-                        "description": "Name of the type to analyze (optional)"
-                    },
-                    "module_name": {
-                        "type": "string",
-                        "description": "Module to analyze (optional, analyzes all if not specified)"
-                    },
-                    "usage_threshold": {
-                        "type": "integer",
-                        "description": "Minimum usage count to include in results",
-                        "default": 1
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of results",
-                        "default": 50
-                    }
+                "include_dependents": {
+                    "type": "boolean",
+                    "description": "Include types that depend on this type",
+                    "default": False
                 },
-                "additionalProperties": False
-            }
-        ),
-        # Phase 2: Class Analysis Tools
-        types.Tool(
-            name="list_classes",
-            description="Get class definitions with filtering by module or pattern",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "module_name": {
-                        "type": "string",
-                        "description": "Module to search in (optional)"
-                    },
-                    "pattern": {
-                        "type": "string",
-                        "description": "Class name pattern to match (optional)"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of results",
-                        "default": 100
-                    }
+                "depth": {
+                    "type": "integer",
+                    "description": "Maximum dependency depth to traverse",
+                    "default": 2
+                }
+            },
+            "required": ["type_name"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="analyze_type_usage",
+        description="Analyze how types are used throughout the codebase",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "type_name": {
+                    "type": "string",
+                    "description": "Name of the type to analyze (optional)"
                 },
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="get_class_details",
-            description="Get detailed information about a specific class including methods and instances",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "class_name": {
-                        "type": "string",
-                        "description": "Name of the class"
-                    },
-                    "module_name": {
-                        "type": "string",
-                        "description": "Module containing the class (optional)"
-                    },
-                    "include_instances": {
-                        "type": "boolean",
-                        "description": "Include class instances",
-                        "default": True
-                    }
+                "module_name": _ANALYZE_MODULE_PROP,
+                "usage_threshold": {
+                    "type": "integer",
+                    "description": "Minimum usage count to include in results",
+                    "default": 1
                 },
-                "required": ["class_name"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="search_classes",
-            description="Search for classes by name pattern with module filtering",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "pattern": {
-                        "type": "string",
-                        "description": "Search pattern for class names"
-                    },
-                    "module_pattern": {
-                        "type": "string",
-                        "description": "Module name pattern to filter by (optional)"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of results",
-                        "default": 50
-                    }
+                "limit": _LIMIT_50_PROP
+            },
+            "additionalProperties": False
+        }
+    ),
+    # Phase 2: Class Analysis Tools
+    types.Tool(
+        name="list_classes",
+        description="Get class definitions with filtering by module or pattern",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "module_name": {
+                    "type": "string",
+                    "description": "Module to search in (optional)"
                 },
-                "required": ["pattern"],
-                "additionalProperties": False
-            }
-        ),
-        # Phase 2: Import Analysis Tools
-        types.Tool(
-            name="analyze_imports",
-            description="Analyze import patterns and dependencies for modules",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "module_name": {
-                        "type": "string",
-                        "description": "Module to analyze imports for (optional)"
-                    },
-                    "import_pattern": {
-                        "type": "string",
-                        "description": "Pattern to match imported modules (optional)"
-                    },
-                    "include_qualified": {
-                        "type": "boolean",
-                        "description": "Include qualified imports information",
-                        "default": True
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of results",
-                        "default": 100
-                    }
+                "pattern": {
+                    "type": "string",
+                    "description": "Class name pattern to match (optional): 'Foo' matches names starting with Foo, '*Foo*' matches names containing Foo"
                 },
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="get_import_graph",
-            description="Generate module import relationship graph",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "root_module": {
-                        "type": "string",
-                        "description": "Root module to start graph from (optional)"
-                    },
-                    "depth": {
-                        "type": "integer",
-                        "description": "Maximum depth to traverse",
-                        "default": 3
-                    },
-                    "include_external": {
-                        "type": "boolean",
-                        "description": "Include external package imports",
-                        "default": False
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of nodes in graph",
-                        "default": 50
-                    }
+                "limit": _LIMIT_100_PROP
+            },
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="get_class_details",
+        description="Get detailed information about a specific class including methods and instances",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "class_name": {
+                    "type": "string",
+                    "description": "Name of the class"
                 },
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="find_unused_imports",
-            description="Find potentially unused imports in modules",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "module_name": {
-                        "type": "string",
-                        "description": "Module to analyze (optional, analyzes all if not specified)"
-                    },
-                    "package_pattern": {
-                        "type": "string",
-                        "description": "Package pattern to focus on (optional)"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of results",
-                        "default": 100
-                    }
+                "module_name": {
+                    "type": "string",
+                    "description": "Module containing the class (optional)"
                 },
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="get_import_details",
-            description="Get detailed information about imports in a module",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "module_name": {
-                        "type": "string",
-                        "description": "Module to get import details for"
-                    },
-                    "include_source_info": {
-                        "type": "boolean",
-                        "description": "Include source location and other metadata",
-                        "default": True
-                    }
+                "include_instances": {
+                    "type": "boolean",
+                    "description": "Include class instances",
+                    "default": True
+                }
+            },
+            "required": ["class_name"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="search_classes",
+        description="Search for classes by name pattern with module filtering",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "pattern": {
+                    "type": "string",
+                    "description": "Search pattern for class names: 'Foo' matches names starting with Foo, '*Foo*' matches names containing Foo"
                 },
-                "required": ["module_name"],
-                "additionalProperties": False
-            }
-        ),
-        # Phase 1: Advanced Pattern Analysis Tools
-        types.Tool(
-            name="find_similar_functions",
-            description="Find functions similar to a given function based on signature and code",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "function_name": {
-                        "type": "string",
-                        "description": "Name of the reference function"
-                    },
-                    "module_name": {
-                        "type": "string",
-                        "description": "Module containing the reference function (optional)"
-                    },
-                    "similarity_threshold": {
-                        "type": "number",
-                        "description": "Similarity threshold (0.0 to 1.0)",
-                        "default": 0.7,
-                        "minimum": 0.0,
-                        "maximum": 1.0
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of similar functions to return",
-                        "default": 10
-                    }
+                "module_pattern": {
+                    "type": "string",
+                    "description": "Module name pattern to filter by (optional): 'Foo' matches modules starting with Foo, '*Foo*' matches modules containing Foo"
                 },
-                "required": ["function_name"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="find_code_patterns",
-            description="Find recurring code patterns across functions",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "pattern_code": {
-                        "type": "string",
-                        "description": "Code snippet pattern to search for"
-                    },
-                    "min_matches": {
-                        "type": "integer",
-                        "description": "Minimum number of lines that must match",
-                        "default": 3
-                    },
-                    "module_pattern": {
-                        "type": "string",
-                        "description": "Module name pattern to filter search (optional)"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of functions to return",
-                        "default": 20
-                    }
+                "limit": _LIMIT_50_PROP
+            },
+            "required": ["pattern"],
+            "additionalProperties": False
+        }
+    ),
+    # Phase 2: Import Analysis Tools
+    types.Tool(
+        name="analyze_imports",
+        description="Analyze import patterns and dependencies for modules",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "module_name": {
+                    "type": "string",
+                    "description": "Module to analyze imports for (optional)"
                 },
-                "required": ["pattern_code"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="group_similar_functions",
-            description="Group functions by similarity to identify common patterns",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "similarity_threshold": {
-                        "type": "number",
-                        "description": "Minimum similarity score to group functions",
-                        "default": 0.7,
-                        "minimum": 0.0,
-                        "maximum": 1.0
-                    },
-                    "module_pattern": {
-                        "type": "string",
-                        "description": "Module name pattern to filter analysis (optional)"
-                    },
-                    "min_group_size": {
-                        "type": "integer",
-                        "description": "Minimum number of functions in a group",
-                        "default": 2
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of groups to return",
-                        "default": 10
-                    }
+                "import_pattern": {
+                    "type": "string",
+                    "description": "Pattern to match imported modules (optional): 'Foo' matches modules starting with Foo, '*Foo*' matches modules containing Foo"
                 },
-                "additionalProperties": False
-            }
-        ),
-        # Phase 1: Advanced Type Analysis Tools
-        types.Tool(
-            name="build_type_dependency_graph",
-            description="Build a comprehensive type dependency graph showing relationships between types",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "root_type": {
-                        "type": "string",
-                        "description": "Root type to start the graph from (optional)"
-                    },
-                    "module_pattern": {
-                        "type": "string",
-                        "description": "Module pattern to filter types (optional)"
-                    },
-                    "include_external": {
-                        "type": "boolean",
-                        "description": "Include external type dependencies",
-                        "default": False
-                    },
-                    "max_depth": {
-                        "type": "integer",
-                        "description": "Maximum depth to traverse",
-                        "default": 3
-                    }
+                "include_qualified": {
+                    "type": "boolean",
+                    "description": "Include qualified imports information",
+                    "default": True
                 },
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="get_nested_types",
-            description="Get all nested type definitions for specified types",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "type_names": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of root type names to analyze"
-                    },
-                    "gateway_name": {
-                        "type": "string",
-                        "description": "Gateway name to filter by"
-                    },
-                    "exclude_pattern": {
-                        "type": "string",
-                        "description": "Pattern to exclude from results (optional)"
-                    },
-                    "include_raw_definitions": {
-                        "type": "boolean",
-                        "description": "Include raw type definitions",
-                        "default": True
-                    }
+                "limit": _LIMIT_100_PROP
+            },
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="get_import_graph",
+        description="Generate module import relationship graph",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "root_module": {
+                    "type": "string",
+                    "description": "Root module to start graph from (optional)"
                 },
-                "required": ["type_names", "gateway_name"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="analyze_type_relationships",
-            description="Analyze deep type relationships and dependencies",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "type_name": {
-                        "type": "string",
-                        "description": "Type name to analyze"
-                    },
-                    "source_module": {
-                        "type": "string",
-                        "description": "Source module containing the type"
-                    },
-                    "analysis_depth": {
-                        "type": "integer",
-                        "description": "Depth of relationship analysis",
-                        "default": 2
-                    },
-                    "include_dependents": {
-                        "type": "boolean",
-                        "description": "Include types that depend on this type",
-                        "default": True
-                    },
-                    "module_filter": {
-                        "type": "string",
-                        "description": "Module pattern to filter results (optional)"
-                    }
+                "depth": {
+                    "type": "integer",
+                    "description": "Maximum depth to traverse",
+                    "default": 3
                 },
-                "required": ["type_name", "source_module"],
-                "additionalProperties": False
-            }
-        ),
-        # Phase 1: Source Location Tools
-        types.Tool(
-            name="find_element_by_location",
-            description="Find code elements (functions, types, classes, imports) by source location",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "file_path": {
-                        "type": "string",
-                        "description": "Path to the source file"
-                    },
-                    "line_number": {
-                        "type": "integer",
-                        "description": "Line number in the file"
-                    },
-                    "base_directory": {
+                "include_external": {
+                    "type": "boolean",
+                    "description": "Include external package imports",
+                    "default": False
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of nodes in graph",
+                    "default": 50
+                }
+            },
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="find_unused_imports",
+        description="Find potentially unused imports in modules",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "module_name": _ANALYZE_MODULE_PROP,
+                "package_pattern": {
+                    "type": "string",
+                    "description": "Package pattern to focus on (optional): 'foo' matches packages starting with foo, '*foo*' matches packages containing foo"
+                },
+                "limit": _LIMIT_100_PROP
+            },
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="get_import_details",
+        description="Get detailed information about imports in a module",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "module_name": {
+                    "type": "string",
+                    "description": "Module to get import details for"
+                },
+                "include_source_info": {
+                    "type": "boolean",
+                    "description": "Include source location and other metadata",
+                    "default": True
+                }
+            },
+            "required": ["module_name"],
+            "additionalProperties": False
+        }
+    ),
+    # Phase 1: Advanced Pattern Analysis Tools
+    types.Tool(
+        name="find_similar_functions",
+        description="Find functions similar to a given function based on signature and code",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "function_name": {
+                    "type": "string",
+                    "description": "Name of the reference function"
+                },
+                "module_name": {
+                    "type": "string",
+                    "description": "Module containing the reference function (optional)"
+                },
+                "similarity_threshold": {
+                    "type": "number",
+                    "description": "Similarity threshold (0.0 to 1.0)",
+                    "default": 0.7,
+                    "minimum": 0.0,
+                    "maximum": 1.0
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of similar functions to return",
+                    "default": 10
+                }
+            },
+            "required": ["function_name"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="find_code_patterns",
+        description="Find recurring code patterns across functions",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "pattern_code": {
+                    "type": "string",
+                    "description": "Code snippet pattern to search for"
+                },
+                "min_matches": {
+                    "type": "integer",
+                    "description": "Minimum number of lines that must match",
+                    "default": 3
+                },
+                "module_pattern": {
+                    "type": "string",
+                    "description": "Module name substring to filter search (optional); matches modules whose name contains it"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of functions to return",
+                    "default": 20
+                }
+            },
+            "required": ["pattern_code"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="group_similar_functions",
+        description="Group functions by similarity to identify common patterns",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "similarity_threshold": {
+                    "type": "number",
+                    "description": "Minimum similarity score to group functions",
+                    "default": 0.7,
+                    "minimum": 0.0,
+                    "maximum": 1.0
+                },
+                "module_pattern": {
+                    "type": "string",
+                    "description": "Module name substring to filter analysis (optional); matches modules whose name contains it"
+                },
+                "min_group_size": {
+                    "type": "integer",
+                    "description": "Minimum number of functions in a group",
+                    "default": 2
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of groups to return",
+                    "default": 10
+                }
+            },
+            "additionalProperties": False
+        }
+    ),
+    # Phase 1: Advanced Type Analysis Tools
+    types.Tool(
+        name="build_type_dependency_graph",
+        description="Build a comprehensive type dependency graph showing relationships between types",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "root_type": {
+                    "type": "string",
+                    "description": "Root type to start the graph from (optional)"
+                },
+                "module_pattern": {
+                    "type": "string",
+                    "description": "Module name substring to filter types (optional); matches modules whose name contains it"
+                },
+                "include_external": {
+                    "type": "boolean",
+                    "description": "Include external type dependencies",
+                    "default": False
+                },
+                "max_depth": {
+                    "type": "integer",
+                    "description": "Maximum depth to traverse",
+                    "default": 3
+                }
+            },
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="get_nested_types",
+        description="Get all nested type definitions for specified types",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "type_names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of root type names to analyze"
+                },
+                "gateway_name": {
+                    "type": "string",
+                    "description": "Gateway name to filter by"
+                },
+                "exclude_pattern": {
+                    "type": "string",
+                    "description": "Pattern to exclude from results (optional)"
+                },
+                "include_raw_definitions": {
+                    "type": "boolean",
+                    "description": "Include raw type definitions",
+                    "default": True
+                }
+            },
+            "required": ["type_names", "gateway_name"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="analyze_type_relationships",
+        description="Analyze deep type relationships and dependencies",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "type_name": {
+                    "type": "string",
+                    "description": "Type name to analyze"
+                },
+                "source_module": {
+                    "type": "string",
+                    "description": "Source module containing the type"
+                },
+                "analysis_depth": {
+                    "type": "integer",
+                    "description": "Depth of relationship analysis",
+                    "default": 2
+                },
+                "include_dependents": {
+                    "type": "boolean",
+                    "description": "Include types that depend on this type",
+                    "default": True
+                },
+                "module_filter": {
+                    "type": "string",
+                    "description": "Module pattern to filter results (optional)"
+                }
+            },
+            "required": ["type_name", "source_module"],
+            "additionalProperties": False
+        }
+    ),
+    # Phase 1: Source Location Tools
+    types.Tool(
+        name="find_element_by_location",
+        description="Find code elements (functions, types, classes, imports) by source location",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": "Path to the source file"
+                },
+                "line_number": {
+                    "type": "integer",
+                    "description": "Line number in the file"
+                },
+                "base_directory": {
+                    "type": "string",
+                    "description": "Base directory path (optional)"
+                },
+                "element_types": {
+                    "type": "array",
+                    "items": {
                         "type": "string",
-                        "description": "Base directory path (optional)"
+                        "enum": ["function", "type", "class", "import", "all"]
                     },
-                    "element_types": {
-                        "type": "array",
-                        "items": {
+                    "description": "Types of elements to search for",
+                    "default": ["all"]
+                }
+            },
+            "required": ["file_path", "line_number"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="get_location_context",
+        description="Get comprehensive context around a source location",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": "Path to the source file"
+                },
+                "line_number": {
+                    "type": "integer",
+                    "description": "Line number in the file"
+                },
+                "context_radius": {
+                    "type": "integer",
+                    "description": "Number of lines around the location to include",
+                    "default": 5
+                },
+                "include_dependencies": {
+                    "type": "boolean",
+                    "description": "Include function/type dependencies",
+                    "default": True
+                }
+            },
+            "required": ["file_path", "line_number"],
+            "additionalProperties": False
+        }
+    ),
+    # Phase 1: Function Context Tools
+    types.Tool(
+        name="get_function_context",
+        description="Get complete context for a function including all used types and functions",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "function_name": _FUNCTION_NAME_PROP,
+                "module_name": _FUNCTION_MODULE_PROP,
+                "include_prompts": {
+                    "type": "boolean",
+                    "description": "Include formatted prompts for types and functions",
+                    "default": True
+                },
+                "include_local_definitions": {
+                    "type": "boolean",
+                    "description": "Include local type and function definitions",
+                    "default": True
+                },
+                "include_external_references": {
+                    "type": "boolean",
+                    "description": "Include external type and function references",
+                    "default": True
+                }
+            },
+            "required": ["function_name"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="generate_function_imports",
+        description="Generate all necessary import statements for a function or code element",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "element_name": {
+                    "type": "string",
+                    "description": "Name of the element to generate imports for"
+                },
+                "source_module": {
+                    "type": "string",
+                    "description": "Module where the element is used"
+                },
+                "element_type": {
+                    "type": "string",
+                    "enum": ["function", "type", "class", "any"],
+                    "description": "Type of the element",
+                    "default": "any"
+                },
+                "import_style": {
+                    "type": "string",
+                    "enum": ["haskell", "qualified", "explicit"],
+                    "description": "Style of import statements to generate",
+                    "default": "haskell"
+                }
+            },
+            "required": ["element_name", "source_module"],
+            "additionalProperties": False
+        }
+    ),
+    # Phase 2: Enhanced Query Capabilities
+    types.Tool(
+        name="execute_custom_query",
+        description="Execute custom read-only SQL queries on the code database with parameters",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "SQL query to execute (use ? for parameters)"
+                },
+                "parameters": {
+                    "type": "object",
+                    "description": "Parameters for the query (optional)",
+                    "additionalProperties": True
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results to return",
+                    "default": 100
+                }
+            },
+            "required": ["query"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="pattern_match_code",
+        description="Advanced pattern matching to find code structures",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "pattern_type": {
+                    "type": "string",
+                    "enum": ["function_call", "type_usage", "code_structure"],
+                    "description": "Type of pattern to match"
+                },
+                "pattern_config": {
+                    "type": "object",
+                    "description": "Pattern configuration based on pattern_type",
+                    "properties": {
+                        "caller": {
+                            "type": "string",
+                            "description": "Caller function name pattern (for function_call)"
+                        },
+                        "callee": {
+                            "type": "string",
+                            "description": "Callee function name pattern (for function_call)"
+                        },
+                        "mode": {
+                            "type": "string",
+                            "enum": ["calls", "called_by"],
+                            "description": "Direction of function calls (for function_call)"
+                        },
+                        "type_name": {
+                            "type": "string",
+                            "description": "Type name to search for (for type_usage)"
+                        },
+                        "usage_in": {
                             "type": "string",
-                            "enum": ["function", "type", "class", "import", "all"]
+                            "enum": ["function", "type", "class"],
+                            "description": "Where to look for type usage (for type_usage)"
                         },
-                        "description": "Types of elements to search for",
-                        "default": ["all"]
+                        "structure_type": {
+                            "type": "string",
+                            "enum": ["nested_function", "higher_order", "pattern_match"],
+                            "description": "Type of code structure (for code_structure)"
+                        }
                     }
                 },
-                "required": ["file_path", "line_number"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="get_location_context",
-            description="Get comprehensive context around a source location",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "file_path": {
-                        "type": "string",
-                        "description": "Path to the source file"
-                    },
-                    "line_number": {
-                        "type": "integer",
-                        "description": "Line number in the file"
-                    },
-                    "context_radius": {
-                        "type": "integer",
-                        "description": "Number of lines around the location to include",
-                        "default": 5
-                    },
-                    "include_dependencies": {
-                        "type": "boolean",
-                        "description": "Include function/type dependencies",
-                        "default": True
-                    }
+                "limit": _LIMIT_50_PROP
+            },
+            "required": ["pattern_type", "pattern_config"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="analyze_cross_module_dependencies",
+        description="Comprehensive analysis of cross-module dependencies and coupling",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "analysis_type": {
+                    "type": "string",
+                    "enum": ["dependencies", "coupling", "complexity"],
+                    "description": "Type of analysis to perform",
+                    "default": "dependencies"
                 },
-                "required": ["file_path", "line_number"],
-                "additionalProperties": False
-            }
-        ),
-        # Phase 1: Function Context Tools
-        types.Tool(
-            name="get_function_context",
-            description="Get complete context for a function including all used types and functions",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "function_name": {
-                        "type": "string",
-                        "description": "Name of the function"
-                    },
-                    "module_name": {
-                        "type": "string",
-                        "description": "Module containing the function (optional)"
-                    },
-                    "include_prompts": {
-                        "type": "boolean",
-                        "description": "Include formatted prompts for types and functions",
-                        "default": True
-                    },
-                    "include_local_definitions": {
-                        "type": "boolean",
-                        "description": "Include local type and function definitions",
-                        "default": True
-                    },
-                    "include_external_references": {
-                        "type": "boolean",
-                        "description": "Include external type and function references",
-                        "default": True
-                    }
+                "module_pattern": {
+                    "type": "string",
+                    "description": "Module name substring to filter analysis (optional); matches modules whose name contains it"
                 },
-                "required": ["function_name"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="generate_function_imports",
-            description="Generate all necessary import statements for a function or code element",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "element_name": {
-                        "type": "string",
-                        "description": "Name of the element to generate imports for"
-                    },
-                    "source_module": {
-                        "type": "string",
-                        "description": "Module where the element is used"
-                    },
-                    "element_type": {
-                        "type": "string",
-                        "enum": ["function", "type", "class", "any"],
-                        "description": "Type of the element",
-                        "default": "any"
-                    },
-                    "import_style": {
-                        "type": "string",
-                        "enum": ["haskell", "qualified", "explicit"],
-                        "description": "Style of import statements to generate",
-                        "default": "haskell"
-                    }
+                "include_metrics": {
+                    "type": "boolean",
+                    "description": "Include detailed coupling metrics",
+                    "default": True
                 },
-                "required": ["element_name", "source_module"],
-                "additionalProperties": False
-            }
-        ),
-        # Phase 2: Enhanced Query Capabilities
-        types.Tool(
-            name="execute_custom_query",
-            description="Execute custom SQL queries on the code database with parameters",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "SQL query to execute (use ? for parameters)"
-                    },
-                    "parameters": {
-                        "type": "object",
-                        "description": "Parameters for the query (optional)",
-                        "additionalProperties": True
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of results to return",
-                        "default": 100
-                    }
+                "threshold": {
+                    "type": "integer",
+                    "description": "Minimum dependency count to include",
+                    "default": 1
                 },
-                "required": ["query"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="pattern_match_code",
-            description="Advanced pattern matching to find code structures",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "pattern_type": {
-                        "type": "string",
-                        "enum": ["function_call", "type_usage", "code_structure"],
-                        "description": "Type of pattern to match"
-                    },
-                    "pattern_config": {
-                        "type": "object",
-                        "description": "Pattern configuration based on pattern_type",
-                        "properties": {
-                            "caller": {
-                                "type": "string",
-                                "description": "Caller function name pattern (for function_call)"
-                            },
-                            "callee": {
-                                "type": "string",
-                                "description": "Callee function name pattern (for function_call)"
-                            },
-                            "mode": {
-                                "type": "string",
-                                "enum": ["calls", "called_by"],
-                                "description": "Direction of function calls (for function_call)"
-                            },
-                            "type_name": {
-                                "type": "string",
-                                "description": "Type name to search for (for type_usage)"
-                            },
-                            "usage_in": {
-                                "type": "string",
-                                "enum": ["function", "type", "class"],
-                                "description": "Where to look for type usage (for type_usage)"
-                            },
-                            "structure_type": {
-                                "type": "string",
-                                "enum": ["nested_function", "higher_order", "pattern_match"],
-                                "description": "Type of code structure (for code_structure)"
-                            }
-                        }
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of results",
-                        "default": 50
-                    }
+                "limit": _LIMIT_50_PROP
+            },
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="enhanced_function_call_graph",
+        description="Generate enhanced function call graphs with advanced options",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "function_name": _FUNCTION_NAME_PROP,
+                "module_name": _FUNCTION_MODULE_PROP,
+                "max_depth": {
+                    "type": "integer",
+                    "description": "Maximum depth to traverse",
+                    "default": 3
                 },
-                "required": ["pattern_type", "pattern_config"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="analyze_cross_module_dependencies",
-            description="Comprehensive analysis of cross-module dependencies and coupling",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "analysis_type": {
-                        "type": "string",
-                        "enum": ["dependencies", "coupling", "complexity"],
-                        "description": "Type of analysis to perform",
-                        "default": "dependencies"
-                    },
-                    "module_pattern": {
-                        "type": "string",
-                        "description": "Module name pattern to filter analysis (optional)"
-                    },
-                    "include_metrics": {
-                        "type": "boolean",
-                        "description": "Include detailed coupling metrics",
-                        "default": True
-                    },
-                    "threshold": {
-                        "type": "integer",
-                        "description": "Minimum dependency count to include",
-                        "default": 1
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of results",
-                        "default": 50
-                    }
+                "graph_format": {
+                    "type": "string",
+                    "enum": ["tree", "graph", "flat"],
+                    "description": "Format of the output graph",
+                    "default": "tree"
                 },
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="enhanced_function_call_graph",
-            description="Generate enhanced function call graphs with advanced options",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "function_name": {
-                        "type": "string",
-                        "description": "Name of the function"
-                    },
-                    "module_name": {
-                        "type": "string",
-                        "description": "Module containing the function (optional)"
-                    },
-                    "max_depth": {
-                        "type": "integer",
-                        "description": "Maximum depth to traverse",
-                        "default": 3
-                    },
-                    "graph_format": {
-                        "type": "string",
-                        "enum": ["tree", "graph", "flat"],
-                        "description": "Format of the output graph",
-                        "default": "tree"
-                    },
-                    "include_signatures": {
-                        "type": "boolean",
-                        "description": "Include function signatures in output",
-                        "default": False
-                    },
-                    "filter_modules": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Module patterns to include (optional)"
-                    }
+                "include_signatures": {
+                    "type": "boolean",
+                    "description": "Include function signatures in output",
+                    "default": False
                 },
-                "required": ["function_name"],
-                "additionalProperties": False
-            }
-        )
-    ]
+                "filter_modules": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Module patterns to include (optional)"
+                }
+            },
+            "required": ["function_name"],
+            "additionalProperties": False
+        }
+    )
+]
+
+# Required argument names per tool, derived once from the static schemas
+_REQUIRED_ARGS: Dict[str, tuple] = {
+    tool.name: tuple(tool.inputSchema.get("required", ())) for tool in _TOOLS
+}
+
+@mcp_server.list_tools()
+async def list_tools() -> List[types.Tool]:
+    """List available MCP tools"""
+    return _TOOLS
 
 @mcp_server.call_tool()
 async def call_tool(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Handle tool calls"""
-    logger.debug(f"Tool call received: {name}")
-    logger.debug(f"Tool arguments: {arguments}")
+    # Arguments can be large (custom SQL, code patterns); only format them
+    # when debug logging is actually on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Tool call received: %s arguments=%s", name, arguments)
     
-    if name == "list_modules":
-        return await handle_list_modules(arguments)
-    elif name == "get_function_details":
-        return await handle_get_function_details(arguments)
-    elif name == "search_functions":
-        return await handle_search_functions(arguments)
-    elif name == "get_most_called_functions":
-        return await handle_get_most_called_functions(arguments)
-    elif name == "execute_query":
-        return await handle_execute_query(arguments)
-    # Phase 1: Module Enhancement Tools
-    elif name == "get_module_details":
-        return await handle_get_module_details(arguments)
-    elif name == "get_functions_by_module":
-        return await handle_get_functions_by_module(arguments)
-    elif name == "search_modules":
-        return await handle_search_modules(arguments)
-    elif name == "get_module_dependencies":
-        return await handle_get_module_dependencies(arguments)
-    # Phase 1: Function Analysis Enhancement Tools
-    elif name == "get_function_call_graph":
-        return await handle_get_function_call_graph(arguments)
-    elif name == "get_function_callers":
-        return await handle_get_function_callers(arguments)
-    elif name == "get_function_callees":
-        return await handle_get_function_callees(arguments)
-    # Phase 1: Advanced Query Capabilities Tools
-    elif name == "execute_advanced_query":
-        return await handle_execute_advanced_query(arguments)
-    elif name == "find_cross_module_calls":
-        return await handle_find_cross_module_calls(arguments)
-    elif name == "analyze_function_complexity":
-        return await handle_analyze_function_complexity(arguments)
-    elif name == "get_code_statistics":
-        return await handle_get_code_statistics(arguments)
-    # Phase 2: Type System Analysis Tools
-    elif name == "list_types":
-        return await handle_list_types(arguments)
-    elif name == "get_type_details":
-        return await handle_get_type_details(arguments)
-    elif name == "search_types":
-        return await handle_search_types(arguments)
-    elif name == "get_type_dependencies":
-        return await handle_get_type_dependencies(arguments)
-    elif name == "analyze_type_usage":
-        return await handle_analyze_type_usage(arguments)
-    # Phase 2: Class Analysis Tools
-    elif name == "list_classes":
-        return await handle_list_classes(arguments)
-    elif name == "get_class_details":
-        return await handle_get_class_details(arguments)
-    elif name == "search_classes":
-        return await handle_search_classes(arguments)
-    # Phase 2: Import Analysis Tools
-    elif name == "analyze_imports":
-        return await handle_analyze_imports(arguments)
-    elif name == "get_import_graph":
-        return await handle_get_import_graph(arguments)
-    elif name == "find_unused_imports":
-        return await handle_find_unused_imports(arguments)
-    elif name == "get_import_details":
-        return await handle_get_import_details(arguments)
-    # Phase 1: Advanced Pattern Analysis Tools
-    elif name == "find_similar_functions":
-        return await handle_find_similar_functions(arguments)
-    elif name == "find_code_patterns":
-        return await handle_find_code_patterns(arguments)
-    elif name == "group_similar_functions":
-        return await handle_group_similar_functions(arguments)
-    # Phase 1: Advanced Type Analysis Tools
-    elif name == "build_type_dependency_graph":
-        return await handle_build_type_dependency_graph(arguments)
-    elif name == "get_nested_types":
-        return await handle_get_nested_types(arguments)
-    elif name == "analyze_type_relationships":
-        return await handle_analyze_type_relationships(arguments)
-    # Phase 1: Source Location Tools
-    elif name == "find_element_by_location":
-        return await handle_find_element_by_location(arguments)
-    elif name == "get_location_context":
-        return await handle_get_location_context(arguments)
-    # Phase 1: Function Context Tools
-    elif name == "get_function_context":
-        return await handle_get_function_context(arguments)
-    elif name == "generate_function_imports":
-        return await handle_generate_function_imports(arguments)
-    # Phase 2: Enhanced Query Capabilities Tools
-    elif name == "execute_custom_query":
-        return await handle_execute_custom_query(arguments)
-    elif name == "pattern_match_code":
-        return await handle_pattern_match_code(arguments)
-    elif name == "analyze_cross_module_dependencies":
-        return await handle_analyze_cross_module_dependencies(arguments)
-    elif name == "enhanced_function_call_graph":
-        return await handle_enhanced_function_call_graph(arguments)
-    else:
+    handler = _DISPATCH.get(name)
+    if handler is None:
         raise ValueError(f"Unknown tool: {name}")
+    
+    missing = [key for key in _REQUIRED_ARGS[name] if key not in arguments]
+    if missing:
+        raise ValueError(f"Missing required argument(s) for {name}: {', '.join(missing)}")
+    
+    if not code_service.initialized:
+        return handler(arguments)
+    
+    cache_key = None
+    if name in _CACHEABLE_TOOLS:
+        try:
+            cache_key = (name, frozenset(arguments.items()))
+            cached = _RESULT_CACHE.get(cache_key)
+        except TypeError:
+            # Unhashable argument values; just don't cache this call
+            cache_key = cached = None
+        if cached is not None:
+            return cached
+    
+    # Handlers are synchronous and only do blocking database work, so run each
+    # one on a worker thread and keep the event loop free for concurrent
+    # calls; session() used as a decorator opens a fresh session per call
+    result = await anyio.to_thread.run_sync(code_service.session()(handler), arguments, limiter=_tool_limiter)
+    
+    # Don't keep error responses around
+    if cache_key is not None and not result[0].text.startswith("Error"):
+        _RESULT_CACHE.set(cache_key, result)
+    return result
 
 
-async def handle_list_modules(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_list_modules(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """List all modules"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     limit = arguments.get("limit", 100)
     
     try:
-        modules = code_service.query_service.get_all_modules()
-        modules = modules[:limit]  # Apply limit
+        # Apply the limit in SQL rather than loading every module and slicing;
+        # only the names are shown, so don't build Module objects
+        module_names = code_service.db_session.scalars(select(Module.name).limit(limit)).all()
         
-        result = f"Found {len(modules)} modules:\n\n"
-        for module in modules:
-            result += f"- {module.name}\n"
+        lines = [f"Found {len(module_names)} modules:\n"]
+        lines.extend(f"- {module_name}" for module_name in module_names)
+        result = "\n".join(lines) + "\n"
         
         return [types.TextContent(type="text", text=result)]
     except Exception as e:
@@ -1439,13 +1589,10 @@ async def handle_list_modules(arguments: Dict[str, Any]) -> List[types.TextConte
             text=f"Error listing modules: {e}"
         )]
 
-async def handle_get_function_details(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_get_function_details(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Get function details"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     function_name = arguments["function_name"]
     module_name = arguments.get("module_name")
@@ -1454,7 +1601,7 @@ async def handle_get_function_details(arguments: Dict[str, Any]) -> List[types.T
         # Get module if specified
         module_id = None
         if module_name:
-            module = code_service.query_service.get_module_by_name(module_name)
+            module = code_service.get_module_by_name(module_name)
             if not module:
                 return [types.TextContent(
                     type="text",
@@ -1471,30 +1618,29 @@ async def handle_get_function_details(arguments: Dict[str, Any]) -> List[types.T
                 text=f"Function not found: {function_name}"
             )]
         
-        result = f"Found {len(functions)} function(s) named '{function_name}':\n\n"
+        parts = [f"Found {len(functions)} function(s) named '{function_name}':\n\n"]
         
         for func in functions:
-            result += f"Function: {func.name}\n"
-            result += f"Module: {func.module.name if func.module else 'Unknown'}\n"
-            result += f"Signature: {func.function_signature or 'No signature'}\n"
-            result += f"Source Location: {func.src_loc or 'Unknown'}\n"
-            result += f"Type: {func.type_enum or 'Unknown'}\n"
-            result += "---\n"
+            parts.append(
+                f"Function: {func.name}\n"
+                f"Module: {func.module.name if func.module else 'Unknown'}\n"
+                f"Signature: {func.function_signature or 'No signature'}\n"
+                f"Source Location: {func.src_loc or 'Unknown'}\n"
+                f"Type: {func.type_enum or 'Unknown'}\n"
+                "---\n"
+            )
         
-        return [types.TextContent(type="text", text=result)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error getting function details: {e}"
         )]
 
-async def handle_search_functions(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_search_functions(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Search functions by pattern"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     pattern = arguments["pattern"]
     limit = arguments.get("limit", 50)
@@ -1508,10 +1654,9 @@ async def handle_search_functions(arguments: Dict[str, Any]) -> List[types.TextC
             )]
         
         like_pattern = build_like_pattern(pattern)
-        results = (code_service.db_session.query(Function)
-                  .filter(Function.name.like(like_pattern))
-                  .limit(limit)
-                  .all())
+        results = code_service.db_session.execute(
+            _SEARCH_FUNCTIONS_STMT, {"pattern": like_pattern, "limit": limit}
+        ).all()
         
         if not results:
             return [types.TextContent(
@@ -1519,33 +1664,30 @@ async def handle_search_functions(arguments: Dict[str, Any]) -> List[types.TextC
                 text=f"No functions found matching pattern: {pattern}"
             )]
         
-        result_text = f"Found {len(results)} functions matching '{pattern}':\n\n"
+        parts = [f"Found {len(results)} functions matching '{pattern}':\n\n"]
         
-        for func in results:
-            result_text += f"- {func.name}"
-            if hasattr(func, 'module') and func.module:
-                result_text += f" (in {func.module.name})"
-            result_text += "\n"
+        for function_name, module_name in results:
+            parts.append(f"- {function_name}")
+            if module_name:
+                parts.append(f" (in {module_name})")
+            parts.append("\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error searching functions: {e}"
         )]
 
-async def handle_get_most_called_functions(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_get_most_called_functions(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Get most called functions"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     limit = arguments.get("limit", 20)
     
     try:
-        functions = code_service.query_service.get_most_called_functions(limit=limit)
+        functions = code_service.db_session.execute(_MOST_CALLED_STMT, {"limit": limit}).all()
         
         if not functions:
             return [types.TextContent(
@@ -1553,40 +1695,31 @@ async def handle_get_most_called_functions(arguments: Dict[str, Any]) -> List[ty
                 text="No function call data found"
             )]
         
-        result = f"Top {len(functions)} most called functions:\n\n"
+        parts = [f"Top {len(functions)} most called functions:\n\n"]
         
-        # Handle dictionary return format
-        for i, func_data in enumerate(functions, 1):
-            if isinstance(func_data, dict):
-                name = func_data.get('name', 'Unknown')
-                module = func_data.get('module', 'Unknown')
-                calls = func_data.get('calls', 0)
-                result += f"{i}. {name} - {calls} calls (in {module})\n"
-            else:
-                result += f"{i}. {func_data}\n"
+        for i, (name, module, calls) in enumerate(functions, 1):
+            parts.append(f"{i}. {name} - {calls} calls (in {module or 'Unknown'})\n")
         
-        return [types.TextContent(type="text", text=result)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error getting most called functions: {e}"
         )]
 
-async def handle_execute_query(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_execute_query(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Execute basic queries"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     query_type = arguments["query_type"]
     filters = arguments.get("filters", {})
     
     try:
         if query_type == "modules":
-            modules = code_service.query_service.get_all_modules()
-            result = f"Found {len(modules)} modules"
+            # Only the count is reported, so let the database do the counting
+            module_count = code_service.db_session.scalar(select(sql_func.count()).select_from(Module))
+            result = f"Found {module_count} modules"
             
         elif query_type == "functions":
             if not Function:
@@ -1595,16 +1728,19 @@ async def handle_execute_query(arguments: Dict[str, Any]) -> List[types.TextCont
                     text="Function model not available - code_as_data library not loaded"
                 )]
             
-            query = code_service.db_session.query(Function)
+            # Only ids are selected so the limited count wraps a narrow
+            # subquery instead of every function column
+            matching = select(Function.id)
             
             if filters.get("name_pattern"):
                 name_pattern = build_like_pattern(filters['name_pattern'])
-                query = query.filter(Function.name.like(name_pattern))
+                matching = matching.where(Function.name.like(name_pattern))
             if filters.get("module_id"):
-                query = query.filter(Function.module_id == filters["module_id"])
+                matching = matching.where(Function.module_id == filters["module_id"])
             
-            functions = query.limit(filters.get("limit", 100)).all()
-            result = f"Found {len(functions)} functions"
+            matching = matching.limit(filters.get("limit", 100)).subquery()
+            function_count = code_service.db_session.scalar(select(sql_func.count()).select_from(matching))
+            result = f"Found {function_count} functions"
             
         else:
             result = f"Query type '{query_type}' not yet implemented"
@@ -1618,30 +1754,30 @@ async def handle_execute_query(arguments: Dict[str, Any]) -> List[types.TextCont
 
 # Phase 1: Module Enhancement Tool Handlers
 
-async def handle_get_module_details(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_get_module_details(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Get detailed information about a specific module"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     module_name = arguments["module_name"]
     
     try:
         # Get module
-        module = code_service.query_service.get_module_by_name(module_name)
+        module = code_service.get_module_by_name(module_name)
         if not module:
             return [types.TextContent(
                 type="text",
                 text=f"Module not found: {module_name}"
             )]
         
-        # Get functions in module
-        functions = code_service.query_service.get_functions_by_module(module.id)
-        
-        # Get other statistics
-        function_count = len(functions) if functions else 0
+        # Only the first 10 function names are shown; the module's total
+        # comes along on each row from a window count instead of loading them all
+        rows = (code_service.db_session.query(Function.name, sql_func.count().over())
+               .filter(Function.module_id == module.id)
+               .limit(10)
+               .all())
+        functions = [function_name for function_name, _ in rows]
+        function_count = rows[0][1] if rows else 0
         
         # Try to get imports and other data if available
         import_count = 0
@@ -1656,40 +1792,37 @@ async def handle_get_module_details(arguments: Dict[str, Any]) -> List[types.Tex
         except:
             pass  # If models not available, skip counts
         
-        result = f"Module Details: {module.name}\n\n"
-        result += f"Path: {module.path or 'Unknown'}\n"
-        result += f"Functions: {function_count}\n"
+        parts = [f"Module Details: {module.name}\n\n"]
+        parts.append(f"Path: {module.path or 'Unknown'}\n")
+        parts.append(f"Functions: {function_count}\n")
         if import_count > 0:
-            result += f"Imports: {import_count}\n"
+            parts.append(f"Imports: {import_count}\n")
         if type_count > 0:
-            result += f"Types: {type_count}\n"
+            parts.append(f"Types: {type_count}\n")
         if class_count > 0:
-            result += f"Classes: {class_count}\n"
+            parts.append(f"Classes: {class_count}\n")
         
-        if functions and len(functions) <= 10:
-            result += f"\nSample Functions:\n"
-            for func in functions[:10]:
-                result += f"- {func.name}\n"
+        if functions and function_count <= 10:
+            parts.append(f"\nSample Functions:\n")
+            for function_name in functions:
+                parts.append(f"- {function_name}\n")
         elif functions:
-            result += f"\nFirst 10 Functions:\n"
-            for func in functions[:10]:
-                result += f"- {func.name}\n"
-            result += f"... and {len(functions) - 10} more\n"
+            parts.append(f"\nFirst 10 Functions:\n")
+            for function_name in functions:
+                parts.append(f"- {function_name}\n")
+            parts.append(f"... and {function_count - 10} more\n")
         
-        return [types.TextContent(type="text", text=result)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error getting module details: {e}"
         )]
 
-async def handle_get_functions_by_module(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_get_functions_by_module(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Get all functions defined in a specific module"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     module_name = arguments["module_name"]
     limit = arguments.get("limit", 100)
@@ -1697,15 +1830,20 @@ async def handle_get_functions_by_module(arguments: Dict[str, Any]) -> List[type
     
     try:
         # Get module
-        module = code_service.query_service.get_module_by_name(module_name)
+        module = code_service.get_module_by_name(module_name)
         if not module:
             return [types.TextContent(
                 type="text",
                 text=f"Module not found: {module_name}"
             )]
         
-        # Get functions
-        functions = code_service.query_service.get_functions_by_module(module.id)
+        # Get functions, letting the database stop after `limit` rows; signatures
+        # can be long, so they're only transferred when they'll be shown
+        signature = Function.function_signature if include_signatures else null().label("function_signature")
+        functions = (code_service.db_session.query(Function.name, signature, Function.src_loc)
+                    .filter(Function.module_id == module.id)
+                    .limit(limit)
+                    .all())
         
         if not functions:
             return [types.TextContent(
@@ -1713,33 +1851,27 @@ async def handle_get_functions_by_module(arguments: Dict[str, Any]) -> List[type
                 text=f"No functions found in module: {module_name}"
             )]
         
-        # Apply limit
-        functions = functions[:limit]
-        
-        result = f"Functions in module '{module_name}' ({len(functions)} shown):\n\n"
+        parts = [f"Functions in module '{module_name}' ({len(functions)} shown):\n\n"]
         
         for func in functions:
-            result += f"- {func.name}"
+            parts.append(f"- {func.name}")
             if include_signatures and func.function_signature:
-                result += f" :: {func.function_signature}"
+                parts.append(f" :: {func.function_signature}")
             if func.src_loc:
-                result += f" (at {func.src_loc})"
-            result += "\n"
+                parts.append(f" (at {func.src_loc})")
+            parts.append("\n")
         
-        return [types.TextContent(type="text", text=result)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error getting functions by module: {e}"
         )]
 
-async def handle_search_modules(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_search_modules(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Search for modules by name pattern"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     pattern = arguments["pattern"]
     limit = arguments.get("limit", 50)
@@ -1753,10 +1885,9 @@ async def handle_search_modules(arguments: Dict[str, Any]) -> List[types.TextCon
             )]
         
         like_pattern = build_like_pattern(pattern)
-        results = (code_service.db_session.query(Module)
-                  .filter(Module.name.like(like_pattern))
-                  .limit(limit)
-                  .all())
+        results = code_service.db_session.execute(
+            _SEARCH_MODULES_STMT, {"pattern": like_pattern, "limit": limit}
+        ).all()
         
         if not results:
             return [types.TextContent(
@@ -1764,28 +1895,25 @@ async def handle_search_modules(arguments: Dict[str, Any]) -> List[types.TextCon
                 text=f"No modules found matching pattern: {pattern}"
             )]
         
-        result_text = f"Found {len(results)} modules matching '{pattern}':\n\n"
+        parts = [f"Found {len(results)} modules matching '{pattern}':\n\n"]
         
-        for module in results:
-            result_text += f"- {module.name}"
-            if module.path:
-                result_text += f" (path: {module.path})"
-            result_text += "\n"
+        for module_name, module_path in results:
+            parts.append(f"- {module_name}")
+            if module_path:
+                parts.append(f" (path: {module_path})")
+            parts.append("\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error searching modules: {e}"
         )]
 
-async def handle_get_module_dependencies(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_get_module_dependencies(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Analyze module dependencies and imports"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     module_name = arguments["module_name"]
     include_imports = arguments.get("include_imports", True)
@@ -1793,63 +1921,63 @@ async def handle_get_module_dependencies(arguments: Dict[str, Any]) -> List[type
     
     try:
         # Get module
-        module = code_service.query_service.get_module_by_name(module_name)
+        module = code_service.get_module_by_name(module_name)
         if not module:
             return [types.TextContent(
                 type="text",
                 text=f"Module not found: {module_name}"
             )]
         
-        result = f"Module Dependencies: {module_name}\n\n"
+        parts = [f"Module Dependencies: {module_name}\n\n"]
         
         if include_imports:
             try:
-                from code_as_data.db.models import Import
                 if Import:
                     imports = code_service.db_session.query(Import).filter(Import.module_id == module.id).all()
                     
                     if imports:
-                        result += f"Imports ({len(imports)}):\n"
+                        parts.append(f"Imports ({len(imports)}):\n")
                         for imp in imports:
-                            result += f"- {imp.module_name}"
+                            parts.append(f"- {imp.module_name}")
                             if imp.package_name:
-                                result += f" (from {imp.package_name})"
+                                parts.append(f" (from {imp.package_name})")
                             if imp.qualified_style:
-                                result += f" (qualified)"
+                                parts.append(f" (qualified)")
                             if imp.as_module_name:
-                                result += f" as {imp.as_module_name}"
-                            result += "\n"
-                        result += "\n"
+                                parts.append(f" as {imp.as_module_name}")
+                            parts.append("\n")
+                        parts.append("\n")
                     else:
-                        result += "No imports found.\n\n"
+                        parts.append("No imports found.\n\n")
                 else:
-                    result += "Import data not available.\n\n"
+                    parts.append("Import data not available.\n\n")
             except Exception as e:
-                result += f"Error getting imports: {e}\n\n"
+                parts.append(f"Error getting imports: {e}\n\n")
         
         if include_dependents:
             try:
-                from code_as_data.db.models import Import
                 if Import:
-                    # Find modules that import this module
-                    dependents = (code_service.db_session.query(Import)
+                    # Find modules that import this module; only their names
+                    # are shown, each once even if it imports this module twice
+                    dependents = (code_service.db_session.query(Module.name)
+                                .join(Import, Import.module_id == Module.id)
                                 .filter(Import.module_name == module_name)
-                                .join(Module, Import.module_id == Module.id)
+                                .distinct()
                                 .all())
                     
                     if dependents:
-                        result += f"Dependent Modules ({len(dependents)}):\n"
-                        for dep in dependents:
-                            result += f"- {dep.module.name}\n"
-                        result += "\n"
+                        parts.append(f"Dependent Modules ({len(dependents)}):\n")
+                        for (dependent_name,) in dependents:
+                            parts.append(f"- {dependent_name}\n")
+                        parts.append("\n")
                     else:
-                        result += "No dependent modules found.\n\n"
+                        parts.append("No dependent modules found.\n\n")
                 else:
-                    result += "Dependency data not available.\n\n"
+                    parts.append("Dependency data not available.\n\n")
             except Exception as e:
-                result += f"Error getting dependents: {e}\n\n"
+                parts.append(f"Error getting dependents: {e}\n\n")
         
-        return [types.TextContent(type="text", text=result)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
@@ -1858,13 +1986,10 @@ async def handle_get_module_dependencies(arguments: Dict[str, Any]) -> List[type
 
 # Phase 1: Function Analysis Enhancement Tool Handlers
 
-async def handle_get_function_call_graph(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_get_function_call_graph(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Get function call hierarchy"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     function_name = arguments["function_name"]
     module_name = arguments.get("module_name")
@@ -1876,7 +2001,7 @@ async def handle_get_function_call_graph(arguments: Dict[str, Any]) -> List[type
         # Get the target function
         module_id = None
         if module_name:
-            module = code_service.query_service.get_module_by_name(module_name)
+            module = code_service.get_module_by_name(module_name)
             if not module:
                 return [types.TextContent(
                     type="text",
@@ -1884,87 +2009,115 @@ async def handle_get_function_call_graph(arguments: Dict[str, Any]) -> List[type
                 )]
             module_id = module.id
         
-        functions = code_service.query_service.get_function_by_name(function_name, module_id)
-        if not functions:
+        # The target function, its callers and its callees come back from one
+        # UNION ALL round trip, tagged by kind; the target is the first function
+        # with this name, resolved inline for the callee branch
+        target_id = function_id_subquery(function_name, module_id)
+        branches = [
+            select(literal("target").label("kind"), Function.name.label("name"), Module.name.label("module_name"))
+            .outerjoin(Module, Function.module_id == Module.id)
+            .where(Function.id == target_id)
+        ]
+        if include_callers:
+            branches.append(
+                select(literal("caller").label("kind"), Function.name.label("name"), Module.name.label("module_name"))
+                .select_from(FunctionCalled)
+                .join(Function, FunctionCalled.function_id == Function.id)
+                .outerjoin(Module, Function.module_id == Module.id)
+                .where(FunctionCalled.name == function_name)
+                .limit(20)
+            )
+        if include_callees:
+            branches.append(
+                select(literal("callee").label("kind"), FunctionCalled.name.label("name"),
+                       FunctionCalled.module_name.label("module_name"))
+                .where(FunctionCalled.function_id == target_id)
+                .limit(20)
+            )
+        # Each branch is wrapped as a subquery so its own LIMIT applies
+        rows = code_service.db_session.execute(
+            union_all(*(select(*branch.subquery().c) for branch in branches))
+        ).all()
+        
+        target = None
+        callers = []
+        callees = []
+        for kind, name, row_module_name in rows:
+            if kind == "target":
+                target = (name, row_module_name)
+            elif kind == "caller":
+                callers.append((name, row_module_name))
+            else:
+                callees.append((name, row_module_name))
+        
+        if target is None:
             return [types.TextContent(
                 type="text",
                 text=f"Function not found: {function_name}"
             )]
         
-        # Use the first matching function
-        target_function = functions[0]
-        
-        result = f"Call Graph for '{target_function.name}'"
-        if target_function.module:
-            result += f" (in {target_function.module.name})"
-        result += "\n\n"
+        target_name, target_module_name = target
+        parts = [f"Call Graph for '{target_name}'"]
+        if target_module_name:
+            parts.append(f" (in {target_module_name})")
+        parts.append("\n\n")
         
         if include_callers:
-            # Get functions that call this function
-            try:
-                from code_as_data.db.models import FunctionCalled
-                if FunctionCalled:
-                    callers = (code_service.db_session.query(FunctionCalled)
-                             .filter(FunctionCalled.name == target_function.name)
-                             .join(Function, FunctionCalled.function_id == Function.id)
-                             .limit(20)
-                             .all())
-                    
-                    if callers:
-                        result += f"Called by ({len(callers)} functions):\n"
-                        for caller in callers:
-                            if hasattr(caller, 'function') and caller.function:
-                                result += f"  ← {caller.function.name}"
-                                if caller.function.module:
-                                    result += f" (in {caller.function.module.name})"
-                                result += "\n"
-                        result += "\n"
-                    else:
-                        result += "No callers found.\n\n"
-                else:
-                    result += "Caller data not available.\n\n"
-            except Exception as e:
-                result += f"Error getting callers: {e}\n\n"
+            # Functions that call this function
+            if callers:
+                parts.append(f"Called by ({len(callers)} functions):\n")
+                for caller_name, caller_module_name in callers:
+                    parts.append(f"  ← {caller_name}")
+                    if caller_module_name:
+                        parts.append(f" (in {caller_module_name})")
+                    parts.append("\n")
+                parts.append("\n")
+            else:
+                parts.append("No callers found.\n\n")
         
         if include_callees:
-            # Get functions called by this function
-            try:
-                from code_as_data.db.models import FunctionCalled
-                if FunctionCalled:
-                    callees = (code_service.db_session.query(FunctionCalled)
-                             .filter(FunctionCalled.function_id == target_function.id)
-                             .limit(20)
-                             .all())
-                    
-                    if callees:
-                        result += f"Calls ({len(callees)} functions):\n"
-                        for callee in callees:
-                            result += f"  → {callee.name}"
-                            if callee.module_name:
-                                result += f" (in {callee.module_name})"
-                            result += "\n"
-                        result += "\n"
-                    else:
-                        result += "No function calls found.\n\n"
-                else:
-                    result += "Callee data not available.\n\n"
-            except Exception as e:
-                result += f"Error getting callees: {e}\n\n"
+            # Functions called by this function
+            if callees:
+                parts.append(f"Calls ({len(callees)} functions):\n")
+                for callee_name, callee_module_name in callees:
+                    parts.append(f"  → {callee_name}")
+                    if callee_module_name:
+                        parts.append(f" (in {callee_module_name})")
+                    parts.append("\n")
+                parts.append("\n")
+            else:
+                parts.append("No function calls found.\n\n")
         
-        return [types.TextContent(type="text", text=result)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error getting function call graph: {e}"
         )]
 
-async def handle_get_function_callers(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def function_id_subquery(function_name: str, module_id=None):
+    """Scalar subquery for the id of the first function with this name (optionally in a module)"""
+    stmt = select(Function.id).where(Function.name == function_name)
+    if module_id is not None:
+        stmt = stmt.where(Function.module_id == module_id)
+    return stmt.limit(1).scalar_subquery()
+
+def function_exists_clause(function_name: str, module_id=None):
+    """EXISTS clause for a function with this name (optionally in a module); aliased so it never correlates with an outer Function"""
+    target = aliased(Function)
+    stmt = select(target.id).where(target.name == function_name)
+    if module_id is not None:
+        stmt = stmt.where(target.module_id == module_id)
+    return stmt.exists()
+
+def function_exists(function_name: str, module_id=None) -> bool:
+    """Check whether a function with this name exists (optionally in a module)"""
+    return code_service.db_session.scalar(select(function_exists_clause(function_name, module_id)))
+
+def handle_get_function_callers(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Get all functions that call a specific function"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     function_name = arguments["function_name"]
     module_name = arguments.get("module_name")
@@ -1974,7 +2127,7 @@ async def handle_get_function_callers(arguments: Dict[str, Any]) -> List[types.T
         # Get the target function
         module_id = None
         if module_name:
-            module = code_service.query_service.get_module_by_name(module_name)
+            module = code_service.get_module_by_name(module_name)
             if not module:
                 return [types.TextContent(
                     type="text",
@@ -1982,43 +2135,46 @@ async def handle_get_function_callers(arguments: Dict[str, Any]) -> List[types.T
                 )]
             module_id = module.id
         
-        functions = code_service.query_service.get_function_by_name(function_name, module_id)
-        if not functions:
-            return [types.TextContent(
-                type="text",
-                text=f"Function not found: {function_name}"
-            )]
-        
-        target_function = functions[0]
-        
         # Get callers
         try:
-            from code_as_data.db.models import FunctionCalled
             if FunctionCalled:
+                # Call edges are matched by the callee's name; the target
+                # function (in module_name, if given) must exist, which an
+                # EXISTS checks in the same query. Each caller's function and
+                # module come from the same joined query
                 callers = (code_service.db_session.query(FunctionCalled)
-                         .filter(FunctionCalled.name == target_function.name)
+                         .filter(FunctionCalled.name == function_name)
+                         .filter(function_exists_clause(function_name, module_id))
                          .join(Function, FunctionCalled.function_id == Function.id)
+                         .options(contains_eager(FunctionCalled.function)
+                                  .joinedload(Function.module))
                          .limit(limit)
                          .all())
                 
                 if not callers:
+                    # Only now tell a missing function apart from an uncalled one
+                    if not function_exists(function_name, module_id):
+                        return [types.TextContent(
+                            type="text",
+                            text=f"Function not found: {function_name}"
+                        )]
                     return [types.TextContent(
                         type="text",
                         text=f"No functions found that call '{function_name}'"
                     )]
                 
-                result = f"Functions that call '{target_function.name}' ({len(callers)} found):\n\n"
+                parts = [f"Functions that call '{function_name}' ({len(callers)} found):\n\n"]
                 
                 for caller in callers:
-                    if hasattr(caller, 'function') and caller.function:
-                        result += f"- {caller.function.name}"
+                    if caller.function:
+                        parts.append(f"- {caller.function.name}")
                         if caller.function.module:
-                            result += f" (in {caller.function.module.name})"
+                            parts.append(f" (in {caller.function.module.name})")
                         if caller.src_loc:
-                            result += f" at {caller.src_loc}"
-                        result += "\n"
+                            parts.append(f" at {caller.src_loc}")
+                        parts.append("\n")
                 
-                return [types.TextContent(type="text", text=result)]
+                return [types.TextContent(type="text", text="".join(parts))]
             else:
                 return [types.TextContent(
                     type="text",
@@ -2035,13 +2191,10 @@ async def handle_get_function_callers(arguments: Dict[str, Any]) -> List[types.T
             text=f"Error getting function callers: {e}"
         )]
 
-async def handle_get_function_callees(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_get_function_callees(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Get all functions called by a specific function"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     function_name = arguments["function_name"]
     module_name = arguments.get("module_name")
@@ -2051,7 +2204,7 @@ async def handle_get_function_callees(arguments: Dict[str, Any]) -> List[types.T
         # Get the target function
         module_id = None
         if module_name:
-            module = code_service.query_service.get_module_by_name(module_name)
+            module = code_service.get_module_by_name(module_name)
             if not module:
                 return [types.TextContent(
                     type="text",
@@ -2059,41 +2212,39 @@ async def handle_get_function_callees(arguments: Dict[str, Any]) -> List[types.T
                 )]
             module_id = module.id
         
-        functions = code_service.query_service.get_function_by_name(function_name, module_id)
-        if not functions:
-            return [types.TextContent(
-                type="text",
-                text=f"Function not found: {function_name}"
-            )]
-        
-        target_function = functions[0]
-        
         # Get callees
         try:
-            from code_as_data.db.models import FunctionCalled
             if FunctionCalled:
+                # Resolve the target function inline so the edges come back in
+                # a single round trip
                 callees = (code_service.db_session.query(FunctionCalled)
-                         .filter(FunctionCalled.function_id == target_function.id)
+                         .filter(FunctionCalled.function_id == function_id_subquery(function_name, module_id))
                          .limit(limit)
                          .all())
                 
                 if not callees:
+                    # Only now tell a missing function apart from a leaf function
+                    if not function_exists(function_name, module_id):
+                        return [types.TextContent(
+                            type="text",
+                            text=f"Function not found: {function_name}"
+                        )]
                     return [types.TextContent(
                         type="text",
                         text=f"No functions found called by '{function_name}'"
                     )]
                 
-                result = f"Functions called by '{target_function.name}' ({len(callees)} found):\n\n"
+                parts = [f"Functions called by '{function_name}' ({len(callees)} found):\n\n"]
                 
                 for callee in callees:
-                    result += f"- {callee.name}"
+                    parts.append(f"- {callee.name}")
                     if callee.module_name:
-                        result += f" (in {callee.module_name})"
+                        parts.append(f" (in {callee.module_name})")
                     if callee.src_loc:
-                        result += f" at {callee.src_loc}"
-                    result += "\n"
+                        parts.append(f" at {callee.src_loc}")
+                    parts.append("\n")
                 
-                return [types.TextContent(type="text", text=result)]
+                return [types.TextContent(type="text", text="".join(parts))]
             else:
                 return [types.TextContent(
                     type="text",
@@ -2112,13 +2263,35 @@ async def handle_get_function_callees(arguments: Dict[str, Any]) -> List[types.T
 
 # Phase 1: Advanced Query Capabilities Tool Handlers
 
-async def handle_execute_advanced_query(arguments: Dict[str, Any]) -> List[types.TextContent]:
+# execute_advanced_query condition operator -> filter expression builder
+_CONDITION_OPERATORS = {
+    "eq": lambda field, value: field == value,
+    "ne": lambda field, value: field != value,
+    "like": lambda field, value: field.like(build_like_pattern(value)),
+    "ilike": lambda field, value: field.ilike(build_like_pattern(value)),
+    "startswith": lambda field, value: field.like(f"{normalize_search_pattern(value)}%"),
+    "endswith": lambda field, value: field.like(f"%{normalize_search_pattern(value)}"),
+    "gt": lambda field, value: field > value,
+    "lt": lambda field, value: field < value,
+    "ge": lambda field, value: field >= value,
+    "le": lambda field, value: field <= value,
+    "is_null": lambda field, value: field.is_(None),
+}
+
+@lru_cache(maxsize=None)
+def model_fields(model) -> Dict[str, Any]:
+    """Mapped column and relationship attributes of a model by name, resolved once per model"""
+    return {attr.key: getattr(model, attr.key) for attr in sa_inspect(model).attrs}
+
+@lru_cache(maxsize=None)
+def listing_attributes(model) -> tuple:
+    """Whether a model has (name, module, module_name) attributes, probed once per model"""
+    return hasattr(model, 'name'), hasattr(model, 'module'), hasattr(model, 'module_name')
+
+def handle_execute_advanced_query(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Execute complex JSON-based queries"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     query = arguments["query"]
     query_type = query["type"]
@@ -2126,31 +2299,13 @@ async def handle_execute_advanced_query(arguments: Dict[str, Any]) -> List[types
     limit = query.get("limit", 100)
     
     try:
-        # Map query types to models
-        model_map = {
-            "function": Function,
-            "module": Module,
-        }
-        
-        # Try to import other models if available
-        try:
-            from code_as_data.db.models import Type, Class, Import, Instance
-            model_map.update({
-                "type": Type,
-                "class": Class, 
-                "import": Import,
-                "instance": Instance
-            })
-        except ImportError:
-            pass
-        
-        if query_type not in model_map:
+        if query_type not in _ADVANCED_QUERY_MODELS:
             return [types.TextContent(
                 type="text",
                 text=f"Query type '{query_type}' not available or not supported"
             )]
         
-        model = model_map[query_type]
+        model = _ADVANCED_QUERY_MODELS[query_type]
         if not model:
             return [types.TextContent(
                 type="text",
@@ -2170,36 +2325,23 @@ async def handle_execute_advanced_query(arguments: Dict[str, Any]) -> List[types
                 continue
                 
             # Get the field from the model
-            if hasattr(model, field):
-                model_field = getattr(model, field)
-                
-                # Apply operator
-                if operator == "eq":
-                    db_query = db_query.filter(model_field == value)
-                elif operator == "ne":
-                    db_query = db_query.filter(model_field != value)
-                elif operator == "like":
-                    like_pattern = build_like_pattern(value)
-                    db_query = db_query.filter(model_field.like(like_pattern))
-                elif operator == "ilike":
-                    like_pattern = build_like_pattern(value)
-                    db_query = db_query.filter(model_field.ilike(like_pattern))
-                elif operator == "startswith":
-                    normalized_value = normalize_search_pattern(value)
-                    db_query = db_query.filter(model_field.like(f"{normalized_value}%"))
-                elif operator == "endswith":
-                    normalized_value = normalize_search_pattern(value)
-                    db_query = db_query.filter(model_field.like(f"%{normalized_value}"))
-                elif operator == "gt":
-                    db_query = db_query.filter(model_field > value)
-                elif operator == "lt":
-                    db_query = db_query.filter(model_field < value)
-                elif operator == "ge":
-                    db_query = db_query.filter(model_field >= value)
-                elif operator == "le":
-                    db_query = db_query.filter(model_field <= value)
-                elif operator == "is_null":
-                    db_query = db_query.filter(model_field.is_(None))
+            model_field = model_fields(model).get(field)
+            if model_field is not None:
+                # Apply operator; unknown operators are ignored
+                apply_operator = _CONDITION_OPERATORS.get(operator)
+                if apply_operator is not None:
+                    db_query = db_query.filter(apply_operator(model_field, value))
+        
+        # Load only the columns the listing below prints, with the module
+        # name joined in rather than lazy-loaded per row
+        has_name, has_module, has_module_name = listing_attributes(model)
+        if has_name:
+            columns = [model.name]
+            if has_module_name:
+                columns.append(model.module_name)
+            db_query = db_query.options(load_only(*columns))
+            if has_module:
+                db_query = db_query.options(joinedload(model.module).load_only(Module.name))
         
         # Execute query with limit
         results = db_query.limit(limit).all()
@@ -2210,50 +2352,50 @@ async def handle_execute_advanced_query(arguments: Dict[str, Any]) -> List[types
                 text=f"No {query_type}s found matching the specified conditions"
             )]
         
-        result_text = f"Advanced Query Results ({len(results)} {query_type}s found):\n\n"
+        parts = [f"Advanced Query Results ({len(results)} {query_type}s found):\n\n"]
         
         for item in results:
-            if hasattr(item, 'name'):
-                result_text += f"- {item.name}"
-                if hasattr(item, 'module') and item.module:
-                    result_text += f" (in {item.module.name})"
-                elif hasattr(item, 'module_name') and item.module_name:
-                    result_text += f" (in {item.module_name})"
-                result_text += "\n"
+            if has_name:
+                parts.append(f"- {item.name}")
+                if has_module and item.module:
+                    parts.append(f" (in {item.module.name})")
+                elif has_module_name and item.module_name:
+                    parts.append(f" (in {item.module_name})")
+                parts.append("\n")
             else:
-                result_text += f"- {str(item)}\n"
+                parts.append(f"- {str(item)}\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error executing advanced query: {e}"
         )]
 
-async def handle_find_cross_module_calls(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_find_cross_module_calls(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Find function calls that cross module boundaries"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     source_module = arguments.get("source_module")
     target_module = arguments.get("target_module")
     limit = arguments.get("limit", 100)
     
     try:
-        from code_as_data.db.models import FunctionCalled
         if not FunctionCalled:
             return [types.TextContent(
                 type="text",
                 text="FunctionCalled model not available - cross-module call analysis not supported"
             )]
         
-        # Build query for cross-module calls
+        # Build query for cross-module calls; the joins that filter on the
+        # caller's module also fill call.function and its module, so the
+        # result loop doesn't lazy-load them row by row
         query = (code_service.db_session.query(FunctionCalled)
                 .join(Function, FunctionCalled.function_id == Function.id)
-                .join(Module, Function.module_id == Module.id))
+                .join(Module, Function.module_id == Module.id)
+                .options(contains_eager(FunctionCalled.function)
+                         .contains_eager(Function.module)))
         
         # Filter by source module if specified
         if source_module:
@@ -2276,258 +2418,200 @@ async def handle_find_cross_module_calls(arguments: Dict[str, Any]) -> List[type
                 text="No cross-module function calls found matching the specified criteria"
             )]
         
-        result_text = f"Cross-Module Function Calls ({len(results)} found):\n\n"
+        parts = [f"Cross-Module Function Calls ({len(results)} found):\n\n"]
         
         for call in results:
             if hasattr(call, 'function') and call.function and call.function.module:
-                result_text += f"- {call.function.module.name}.{call.function.name} → {call.module_name}.{call.name}\n"
+                parts.append(f"- {call.function.module.name}.{call.function.name} → {call.module_name}.{call.name}\n")
             else:
-                result_text += f"- {call.name} (from {call.module_name})\n"
+                parts.append(f"- {call.name} (from {call.module_name})\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error finding cross-module calls: {e}"
         )]
 
-async def handle_analyze_function_complexity(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_analyze_function_complexity(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Analyze function complexity metrics"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     module_name = arguments.get("module_name")
     min_complexity = arguments.get("min_complexity", 5)
     limit = arguments.get("limit", 50)
     
     try:
-        # Build base query
-        query = code_service.db_session.query(Function)
+        # Call and where-clause counts per function come from grouped subqueries
+        call_counts = (select(FunctionCalled.function_id, sql_func.count().label("n"))
+                      .group_by(FunctionCalled.function_id)
+                      .subquery())
+        
+        # Score every function in SQL: signature length / 20, 2 per '->' in
+        # the signature, 1 per 3 calls made, 2 per where-clause function
+        signature = Function.function_signature
+        signature_length = sql_func.char_length(signature)
+        arrow_count = (signature_length - sql_func.char_length(sql_func.replace(signature, "->", ""))) // 2
+        complexity_score = (sql_func.coalesce(signature_length // 20 + arrow_count * 2, 0)
+                            + sql_func.coalesce(call_counts.c.n, 0) // 3)
+        
+        query = (code_service.db_session.query(Function.name, Module.name, signature)
+                .outerjoin(Module, Function.module_id == Module.id)
+                .outerjoin(call_counts, call_counts.c.function_id == Function.id))
+        if WhereFunction:
+            where_counts = (select(WhereFunction.parent_function_id, sql_func.count().label("n"))
+                           .group_by(WhereFunction.parent_function_id)
+                           .subquery())
+            query = query.outerjoin(where_counts, where_counts.c.parent_function_id == Function.id)
+            complexity_score = complexity_score + sql_func.coalesce(where_counts.c.n, 0) * 2
         
         # Filter by module if specified
+        module_id = None
         if module_name:
-            module = code_service.query_service.get_module_by_name(module_name)
+            module = code_service.get_module_by_name(module_name)
             if not module:
                 return [types.TextContent(
                     type="text",
                     text=f"Module not found: {module_name}"
                 )]
-            query = query.filter(Function.module_id == module.id)
-        
-        functions = query.all()
-        
-        if not functions:
-            return [types.TextContent(
-                type="text",
-                text="No functions found for complexity analysis"
-            )]
-        
-        # Calculate complexity metrics
-        complex_functions = []
-        
-        for func in functions:
-            complexity_score = 0
-            
-            # Signature complexity (rough estimate)
-            if func.function_signature:
-                sig_len = len(func.function_signature)
-                arrow_count = func.function_signature.count("->")
-                complexity_score += (sig_len // 20) + (arrow_count * 2)
-            
-            # Try to get call count
-            try:
-                from code_as_data.db.models import FunctionCalled
-                if FunctionCalled:
-                    call_count = (code_service.db_session.query(FunctionCalled)
-                                .filter(FunctionCalled.function_id == func.id)
-                                .count())
-                    complexity_score += call_count // 3
-            except:
-                pass
-            
-            # Check if function has where clauses (local functions)
-            try:
-                from code_as_data.db.models import WhereFunction
-                if WhereFunction:
-                    where_count = (code_service.db_session.query(WhereFunction)
-                                 .filter(WhereFunction.parent_function_id == func.id)
-                                 .count())
-                    complexity_score += where_count * 2
-            except:
-                pass
-            
-            if complexity_score >= min_complexity:
-                complex_functions.append((func, complexity_score))
+            module_id = module.id
+            query = query.filter(Function.module_id == module_id)
         
-        # Sort by complexity score
-        complex_functions.sort(key=lambda x: x[1], reverse=True)
-        complex_functions = complex_functions[:limit]
+        # The database filters, ranks and keeps the top `limit`; only those
+        # rows come back
+        complex_functions = (query.add_columns(complexity_score)
+                            .filter(complexity_score >= min_complexity)
+                            .order_by(desc(complexity_score))
+                            .limit(limit)
+                            .all())
         
         if not complex_functions:
+            # Only now tell an empty scope apart from one without complex functions
+            has_functions = select(Function.id)
+            if module_id is not None:
+                has_functions = has_functions.where(Function.module_id == module_id)
+            if not code_service.db_session.scalar(select(has_functions.exists())):
+                return [types.TextContent(
+                    type="text",
+                    text="No functions found for complexity analysis"
+                )]
             return [types.TextContent(
                 type="text",
                 text=f"No functions found with complexity >= {min_complexity}"
             )]
         
-        result_text = f"Function Complexity Analysis ({len(complex_functions)} functions):\n\n"
+        parts = [f"Function Complexity Analysis ({len(complex_functions)} functions):\n\n"]
         
-        for func, score in complex_functions:
-            result_text += f"- {func.name} (complexity: {score})"
-            if func.module:
-                result_text += f" in {func.module.name}"
-            if func.function_signature:
-                result_text += f"\n  Signature: {func.function_signature[:100]}"
-                if len(func.function_signature) > 100:
-                    result_text += "..."
-            result_text += "\n\n"
+        for name, function_module_name, function_signature, score in complex_functions:
+            parts.append(f"- {name} (complexity: {score})")
+            if function_module_name:
+                parts.append(f" in {function_module_name}")
+            if function_signature:
+                parts.append(f"\n  Signature: {function_signature[:100]}")
+                if len(function_signature) > 100:
+                    parts.append("...")
+            parts.append("\n\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error analyzing function complexity: {e}"
         )]
 
-async def handle_get_code_statistics(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_get_code_statistics(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Get comprehensive statistics about the codebase"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     include_details = arguments.get("include_details", False)
     
     try:
-        result = "Codebase Statistics:\n\n"
+        parts = ["Codebase Statistics:\n\n"]
+        
+        # Every count is a scalar subquery of one SELECT, so the whole set
+        # costs a single round trip; optional models that aren't available
+        # are simply left out
+        signature = Function.function_signature
+        counted = [
+            ("modules", select(sql_func.count()).select_from(Module)),
+            ("functions", select(sql_func.count()).select_from(Function)),
+        ]
+        for key, model in (("types", Type), ("classes", Class), ("imports", Import),
+                           ("instances", Instance), ("calls", FunctionCalled)):
+            if model is not None:
+                counted.append((key, select(sql_func.count()).select_from(model)))
+        if include_details:
+            counted.append(("signed", select(sql_func.count()).select_from(Function)
+                                      .where(signature.isnot(None), signature != '')))
         
-        # Use efficient database queries for basic counts
         try:
-            # Get module count efficiently
-            module_count = code_service.db_session.query(Module).count()
-            result += f"📁 Modules: {module_count:,}\n"
-            
-            # Get function count efficiently with single query
-            function_count = code_service.db_session.query(Function).count()
-            result += f"⚡ Functions: {function_count:,}\n"
-            
+            counts = code_service.db_session.execute(
+                select(*(count.scalar_subquery().label(key) for key, count in counted))
+            ).one()._mapping
         except Exception:
-            # Fallback to QueryService if direct queries fail
-            try:
-                all_modules = code_service.query_service.get_all_modules()
-                module_count = len(all_modules) if all_modules else 0
-                result += f"📁 Modules: {module_count:,}\n"
-                
-                # Still avoid the expensive per-module loop in fallback
-                function_count = code_service.db_session.query(Function).count()
-                result += f"⚡ Functions: {function_count:,}\n"
-            except Exception:
-                result += "📁 Modules: Unable to count\n"
-                result += "⚡ Functions: Unable to count\n"
-                function_count = 0
-                module_count = 0
-        
-        # Try to get other entity counts
-        try:
-            from code_as_data.db.models import Type, Class, Import, Instance, FunctionCalled
-            
-            if Type:
-                type_count = code_service.db_session.query(Type).count()
-                result += f"🏗️ Types: {type_count:,}\n"
-            
-            if Class:
-                class_count = code_service.db_session.query(Class).count()
-                result += f"📚 Classes: {class_count:,}\n"
-            
-            if Import:
-                import_count = code_service.db_session.query(Import).count()
-                result += f"📦 Imports: {import_count:,}\n"
-            
-            if Instance:
-                instance_count = code_service.db_session.query(Instance).count()
-                result += f"🔗 Instances: {instance_count:,}\n"
-            
-            if FunctionCalled:
-                call_count = code_service.db_session.query(FunctionCalled).count()
-                result += f"📞 Function Calls: {call_count:,}\n"
-        except ImportError:
-            pass
+            # Leave the transaction usable for the detail queries below
+            code_service.db_session.rollback()
+            counts = {}
+        
+        module_count = counts.get("modules", 0)
+        function_count = counts.get("functions", 0)
+        if counts:
+            parts.append(f"📁 Modules: {module_count:,}\n")
+            parts.append(f"⚡ Functions: {function_count:,}\n")
+        else:
+            parts.append("📁 Modules: Unable to count\n")
+            parts.append("⚡ Functions: Unable to count\n")
+        
+        if "types" in counts:
+            parts.append(f"🏗️ Types: {counts['types']:,}\n")
+        if "classes" in counts:
+            parts.append(f"📚 Classes: {counts['classes']:,}\n")
+        if "imports" in counts:
+            parts.append(f"📦 Imports: {counts['imports']:,}\n")
+        if "instances" in counts:
+            parts.append(f"🔗 Instances: {counts['instances']:,}\n")
+        if "calls" in counts:
+            parts.append(f"📞 Function Calls: {counts['calls']:,}\n")
         
         if include_details:
-            result += "\n--- Detailed Breakdown ---\n\n"
+            parts.append("\n--- Detailed Breakdown ---\n\n")
             
-            # Top modules by function count using efficient query
+            # Top modules by function count, in a single JOIN + GROUP BY
             try:
-                # Use single query with JOIN and GROUP BY for efficiency
-                from sqlalchemy import func as sql_func
-                top_modules_query = (
+                top_modules = (
                     code_service.db_session.query(
                         Module.name,
                         sql_func.count(Function.id).label('function_count')
                     )
-                    .join(Function, Module.id == Function.module_id, isouter=True)
+                    .outerjoin(Function, Module.id == Function.module_id)
                     .group_by(Module.id, Module.name)
                     .order_by(sql_func.count(Function.id).desc())
                     .limit(10)
+                    .all()
                 )
                 
-                top_modules = top_modules_query.all()
-                
                 if top_modules:
-                    result += "Top 10 Modules by Function Count:\n"
+                    parts.append("Top 10 Modules by Function Count:\n")
                     for module_name, func_count in top_modules:
-                        result += f"  • {module_name}: {func_count} functions\n"
-                    result += "\n"
-            except Exception as e:
-                # Fallback to simplified approach if JOIN fails
-                try:
-                    # Use efficient query without per-module iteration
-                    from sqlalchemy import func as sql_func
-                    sample_modules_query = (
-                        code_service.db_session.query(
-                            Module.name,
-                            sql_func.count(Function.id).label('function_count')
-                        )
-                        .outerjoin(Function, Module.id == Function.module_id)
-                        .group_by(Module.id, Module.name)
-                        .order_by(sql_func.count(Function.id).desc())
-                        .limit(10)
-                    )
-                    
-                    sample_modules = sample_modules_query.all()
-                    if sample_modules:
-                        result += "Top Modules by Function Count:\n"
-                        for module_name, func_count in sample_modules:
-                            result += f"  • {module_name}: {func_count} functions\n"
-                        result += "\n"
-                except Exception:
-                    # If even the fallback fails, skip this section
-                    pass
-            
-            # Function signature analysis using efficient query
-            try:
-                # Count functions with signatures using single query
-                signed_functions = (
-                    code_service.db_session.query(Function)
-                    .filter(Function.function_signature.isnot(None))
-                    .filter(Function.function_signature != '')
-                    .count()
-                )
-                
-                if function_count > 0:
-                    result += f"Functions with signatures: {signed_functions:,} ({signed_functions/function_count*100:.1f}%)\n"
+                        parts.append(f"  • {module_name}: {func_count} functions\n")
+                    parts.append("\n")
             except Exception:
+                # Skip this section if the query fails
                 pass
             
+            # Function signature analysis
+            if function_count > 0 and "signed" in counts:
+                signed_functions = counts["signed"]
+                parts.append(f"Functions with signatures: {signed_functions:,} ({signed_functions/function_count*100:.1f}%)\n")
+            
             # Average functions per module
             if module_count > 0:
                 avg_functions = function_count / module_count
-                result += f"Average functions per module: {avg_functions:.1f}\n"
+                parts.append(f"Average functions per module: {avg_functions:.1f}\n")
         
-        return [types.TextContent(type="text", text=result)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
@@ -2536,13 +2620,10 @@ async def handle_get_code_statistics(arguments: Dict[str, Any]) -> List[types.Te
 
 # Phase 2: Type System Analysis Tool Handlers
 
-async def handle_list_types(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_list_types(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Get types by module or pattern with support for different type categories"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     module_name = arguments.get("module_name")
     pattern = arguments.get("pattern")
@@ -2550,19 +2631,20 @@ async def handle_list_types(arguments: Dict[str, Any]) -> List[types.TextContent
     limit = arguments.get("limit", 100)
     
     try:
-        from code_as_data.db.models import Type
         if not Type:
             return [types.TextContent(
                 type="text",
                 text="Type model not available - code_as_data library not fully loaded"
             )]
         
-        # Build query
-        query = code_service.db_session.query(Type)
+        # Build query; rows carry the module name via the join rather than
+        # loading each type's module separately
+        query = (code_service.db_session.query(Type.type_name, Type.type_of_type, Type.src_loc, Module.name)
+                .outerjoin(Module, Type.module_id == Module.id))
         
         # Filter by module if specified
         if module_name:
-            module = code_service.query_service.get_module_by_name(module_name)
+            module = code_service.get_module_by_name(module_name)
             if not module:
                 return [types.TextContent(
                     type="text",
@@ -2587,32 +2669,29 @@ async def handle_list_types(arguments: Dict[str, Any]) -> List[types.TextContent
                 text="No types found matching the specified criteria"
             )]
         
-        result_text = f"Types found ({len(types_list)} results):\n\n"
+        parts = [f"Types found ({len(types_list)} results):\n\n"]
         
-        for type_obj in types_list:
-            result_text += f"- {type_obj.type_name}"
-            if type_obj.type_of_type:
-                result_text += f" ({type_obj.type_of_type})"
-            if type_obj.module:
-                result_text += f" in {type_obj.module.name}"
-            if type_obj.src_loc:
-                result_text += f" at {type_obj.src_loc}"
-            result_text += "\n"
+        for type_name, type_of_type, src_loc, type_module_name in types_list:
+            parts.append(f"- {type_name}")
+            if type_of_type:
+                parts.append(f" ({type_of_type})")
+            if type_module_name:
+                parts.append(f" in {type_module_name}")
+            if src_loc:
+                parts.append(f" at {src_loc}")
+            parts.append("\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error listing types: {e}"
         )]
 
-async def handle_get_type_details(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_get_type_details(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Get detailed information about a specific type"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     type_name = arguments["type_name"]
     module_name = arguments.get("module_name")
@@ -2620,7 +2699,6 @@ async def handle_get_type_details(arguments: Dict[str, Any]) -> List[types.TextC
     include_fields = arguments.get("include_fields", True)
     
     try:
-        from code_as_data.db.models import Type, Constructor, Field
         if not Type:
             return [types.TextContent(
                 type="text",
@@ -2632,7 +2710,7 @@ async def handle_get_type_details(arguments: Dict[str, Any]) -> List[types.TextC
         
         # Filter by module if specified
         if module_name:
-            module = code_service.query_service.get_module_by_name(module_name)
+            module = code_service.get_module_by_name(module_name)
             if not module:
                 return [types.TextContent(
                     type="text",
@@ -2648,58 +2726,69 @@ async def handle_get_type_details(arguments: Dict[str, Any]) -> List[types.TextC
                 text=f"Type not found: {type_name}"
             )]
         
-        result_text = f"Type Details for '{type_name}':\n\n"
+        # Load constructors and their fields for all matched types up front,
+        # two queries in total instead of one per type and one per constructor
+        constructors_by_type = {}
+        fields_by_constructor = {}
+        if include_constructors and Constructor:
+            constructors = (code_service.db_session.query(Constructor)
+                          .filter(Constructor.type_id.in_([type_obj.id for type_obj in types_list]))
+                          .all())
+            for constructor in constructors:
+                constructors_by_type.setdefault(constructor.type_id, []).append(constructor)
+            
+            if include_fields and Field and constructors:
+                fields = (code_service.db_session.query(Field)
+                        .filter(Field.constructor_id.in_([constructor.id for constructor in constructors]))
+                        .all())
+                for field in fields:
+                    fields_by_constructor.setdefault(field.constructor_id, []).append(field)
+        
+        parts = [f"Type Details for '{type_name}':\n\n"]
         
         for type_obj in types_list:
-            result_text += f"Name: {type_obj.type_name}\n"
-            result_text += f"Category: {type_obj.type_of_type or 'Unknown'}\n"
+            parts.append(f"Name: {type_obj.type_name}\n")
+            parts.append(f"Category: {type_obj.type_of_type or 'Unknown'}\n")
             if type_obj.module:
-                result_text += f"Module: {type_obj.module.name}\n"
+                parts.append(f"Module: {type_obj.module.name}\n")
             if type_obj.src_loc:
-                result_text += f"Location: {type_obj.src_loc}\n"
+                parts.append(f"Location: {type_obj.src_loc}\n")
             if type_obj.raw_code:
-                result_text += f"Definition: {type_obj.raw_code[:200]}"
+                parts.append(f"Definition: {type_obj.raw_code[:200]}")
                 if len(type_obj.raw_code) > 200:
-                    result_text += "..."
-                result_text += "\n"
+                    parts.append("...")
+                parts.append("\n")
             
             if include_constructors and Constructor:
-                # Get constructors for this type
-                constructors = (code_service.db_session.query(Constructor)
-                              .filter(Constructor.type_id == type_obj.id)
-                              .all())
+                # Constructors for this type
+                constructors = constructors_by_type.get(type_obj.id)
                 
                 if constructors:
-                    result_text += f"\nConstructors ({len(constructors)}):\n"
+                    parts.append(f"\nConstructors ({len(constructors)}):\n")
                     for constructor in constructors:
-                        result_text += f"  • {constructor.name}\n"
+                        parts.append(f"  • {constructor.name}\n")
                         
                         if include_fields and Field:
-                            # Get fields for this constructor
-                            fields = (code_service.db_session.query(Field)
-                                    .filter(Field.constructor_id == constructor.id)
-                                    .all())
+                            # Fields for this constructor
+                            fields = fields_by_constructor.get(constructor.id)
                             
                             if fields:
                                 for field in fields:
-                                    result_text += f"    - {field.field_name or 'unnamed'}: {field.field_type_raw or 'Unknown type'}\n"
+                                    parts.append(f"    - {field.field_name or 'unnamed'}: {field.field_type_raw or 'Unknown type'}\n")
             
-            result_text += "\n---\n"
+            parts.append("\n---\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error getting type details: {e}"
         )]
 
-async def handle_search_types(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_search_types(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Search for types by name pattern with advanced filtering"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     pattern = arguments["pattern"]
     module_pattern = arguments.get("module_pattern")
@@ -2707,7 +2796,6 @@ async def handle_search_types(arguments: Dict[str, Any]) -> List[types.TextConte
     limit = arguments.get("limit", 50)
     
     try:
-        from code_as_data.db.models import Type
         if not Type:
             return [types.TextContent(
                 type="text",
@@ -2735,30 +2823,27 @@ async def handle_search_types(arguments: Dict[str, Any]) -> List[types.TextConte
                 text=f"No types found matching pattern: {pattern}"
             )]
         
-        result_text = f"Types matching '{pattern}' ({len(types_list)} found):\n\n"
+        parts = [f"Types matching '{pattern}' ({len(types_list)} found):\n\n"]
         
         for type_obj in types_list:
-            result_text += f"- {type_obj.type_name}"
+            parts.append(f"- {type_obj.type_name}")
             if type_obj.type_of_type:
-                result_text += f" ({type_obj.type_of_type})"
+                parts.append(f" ({type_obj.type_of_type})")
             if type_obj.module:
-                result_text += f" in {type_obj.module.name}"
-            result_text += "\n"
+                parts.append(f" in {type_obj.module.name}")
+            parts.append("\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error searching types: {e}"
         )]
 
-async def handle_get_type_dependencies(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_get_type_dependencies(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Analyze type dependencies and relationships"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     type_name = arguments["type_name"]
     module_name = arguments.get("module_name")
@@ -2766,7 +2851,6 @@ async def handle_get_type_dependencies(arguments: Dict[str, Any]) -> List[types.
     depth = arguments.get("depth", 2)
     
     try:
-        from code_as_data.db.models import Type
         if not Type:
             return [types.TextContent(
                 type="text",
@@ -2777,7 +2861,7 @@ async def handle_get_type_dependencies(arguments: Dict[str, Any]) -> List[types.
         query = code_service.db_session.query(Type).filter(Type.type_name == type_name)
         
         if module_name:
-            module = code_service.query_service.get_module_by_name(module_name)
+            module = code_service.get_module_by_name(module_name)
             if not module:
                 return [types.TextContent(
                     type="text",
@@ -2793,18 +2877,17 @@ async def handle_get_type_dependencies(arguments: Dict[str, Any]) -> List[types.
                 text=f"Type not found: {type_name}"
             )]
         
-        result_text = f"Type Dependencies for '{type_name}':\n\n"
+        parts = [f"Type Dependencies for '{type_name}':\n\n"]
         
         # Try to analyze dependencies from type definition
         if target_type.raw_code:
-            result_text += f"Definition: {target_type.raw_code[:300]}"
+            parts.append(f"Definition: {target_type.raw_code[:300]}")
             if len(target_type.raw_code) > 300:
-                result_text += "..."
-            result_text += "\n\n"
+                parts.append("...")
+            parts.append("\n\n")
         
         # Try to get type dependencies if available
         try:
-            from code_as_data.db.models import TypeDependency
             if TypeDependency:
                 # Dependencies this type has
                 dependencies = (code_service.db_session.query(TypeDependency)
@@ -2813,11 +2896,11 @@ async def handle_get_type_dependencies(arguments: Dict[str, Any]) -> List[types.
                               .all())
                 
                 if dependencies:
-                    result_text += f"Depends on ({len(dependencies)} types):\n"
+                    parts.append(f"Depends on ({len(dependencies)} types):\n")
                     for dep in dependencies:
                         if hasattr(dep, 'dependency') and dep.dependency:
-                            result_text += f"  → {dep.dependency.type_name}\n"
-                    result_text += "\n"
+                            parts.append(f"  → {dep.dependency.type_name}\n")
+                    parts.append("\n")
                 
                 if include_dependents:
                     # Types that depend on this type
@@ -2827,30 +2910,27 @@ async def handle_get_type_dependencies(arguments: Dict[str, Any]) -> List[types.
                                 .all())
                     
                     if dependents:
-                        result_text += f"Used by ({len(dependents)} types):\n"
+                        parts.append(f"Used by ({len(dependents)} types):\n")
                         for dep in dependents:
                             if hasattr(dep, 'dependent') and dep.dependent:
-                                result_text += f"  ← {dep.dependent.type_name}\n"
-                        result_text += "\n"
+                                parts.append(f"  ← {dep.dependent.type_name}\n")
+                        parts.append("\n")
             else:
-                result_text += "Type dependency analysis not available.\n"
+                parts.append("Type dependency analysis not available.\n")
         except Exception as e:
-            result_text += f"Note: Advanced dependency analysis not available: {e}\n"
+            parts.append(f"Note: Advanced dependency analysis not available: {e}\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error analyzing type dependencies: {e}"
         )]
 
-async def handle_analyze_type_usage(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_analyze_type_usage(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Analyze how types are used throughout the codebase"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     type_name = arguments.get("type_name")
     module_name = arguments.get("module_name")
@@ -2858,7 +2938,6 @@ async def handle_analyze_type_usage(arguments: Dict[str, Any]) -> List[types.Tex
     limit = arguments.get("limit", 50)
     
     try:
-        from code_as_data.db.models import Type
         if not Type:
             return [types.TextContent(
                 type="text",
@@ -2870,7 +2949,7 @@ async def handle_analyze_type_usage(arguments: Dict[str, Any]) -> List[types.Tex
             query = code_service.db_session.query(Type).filter(Type.type_name == type_name)
             
             if module_name:
-                module = code_service.query_service.get_module_by_name(module_name)
+                module = code_service.get_module_by_name(module_name)
                 if not module:
                     return [types.TextContent(
                         type="text",
@@ -2886,10 +2965,10 @@ async def handle_analyze_type_usage(arguments: Dict[str, Any]) -> List[types.Tex
                     text=f"Type not found: {type_name}"
                 )]
             
-            result_text = f"Usage Analysis for Type '{type_name}':\n\n"
-            result_text += f"Category: {target_type.type_of_type or 'Unknown'}\n"
+            parts = [f"Usage Analysis for Type '{type_name}':\n\n"]
+            parts.append(f"Category: {target_type.type_of_type or 'Unknown'}\n")
             if target_type.module:
-                result_text += f"Defined in: {target_type.module.name}\n"
+                parts.append(f"Defined in: {target_type.module.name}\n")
             
             # Try to find usage in function signatures
             functions_using_type = (code_service.db_session.query(Function)
@@ -2898,56 +2977,74 @@ async def handle_analyze_type_usage(arguments: Dict[str, Any]) -> List[types.Tex
                                   .all())
             
             if functions_using_type:
-                result_text += f"\nUsed in function signatures ({len(functions_using_type)} functions):\n"
+                parts.append(f"\nUsed in function signatures ({len(functions_using_type)} functions):\n")
                 for func in functions_using_type:
-                    result_text += f"  • {func.name}"
+                    parts.append(f"  • {func.name}")
                     if func.module:
-                        result_text += f" (in {func.module.name})"
-                    result_text += "\n"
+                        parts.append(f" (in {func.module.name})")
+                    parts.append("\n")
             
         else:
-            # General type usage statistics
-            query = code_service.db_session.query(Type)
+            # General type usage statistics over the first `limit` types
+            scope = select(Type.id, Type.type_name, Type.type_of_type, Type.module_id)
             
             if module_name:
-                module = code_service.query_service.get_module_by_name(module_name)
+                module = code_service.get_module_by_name(module_name)
                 if not module:
                     return [types.TextContent(
                         type="text",
                         text=f"Module not found: {module_name}"
                     )]
-                query = query.filter(Type.module_id == module.id)
+                scope = scope.where(Type.module_id == module.id)
             
-            types_list = query.limit(limit).all()
+            scope = scope.limit(limit).subquery()
             
-            if not types_list:
+            # Group by type category in SQL: each row carries its category's
+            # size, and only the first 10 types of each category come back;
+            # categories keep the order in which their first type appears
+            category = sql_func.coalesce(sql_func.nullif(scope.c.type_of_type, ''), "Unknown")
+            ranked = (select(category.label("category"),
+                             scope.c.type_name,
+                             Module.name.label("module_name"),
+                             sql_func.count().over(partition_by=category).label("category_size"),
+                             sql_func.min(scope.c.id).over(partition_by=category).label("first_id"),
+                             sql_func.row_number().over(partition_by=category, order_by=scope.c.id).label("position"))
+                      .select_from(scope)
+                      .outerjoin(Module, scope.c.module_id == Module.id)
+                      .subquery())
+            rows = code_service.db_session.execute(
+                select(ranked.c.category, ranked.c.type_name, ranked.c.module_name, ranked.c.category_size)
+                .where(ranked.c.position <= 10)
+                .order_by(ranked.c.first_id, ranked.c.position)
+            ).all()
+            
+            if not rows:
                 return [types.TextContent(
                     type="text",
                     text="No types found for usage analysis"
                 )]
             
-            result_text = f"Type Usage Analysis ({len(types_list)} types):\n\n"
-            
-            # Group by type category
             type_categories = {}
-            for type_obj in types_list:
-                category = type_obj.type_of_type or "Unknown"
-                if category not in type_categories:
-                    type_categories[category] = []
-                type_categories[category].append(type_obj)
+            for category_name, category_type_name, type_module_name, category_size in rows:
+                if category_name not in type_categories:
+                    type_categories[category_name] = (category_size, [])
+                type_categories[category_name][1].append((category_type_name, type_module_name))
             
-            for category, types_in_category in type_categories.items():
-                result_text += f"{category}: {len(types_in_category)} types\n"
-                for type_obj in types_in_category[:10]:  # Show first 10
-                    result_text += f"  • {type_obj.type_name}"
-                    if type_obj.module:
-                        result_text += f" (in {type_obj.module.name})"
-                    result_text += "\n"
-                if len(types_in_category) > 10:
-                    result_text += f"  ... and {len(types_in_category) - 10} more\n"
-                result_text += "\n"
-        
-        return [types.TextContent(type="text", text=result_text)]
+            total_types = sum(category_size for category_size, _ in type_categories.values())
+            parts = [f"Type Usage Analysis ({total_types} types):\n\n"]
+            
+            for category_name, (category_size, shown_types) in type_categories.items():
+                parts.append(f"{category_name}: {category_size} types\n")
+                for category_type_name, type_module_name in shown_types:
+                    parts.append(f"  • {category_type_name}")
+                    if type_module_name:
+                        parts.append(f" (in {type_module_name})")
+                    parts.append("\n")
+                if category_size > 10:
+                    parts.append(f"  ... and {category_size - 10} more\n")
+                parts.append("\n")
+        
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
@@ -2956,20 +3053,16 @@ async def handle_analyze_type_usage(arguments: Dict[str, Any]) -> List[types.Tex
 
 # Phase 2: Class Analysis Tool Handlers
 
-async def handle_list_classes(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_list_classes(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Get class definitions with filtering by module or pattern"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     module_name = arguments.get("module_name")
     pattern = arguments.get("pattern")
     limit = arguments.get("limit", 100)
     
     try:
-        from code_as_data.db.models import Class
         if not Class:
             return [types.TextContent(
                 type="text",
@@ -2981,7 +3074,7 @@ async def handle_list_classes(arguments: Dict[str, Any]) -> List[types.TextConte
         
         # Filter by module if specified
         if module_name:
-            module = code_service.query_service.get_module_by_name(module_name)
+            module = code_service.get_module_by_name(module_name)
             if not module:
                 return [types.TextContent(
                     type="text",
@@ -3002,37 +3095,33 @@ async def handle_list_classes(arguments: Dict[str, Any]) -> List[types.TextConte
                 text="No classes found matching the specified criteria"
             )]
         
-        result_text = f"Classes found ({len(classes_list)} results):\n\n"
+        parts = [f"Classes found ({len(classes_list)} results):\n\n"]
         
         for class_obj in classes_list:
-            result_text += f"- {class_obj.class_name}"
+            parts.append(f"- {class_obj.class_name}")
             if class_obj.module:
-                result_text += f" in {class_obj.module.name}"
+                parts.append(f" in {class_obj.module.name}")
             if class_obj.src_location:
-                result_text += f" at {class_obj.src_location}"
-            result_text += "\n"
+                parts.append(f" at {class_obj.src_location}")
+            parts.append("\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error listing classes: {e}"
         )]
 
-async def handle_get_class_details(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_get_class_details(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Get detailed information about a specific class"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     class_name = arguments["class_name"]
     module_name = arguments.get("module_name")
     include_instances = arguments.get("include_instances", True)
     
     try:
-        from code_as_data.db.models import Class, Instance
         if not Class:
             return [types.TextContent(
                 type="text",
@@ -3044,7 +3133,7 @@ async def handle_get_class_details(arguments: Dict[str, Any]) -> List[types.Text
         
         # Filter by module if specified
         if module_name:
-            module = code_service.query_service.get_module_by_name(module_name)
+            module = code_service.get_module_by_name(module_name)
             if not module:
                 return [types.TextContent(
                     type="text",
@@ -3060,19 +3149,19 @@ async def handle_get_class_details(arguments: Dict[str, Any]) -> List[types.Text
                 text=f"Class not found: {class_name}"
             )]
         
-        result_text = f"Class Details for '{class_name}':\n\n"
+        parts = [f"Class Details for '{class_name}':\n\n"]
         
         for class_obj in classes_list:
-            result_text += f"Name: {class_obj.class_name}\n"
+            parts.append(f"Name: {class_obj.class_name}\n")
             if class_obj.module:
-                result_text += f"Module: {class_obj.module.name}\n"
+                parts.append(f"Module: {class_obj.module.name}\n")
             if class_obj.src_location:
-                result_text += f"Location: {class_obj.src_location}\n"
+                parts.append(f"Location: {class_obj.src_location}\n")
             if class_obj.class_definition:
-                result_text += f"Definition: {class_obj.class_definition[:300]}"
+                parts.append(f"Definition: {class_obj.class_definition[:300]}")
                 if len(class_obj.class_definition) > 300:
-                    result_text += "..."
-                result_text += "\n"
+                    parts.append("...")
+                parts.append("\n")
             
             if include_instances and Instance:
                 # Try to find instances of this class
@@ -3083,43 +3172,39 @@ async def handle_get_class_details(arguments: Dict[str, Any]) -> List[types.Text
                            .all())
                 
                 if instances:
-                    result_text += f"\nInstances ({len(instances)} found):\n"
+                    parts.append(f"\nInstances ({len(instances)} found):\n")
                     for instance in instances:
-                        result_text += f"  • Instance"
+                        parts.append(f"  • Instance")
                         if instance.module:
-                            result_text += f" in {instance.module.name}"
+                            parts.append(f" in {instance.module.name}")
                         if instance.src_loc:
-                            result_text += f" at {instance.src_loc}"
-                        result_text += "\n"
+                            parts.append(f" at {instance.src_loc}")
+                        parts.append("\n")
                         if instance.instance_signature:
-                            result_text += f"    Signature: {instance.instance_signature[:100]}"
+                            parts.append(f"    Signature: {instance.instance_signature[:100]}")
                             if len(instance.instance_signature) > 100:
-                                result_text += "..."
-                            result_text += "\n"
+                                parts.append("...")
+                            parts.append("\n")
             
-            result_text += "\n---\n"
+            parts.append("\n---\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error getting class details: {e}"
         )]
 
-async def handle_search_classes(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_search_classes(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Search for classes by name pattern with module filtering"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     pattern = arguments["pattern"]
     module_pattern = arguments.get("module_pattern")
     limit = arguments.get("limit", 50)
     
     try:
-        from code_as_data.db.models import Class
         if not Class:
             return [types.TextContent(
                 type="text",
@@ -3143,17 +3228,17 @@ async def handle_search_classes(arguments: Dict[str, Any]) -> List[types.TextCon
                 text=f"No classes found matching pattern: {pattern}"
             )]
         
-        result_text = f"Classes matching '{pattern}' ({len(classes_list)} found):\n\n"
+        parts = [f"Classes matching '{pattern}' ({len(classes_list)} found):\n\n"]
         
         for class_obj in classes_list:
-            result_text += f"- {class_obj.class_name}"
+            parts.append(f"- {class_obj.class_name}")
             if class_obj.module:
-                result_text += f" in {class_obj.module.name}"
+                parts.append(f" in {class_obj.module.name}")
             if class_obj.src_location:
-                result_text += f" at {class_obj.src_location}"
-            result_text += "\n"
+                parts.append(f" at {class_obj.src_location}")
+            parts.append("\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
@@ -3162,13 +3247,10 @@ async def handle_search_classes(arguments: Dict[str, Any]) -> List[types.TextCon
 
 # Phase 2: Import Analysis Tool Handlers
 
-async def handle_analyze_imports(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_analyze_imports(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Analyze import patterns and dependencies for modules"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     module_name = arguments.get("module_name")
     import_pattern = arguments.get("import_pattern")
@@ -3176,19 +3258,18 @@ async def handle_analyze_imports(arguments: Dict[str, Any]) -> List[types.TextCo
     limit = arguments.get("limit", 100)
     
     try:
-        from code_as_data.db.models import Import
         if not Import:
             return [types.TextContent(
                 type="text",
                 text="Import model not available - code_as_data library not fully loaded"
             )]
         
-        # Build query
-        query = code_service.db_session.query(Import)
+        # Build query; the importing module is loaded in the same round-trip
+        query = code_service.db_session.query(Import).options(joinedload(Import.module))
         
         # Filter by module if specified
         if module_name:
-            module = code_service.query_service.get_module_by_name(module_name)
+            module = code_service.get_module_by_name(module_name)
             if not module:
                 return [types.TextContent(
                     type="text",
@@ -3209,7 +3290,7 @@ async def handle_analyze_imports(arguments: Dict[str, Any]) -> List[types.TextCo
                 text="No imports found matching the specified criteria"
             )]
         
-        result_text = f"Import Analysis ({len(imports_list)} imports found):\n\n"
+        parts = [f"Import Analysis ({len(imports_list)} imports found):\n\n"]
         
         # Group by importing module
         imports_by_module = {}
@@ -3221,43 +3302,40 @@ async def handle_analyze_imports(arguments: Dict[str, Any]) -> List[types.TextCo
                 imports_by_module[module_key].append(imp)
         
         for importing_module, module_imports in imports_by_module.items():
-            result_text += f"Module: {importing_module} ({len(module_imports)} imports)\n"
+            parts.append(f"Module: {importing_module} ({len(module_imports)} imports)\n")
             
             for imp in module_imports:
-                result_text += f"  • {imp.module_name}"
+                parts.append(f"  • {imp.module_name}")
                 
                 if imp.package_name:
-                    result_text += f" (from {imp.package_name})"
+                    parts.append(f" (from {imp.package_name})")
                 
                 if include_qualified:
                     if imp.qualified_style:
-                        result_text += " [qualified]"
+                        parts.append(" [qualified]")
                     if imp.as_module_name:
-                        result_text += f" as {imp.as_module_name}"
+                        parts.append(f" as {imp.as_module_name}")
                     if imp.is_hiding:
-                        result_text += " [hiding]"
+                        parts.append(" [hiding]")
                 
                 if imp.src_loc:
-                    result_text += f" at {imp.src_loc}"
+                    parts.append(f" at {imp.src_loc}")
                 
-                result_text += "\n"
+                parts.append("\n")
             
-            result_text += "\n"
+            parts.append("\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error analyzing imports: {e}"
         )]
 
-async def handle_get_import_graph(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_get_import_graph(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Generate module import relationship graph"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     root_module = arguments.get("root_module")
     depth = arguments.get("depth", 3)
@@ -3265,7 +3343,6 @@ async def handle_get_import_graph(arguments: Dict[str, Any]) -> List[types.TextC
     limit = arguments.get("limit", 50)
     
     try:
-        from code_as_data.db.models import Import
         if not Import:
             return [types.TextContent(
                 type="text",
@@ -3274,7 +3351,7 @@ async def handle_get_import_graph(arguments: Dict[str, Any]) -> List[types.TextC
         
         if root_module:
             # Start from specific module
-            module = code_service.query_service.get_module_by_name(root_module)
+            module = code_service.get_module_by_name(root_module)
             if not module:
                 return [types.TextContent(
                     type="text",
@@ -3287,19 +3364,19 @@ async def handle_get_import_graph(arguments: Dict[str, Any]) -> List[types.TextC
                       .limit(limit)
                       .all())
             
-            result_text = f"Import Graph starting from '{root_module}':\n\n"
-            result_text += f"{root_module}\n"
+            parts = [f"Import Graph starting from '{root_module}':\n\n"]
+            parts.append(f"{root_module}\n")
             
             for imp in imports:
                 if not include_external and imp.package_name:
                     continue
                 
-                result_text += f"  ├─ {imp.module_name}"
+                parts.append(f"  ├─ {imp.module_name}")
                 if imp.package_name:
-                    result_text += f" (from {imp.package_name})"
+                    parts.append(f" (from {imp.package_name})")
                 if imp.qualified_style:
-                    result_text += " [qualified]"
-                result_text += "\n"
+                    parts.append(" [qualified]")
+                parts.append("\n")
         
         else:
             # General import statistics
@@ -3316,7 +3393,7 @@ async def handle_get_import_graph(arguments: Dict[str, Any]) -> List[types.TextC
                     text="No imports found for graph generation"
                 )]
             
-            result_text = f"Import Graph Overview ({len(imports_list)} imports):\n\n"
+            parts = [f"Import Graph Overview ({len(imports_list)} imports):\n\n"]
             
             # Group by most imported modules
             import_counts = {}
@@ -3329,31 +3406,27 @@ async def handle_get_import_graph(arguments: Dict[str, Any]) -> List[types.TextC
             # Sort by popularity
             top_imports = sorted(import_counts.items(), key=lambda x: x[1], reverse=True)[:20]
             
-            result_text += "Most Imported Modules:\n"
+            parts.append("Most Imported Modules:\n")
             for module_name, count in top_imports:
-                result_text += f"  • {module_name}: imported {count} times\n"
+                parts.append(f"  • {module_name}: imported {count} times\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error generating import graph: {e}"
         )]
 
-async def handle_find_unused_imports(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_find_unused_imports(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Find potentially unused imports in modules"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     module_name = arguments.get("module_name")
     package_pattern = arguments.get("package_pattern")
     limit = arguments.get("limit", 100)
     
     try:
-        from code_as_data.db.models import Import
         if not Import:
             return [types.TextContent(
                 type="text",
@@ -3365,7 +3438,7 @@ async def handle_find_unused_imports(arguments: Dict[str, Any]) -> List[types.Te
         
         # Filter by module if specified
         if module_name:
-            module = code_service.query_service.get_module_by_name(module_name)
+            module = code_service.get_module_by_name(module_name)
             if not module:
                 return [types.TextContent(
                     type="text",
@@ -3386,7 +3459,7 @@ async def handle_find_unused_imports(arguments: Dict[str, Any]) -> List[types.Te
                 text="No imports found for analysis"
             )]
         
-        result_text = f"Potentially Unused Imports Analysis ({len(imports_list)} imports checked):\n\n"
+        parts = [f"Potentially Unused Imports Analysis ({len(imports_list)} imports checked):\n\n"]
         
         # This is a simplified analysis - in a real implementation, you'd need
         # to check if imported symbols are actually used in the module
@@ -3417,45 +3490,41 @@ async def handle_find_unused_imports(arguments: Dict[str, Any]) -> List[types.Te
                 suspicious_imports.append((imp, reasons))
         
         if not suspicious_imports:
-            result_text += "No obviously suspicious imports found.\n"
-            result_text += "Note: This is a basic analysis. For comprehensive unused import detection,\n"
-            result_text += "use dedicated tools like HLint or manual code review.\n"
+            parts.append("No obviously suspicious imports found.\n")
+            parts.append("Note: This is a basic analysis. For comprehensive unused import detection,\n")
+            parts.append("use dedicated tools like HLint or manual code review.\n")
         else:
-            result_text += f"Found {len(suspicious_imports)} potentially unused imports:\n\n"
+            parts.append(f"Found {len(suspicious_imports)} potentially unused imports:\n\n")
             
             for imp, reasons in suspicious_imports:
                 if imp.module:
-                    result_text += f"Module: {imp.module.name}\n"
-                result_text += f"  Import: {imp.module_name}"
+                    parts.append(f"Module: {imp.module.name}\n")
+                parts.append(f"  Import: {imp.module_name}")
                 if imp.package_name:
-                    result_text += f" (from {imp.package_name})"
-                result_text += "\n"
+                    parts.append(f" (from {imp.package_name})")
+                parts.append("\n")
                 for reason in reasons:
-                    result_text += f"    - {reason}\n"
+                    parts.append(f"    - {reason}\n")
                 if imp.src_loc:
-                    result_text += f"    Location: {imp.src_loc}\n"
-                result_text += "\n"
+                    parts.append(f"    Location: {imp.src_loc}\n")
+                parts.append("\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error finding unused imports: {e}"
         )]
 
-async def handle_get_import_details(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_get_import_details(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Get detailed information about imports in a module"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     module_name = arguments["module_name"]
     include_source_info = arguments.get("include_source_info", True)
     
     try:
-        from code_as_data.db.models import Import
         if not Import:
             return [types.TextContent(
                 type="text",
@@ -3463,7 +3532,7 @@ async def handle_get_import_details(arguments: Dict[str, Any]) -> List[types.Tex
             )]
         
         # Find the module
-        module = code_service.query_service.get_module_by_name(module_name)
+        module = code_service.get_module_by_name(module_name)
         if not module:
             return [types.TextContent(
                 type="text",
@@ -3481,7 +3550,7 @@ async def handle_get_import_details(arguments: Dict[str, Any]) -> List[types.Tex
                 text=f"No imports found in module: {module_name}"
             )]
         
-        result_text = f"Import Details for Module '{module_name}' ({len(imports)} imports):\n\n"
+        parts = [f"Import Details for Module '{module_name}' ({len(imports)} imports):\n\n"]
         
         # Group imports by type
         internal_imports = []
@@ -3503,49 +3572,49 @@ async def handle_get_import_details(arguments: Dict[str, Any]) -> List[types.Tex
         
         # Internal imports
         if internal_imports:
-            result_text += f"Internal Imports ({len(internal_imports)}):\n"
+            parts.append(f"Internal Imports ({len(internal_imports)}):\n")
             for imp in internal_imports:
-                result_text += f"  • {imp.module_name}"
+                parts.append(f"  • {imp.module_name}")
                 if imp.as_module_name:
-                    result_text += f" as {imp.as_module_name}"
+                    parts.append(f" as {imp.as_module_name}")
                 if include_source_info and imp.src_loc:
-                    result_text += f" (at {imp.src_loc})"
-                result_text += "\n"
-            result_text += "\n"
+                    parts.append(f" (at {imp.src_loc})")
+                parts.append("\n")
+            parts.append("\n")
         
         # External imports
         if external_imports:
-            result_text += f"External Imports ({len(external_imports)}):\n"
+            parts.append(f"External Imports ({len(external_imports)}):\n")
             for imp in external_imports:
-                result_text += f"  • {imp.module_name} (from {imp.package_name})"
+                parts.append(f"  • {imp.module_name} (from {imp.package_name})")
                 if imp.as_module_name:
-                    result_text += f" as {imp.as_module_name}"
+                    parts.append(f" as {imp.as_module_name}")
                 if include_source_info and imp.src_loc:
-                    result_text += f" (at {imp.src_loc})"
-                result_text += "\n"
-            result_text += "\n"
+                    parts.append(f" (at {imp.src_loc})")
+                parts.append("\n")
+            parts.append("\n")
         
         # Qualified imports
         if qualified_imports:
-            result_text += f"Qualified Imports ({len(qualified_imports)}):\n"
+            parts.append(f"Qualified Imports ({len(qualified_imports)}):\n")
             for imp in qualified_imports:
-                result_text += f"  • qualified {imp.module_name}"
+                parts.append(f"  • qualified {imp.module_name}")
                 if imp.as_module_name:
-                    result_text += f" as {imp.as_module_name}"
-                result_text += "\n"
-            result_text += "\n"
+                    parts.append(f" as {imp.as_module_name}")
+                parts.append("\n")
+            parts.append("\n")
         
         # Hiding imports
         if hiding_imports:
-            result_text += f"Hiding Imports ({len(hiding_imports)}):\n"
+            parts.append(f"Hiding Imports ({len(hiding_imports)}):\n")
             for imp in hiding_imports:
-                result_text += f"  • {imp.module_name} hiding"
+                parts.append(f"  • {imp.module_name} hiding")
                 if imp.hiding_specs:
-                    result_text += f" ({imp.hiding_specs})"
-                result_text += "\n"
-            result_text += "\n"
+                    parts.append(f" ({imp.hiding_specs})")
+                parts.append("\n")
+            parts.append("\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
@@ -3554,13 +3623,10 @@ async def handle_get_import_details(arguments: Dict[str, Any]) -> List[types.Tex
 
 # Phase 1: Advanced Pattern Analysis Tool Handlers
 
-async def handle_find_similar_functions(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_find_similar_functions(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Find functions similar to a given function based on signature and code"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     function_name = arguments["function_name"]
     module_name = arguments.get("module_name")
@@ -3571,7 +3637,7 @@ async def handle_find_similar_functions(arguments: Dict[str, Any]) -> List[types
         # Get the target function
         module_id = None
         if module_name:
-            module = code_service.query_service.get_module_by_name(module_name)
+            module = code_service.get_module_by_name(module_name)
             if not module:
                 return [types.TextContent(
                     type="text",
@@ -3589,10 +3655,14 @@ async def handle_find_similar_functions(arguments: Dict[str, Any]) -> List[types
         target_function = functions[0]
         
         # Use QueryService's find_similar_functions method
-        similar_functions = code_service.query_service.find_similar_functions(
-            target_function.id, 
-            threshold=similarity_threshold
-        )
+        cache_key = ("find_similar_functions", target_function.id, similarity_threshold)
+        similar_functions = _ANALYSIS_CACHE.get(cache_key)
+        if similar_functions is None:
+            similar_functions = code_service.query_service.find_similar_functions(
+                target_function.id, 
+                threshold=similarity_threshold
+            )
+            _ANALYSIS_CACHE.set(cache_key, similar_functions)
         
         # Apply limit
         similar_functions = similar_functions[:limit]
@@ -3603,30 +3673,27 @@ async def handle_find_similar_functions(arguments: Dict[str, Any]) -> List[types
                 text=f"No similar functions found for '{function_name}' with threshold {similarity_threshold}"
             )]
         
-        result_text = f"Similar Functions to '{target_function.name}' (threshold: {similarity_threshold}):\n\n"
+        parts = [f"Similar Functions to '{target_function.name}' (threshold: {similarity_threshold}):\n\n"]
         
         for similar in similar_functions:
             func_info = similar["function"]
             score = similar["similarity_score"]
-            result_text += f"• {func_info['name']} (similarity: {score:.3f})"
+            parts.append(f"• {func_info['name']} (similarity: {score:.3f})")
             if func_info.get("module"):
-                result_text += f" in {func_info['module']}"
-            result_text += "\n"
+                parts.append(f" in {func_info['module']}")
+            parts.append("\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error finding similar functions: {e}"
         )]
 
-async def handle_find_code_patterns(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_find_code_patterns(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Find recurring code patterns across functions"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     pattern_code = arguments["pattern_code"]
     min_matches = arguments.get("min_matches", 3)
@@ -3634,11 +3701,16 @@ async def handle_find_code_patterns(arguments: Dict[str, Any]) -> List[types.Tex
     limit = arguments.get("limit", 20)
     
     try:
-        # Use QueryService's find_code_patterns method
-        pattern_results = code_service.query_service.find_code_patterns(
-            pattern_code, 
-            min_matches=min_matches
-        )
+        # Use QueryService's find_code_patterns method; the scan over every
+        # function body depends only on the pattern, so share it across filters
+        cache_key = ("find_code_patterns", pattern_code, min_matches)
+        pattern_results = _ANALYSIS_CACHE.get(cache_key)
+        if pattern_results is None:
+            pattern_results = code_service.query_service.find_code_patterns(
+                pattern_code, 
+                min_matches=min_matches
+            )
+            _ANALYSIS_CACHE.set(cache_key, pattern_results)
         
         # Apply module pattern filter if specified
         if module_pattern:
@@ -3658,42 +3730,39 @@ async def handle_find_code_patterns(arguments: Dict[str, Any]) -> List[types.Tex
                 text=f"No code patterns found matching the specified criteria"
             )]
         
-        result_text = f"Code Pattern Analysis ({len(pattern_results)} functions contain pattern):\n\n"
-        result_text += f"Pattern searched:\n{pattern_code}\n\n"
+        parts = [f"Code Pattern Analysis ({len(pattern_results)} functions contain pattern):\n\n"]
+        parts.append(f"Pattern searched:\n{pattern_code}\n\n")
         
         for result in pattern_results:
             func_info = result["function"]
             matches = result["matches"]
             matched_lines = result.get("matched_lines", [])
             
-            result_text += f"• {func_info['name']}"
+            parts.append(f"• {func_info['name']}")
             if func_info.get("module"):
-                result_text += f" in {func_info['module']}"
-            result_text += f" ({matches} matches)\n"
+                parts.append(f" in {func_info['module']}")
+            parts.append(f" ({matches} matches)\n")
             
             # Show first few matched lines
             for i, (line_num, line_content) in enumerate(matched_lines[:3]):
-                result_text += f"    Line {line_num}: {line_content.strip()}\n"
+                parts.append(f"    Line {line_num}: {line_content.strip()}\n")
             
             if len(matched_lines) > 3:
-                result_text += f"    ... and {len(matched_lines) - 3} more matches\n"
+                parts.append(f"    ... and {len(matched_lines) - 3} more matches\n")
             
-            result_text += "\n"
+            parts.append("\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error finding code patterns: {e}"
         )]
 
-async def handle_group_similar_functions(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_group_similar_functions(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Group functions by similarity to identify common patterns"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     similarity_threshold = arguments.get("similarity_threshold", 0.7)
     module_pattern = arguments.get("module_pattern")
@@ -3701,10 +3770,15 @@ async def handle_group_similar_functions(arguments: Dict[str, Any]) -> List[type
     limit = arguments.get("limit", 10)
     
     try:
-        # Use QueryService's group_similar_functions method
-        function_groups = code_service.query_service.group_similar_functions(
-            similarity_threshold=similarity_threshold
-        )
+        # Use QueryService's group_similar_functions method; the pairwise
+        # comparison only depends on the threshold, so share it across filters
+        cache_key = ("group_similar_functions", similarity_threshold)
+        function_groups = _ANALYSIS_CACHE.get(cache_key)
+        if function_groups is None:
+            function_groups = code_service.query_service.group_similar_functions(
+                similarity_threshold=similarity_threshold
+            )
+            _ANALYSIS_CACHE.set(cache_key, function_groups)
         
         # Apply module pattern filter if specified
         if module_pattern:
@@ -3716,8 +3790,8 @@ async def handle_group_similar_functions(arguments: Dict[str, Any]) -> List[type
                         filtered_functions.append(func)
                 
                 if len(filtered_functions) >= min_group_size:
-                    group["functions"] = filtered_functions
-                    filtered_groups.append(group)
+                    # Copy rather than mutate: the groups are shared via the cache
+                    filtered_groups.append({**group, "functions": filtered_functions})
             function_groups = filtered_groups
         
         # Filter by minimum group size
@@ -3732,21 +3806,21 @@ async def handle_group_similar_functions(arguments: Dict[str, Any]) -> List[type
                 text=f"No function groups found with similarity >= {similarity_threshold} and group size >= {min_group_size}"
             )]
         
-        result_text = f"Function Similarity Groups (threshold: {similarity_threshold}):\n\n"
+        parts = [f"Function Similarity Groups (threshold: {similarity_threshold}):\n\n"]
         
         for i, group in enumerate(function_groups, 1):
             functions = group["functions"]
             similarity = group["similarity"]
             
-            result_text += f"Group {i} ({len(functions)} functions, similarity: {similarity:.3f}):\n"
+            parts.append(f"Group {i} ({len(functions)} functions, similarity: {similarity:.3f}):\n")
             for func in functions:
-                result_text += f"  • {func['name']}"
+                parts.append(f"  • {func['name']}")
                 if func.get("module"):
-                    result_text += f" in {func['module']}"
-                result_text += "\n"
-            result_text += "\n"
+                    parts.append(f" in {func['module']}")
+                parts.append("\n")
+            parts.append("\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
@@ -3755,13 +3829,10 @@ async def handle_group_similar_functions(arguments: Dict[str, Any]) -> List[type
 
 # Phase 1: Advanced Type Analysis Tool Handlers
 
-async def handle_build_type_dependency_graph(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_build_type_dependency_graph(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Build a comprehensive type dependency graph showing relationships between types"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     root_type = arguments.get("root_type")
     module_pattern = arguments.get("module_pattern")
@@ -3770,59 +3841,59 @@ async def handle_build_type_dependency_graph(arguments: Dict[str, Any]) -> List[
     
     try:
         # Use QueryService's build_type_dependency_graph method
-        graph_data = code_service.query_service.build_type_dependency_graph()
+        graph_data = get_type_dependency_graph()
         graph = graph_data["graph"]
         type_name_index = graph_data["type_name_index"]
         
-        result_text = "Type Dependency Graph:\n\n"
+        parts = ["Type Dependency Graph:\n\n"]
         
         if root_type:
             # Show subgraph starting from specific type
             if root_type in type_name_index:
-                result_text += f"Dependencies for type '{root_type}':\n\n"
+                parts.append(f"Dependencies for type '{root_type}':\n\n")
                 
                 for type_id in type_name_index[root_type]:
                     type_node = graph.get(type_id, {})
                     if module_pattern and module_pattern not in type_node.get("module_name", ""):
                         continue
                     
-                    result_text += f"• {type_node.get('type_name', 'Unknown')}"
+                    parts.append(f"• {type_node.get('type_name', 'Unknown')}")
                     if type_node.get("module_name"):
-                        result_text += f" (in {type_node['module_name']})"
-                    result_text += "\n"
+                        parts.append(f" (in {type_node['module_name']})")
+                    parts.append("\n")
                     
                     # Show direct dependencies
                     edges = type_node.get("edges", [])
                     if edges:
-                        result_text += "  Dependencies:\n"
+                        parts.append("  Dependencies:\n")
                         for edge in edges[:10]:  # Limit to first 10
                             if edge in graph:
                                 edge_node = graph[edge]
-                                result_text += f"    → {edge_node.get('type_name', edge)}"
+                                parts.append(f"    → {edge_node.get('type_name', edge)}")
                                 if edge_node.get("module_name"):
-                                    result_text += f" (in {edge_node['module_name']})"
-                                result_text += "\n"
+                                    parts.append(f" (in {edge_node['module_name']})")
+                                parts.append("\n")
                             elif not include_external:
                                 # Skip external dependencies
                                 continue
                             else:
-                                result_text += f"    → {edge} (external)\n"
+                                parts.append(f"    → {edge} (external)\n")
                         
                         if len(edges) > 10:
-                            result_text += f"    ... and {len(edges) - 10} more dependencies\n"
+                            parts.append(f"    ... and {len(edges) - 10} more dependencies\n")
                     
-                    result_text += "\n"
+                    parts.append("\n")
             else:
-                result_text += f"Type '{root_type}' not found in dependency graph\n"
+                parts.append(f"Type '{root_type}' not found in dependency graph\n")
         else:
             # Show general graph statistics
             total_types = len(graph)
             total_dependencies = sum(len(node.get("edges", [])) for node in graph.values())
             
-            result_text += f"Graph Statistics:\n"
-            result_text += f"• Total types: {total_types}\n"
-            result_text += f"• Total dependencies: {total_dependencies}\n"
-            result_text += f"• Average dependencies per type: {total_dependencies/total_types:.1f}\n\n"
+            parts.append(f"Graph Statistics:\n")
+            parts.append(f"• Total types: {total_types}\n")
+            parts.append(f"• Total dependencies: {total_dependencies}\n")
+            parts.append(f"• Average dependencies per type: {total_dependencies/total_types:.1f}\n\n")
             
             # Show most connected types
             type_connections = []
@@ -3839,27 +3910,24 @@ async def handle_build_type_dependency_graph(arguments: Dict[str, Any]) -> List[
             # Sort by connection count
             type_connections.sort(key=lambda x: x[2], reverse=True)
             
-            result_text += f"Most Connected Types (top 10):\n"
+            parts.append(f"Most Connected Types (top 10):\n")
             for type_name, module_name, edge_count in type_connections[:10]:
-                result_text += f"• {type_name}"
+                parts.append(f"• {type_name}")
                 if module_name:
-                    result_text += f" (in {module_name})"
-                result_text += f" - {edge_count} dependencies\n"
+                    parts.append(f" (in {module_name})")
+                parts.append(f" - {edge_count} dependencies\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error building type dependency graph: {e}"
         )]
 
-async def handle_get_nested_types(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_get_nested_types(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Get all nested type definitions for specified types"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     type_names = arguments["type_names"]
     gateway_name = arguments["gateway_name"]
@@ -3880,37 +3948,34 @@ async def handle_get_nested_types(arguments: Dict[str, Any]) -> List[types.TextC
                 text=f"No nested types found for {type_names} under gateway '{gateway_name}'"
             )]
         
-        result_text = f"Nested Types for {type_names} (gateway: {gateway_name}):\n\n"
-        result_text += f"Found {len(nested_types)} type definitions:\n\n"
+        parts = [f"Nested Types for {type_names} (gateway: {gateway_name}):\n\n"]
+        parts.append(f"Found {len(nested_types)} type definitions:\n\n")
         
         for i, type_def in enumerate(nested_types, 1):
             if include_raw_definitions:
-                result_text += f"=== Type Definition {i} ===\n"
-                result_text += f"{type_def}\n\n"
+                parts.append(f"=== Type Definition {i} ===\n")
+                parts.append(f"{type_def}\n\n")
             else:
                 # Extract just the type name from the definition
                 lines = type_def.split('\n')
                 if lines:
                     first_line = lines[0].strip()
-                    result_text += f"{i}. {first_line}\n"
+                    parts.append(f"{i}. {first_line}\n")
         
         if not include_raw_definitions:
-            result_text += f"\nUse 'include_raw_definitions: true' to see full type definitions.\n"
+            parts.append(f"\nUse 'include_raw_definitions: true' to see full type definitions.\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error getting nested types: {e}"
         )]
 
-async def handle_analyze_type_relationships(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_analyze_type_relationships(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Analyze deep type relationships and dependencies"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     type_name = arguments["type_name"]
     source_module = arguments["source_module"]
@@ -3932,66 +3997,69 @@ async def handle_analyze_type_relationships(arguments: Dict[str, Any]) -> List[t
                 text=f"No type relationships found for '{type_name}' in module '{source_module}'"
             )]
         
-        result_text = f"Type Relationship Analysis for '{type_name}' (module: {source_module}):\n\n"
-        result_text += f"Found {len(subgraph_nodes)} related types:\n\n"
+        parts = [f"Type Relationship Analysis for '{type_name}' (module: {source_module}):\n\n"]
+        parts.append(f"Found {len(subgraph_nodes)} related types:\n\n")
         
         # Get the graph to show details
-        graph_data = code_service.query_service.build_type_dependency_graph()
+        graph_data = get_type_dependency_graph()
         graph = graph_data["graph"]
         
         for i, node_id in enumerate(subgraph_nodes, 1):
             if node_id in graph:
                 node = graph[node_id]
-                result_text += f"{i}. {node.get('type_name', 'Unknown')}"
+                parts.append(f"{i}. {node.get('type_name', 'Unknown')}")
                 if node.get("module_name"):
-                    result_text += f" (in {node['module_name']})"
-                result_text += "\n"
+                    parts.append(f" (in {node['module_name']})")
+                parts.append("\n")
                 
                 # Show dependencies
                 edges = node.get("edges", [])
                 if edges:
-                    result_text += "   Dependencies:\n"
+                    parts.append("   Dependencies:\n")
                     for edge in edges[:5]:  # Limit to first 5
                         if edge in graph:
                             edge_node = graph[edge]
-                            result_text += f"     → {edge_node.get('type_name', edge)}\n"
+                            parts.append(f"     → {edge_node.get('type_name', edge)}\n")
                         else:
-                            result_text += f"     → {edge} (external)\n"
+                            parts.append(f"     → {edge} (external)\n")
                     
                     if len(edges) > 5:
-                        result_text += f"     ... and {len(edges) - 5} more\n"
+                        parts.append(f"     ... and {len(edges) - 5} more\n")
                 
-                result_text += "\n"
+                parts.append("\n")
             else:
-                result_text += f"{i}. {node_id} (external)\n\n"
+                parts.append(f"{i}. {node_id} (external)\n\n")
         
         # Show reverse dependencies if requested
         if include_dependents:
-            result_text += "=== Reverse Dependencies ===\n"
+            parts.append("=== Reverse Dependencies ===\n")
             dependents = []
             
             # Find types that depend on our target type
+            subgraph_node_set = set(subgraph_nodes)
             for node_id, node in graph.items():
+                if node_id in subgraph_node_set:
+                    continue
                 edges = node.get("edges", [])
                 for edge in edges:
-                    if edge in subgraph_nodes and node_id not in subgraph_nodes:
+                    if edge in subgraph_node_set:
                         dependents.append((node_id, node))
                         break
             
             if dependents:
-                result_text += f"Found {len(dependents)} types that depend on '{type_name}':\n\n"
+                parts.append(f"Found {len(dependents)} types that depend on '{type_name}':\n\n")
                 for node_id, node in dependents[:10]:  # Limit to first 10
-                    result_text += f"• {node.get('type_name', 'Unknown')}"
+                    parts.append(f"• {node.get('type_name', 'Unknown')}")
                     if node.get("module_name"):
-                        result_text += f" (in {node['module_name']})"
-                    result_text += "\n"
+                        parts.append(f" (in {node['module_name']})")
+                    parts.append("\n")
                 
                 if len(dependents) > 10:
-                    result_text += f"... and {len(dependents) - 10} more\n"
+                    parts.append(f"... and {len(dependents) - 10} more\n")
             else:
-                result_text += f"No types found that depend on '{type_name}'\n"
+                parts.append(f"No types found that depend on '{type_name}'\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
@@ -4000,13 +4068,10 @@ async def handle_analyze_type_relationships(arguments: Dict[str, Any]) -> List[t
 
 # Phase 1: Source Location Tool Handlers
 
-async def handle_find_element_by_location(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_find_element_by_location(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Find code elements (functions, types, classes, imports) by source location"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     file_path = arguments["file_path"]
     line_number = arguments["line_number"]
@@ -4014,7 +4079,7 @@ async def handle_find_element_by_location(arguments: Dict[str, Any]) -> List[typ
     element_types = arguments.get("element_types", ["all"])
     
     try:
-        result_text = f"Code Elements at {file_path}:{line_number}:\n\n"
+        parts = [f"Code Elements at {file_path}:{line_number}:\n\n"]
         found_elements = []
         
         # Search for functions if requested
@@ -4067,24 +4132,21 @@ async def handle_find_element_by_location(arguments: Dict[str, Any]) -> List[typ
             )]
         
         for element_type, name, description, location in found_elements:
-            result_text += f"• {element_type}: {name}\n"
-            result_text += f"  Description: {description}\n"
-            result_text += f"  Location: {location}\n\n"
+            parts.append(f"• {element_type}: {name}\n")
+            parts.append(f"  Description: {description}\n")
+            parts.append(f"  Location: {location}\n\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error finding elements by location: {e}"
         )]
 
-async def handle_get_location_context(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_get_location_context(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Get comprehensive context around a source location"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     file_path = arguments["file_path"]
     line_number = arguments["line_number"]
@@ -4092,7 +4154,7 @@ async def handle_get_location_context(arguments: Dict[str, Any]) -> List[types.T
     include_dependencies = arguments.get("include_dependencies", True)
     
     try:
-        result_text = f"Context for {file_path}:{line_number} (±{context_radius} lines):\n\n"
+        parts = [f"Context for {file_path}:{line_number} (±{context_radius} lines):\n\n"]
         
         # Find the closest function to this location
         function = code_service.query_service.find_function_by_src_loc(
@@ -4102,13 +4164,13 @@ async def handle_get_location_context(arguments: Dict[str, Any]) -> List[types.T
         )
         
         if function:
-            result_text += f"=== Function Context ===\n"
-            result_text += f"Function: {function.name}\n"
+            parts.append(f"=== Function Context ===\n")
+            parts.append(f"Function: {function.name}\n")
             if function.function_signature:
-                result_text += f"Signature: {function.function_signature}\n"
+                parts.append(f"Signature: {function.function_signature}\n")
             if function.module:
-                result_text += f"Module: {function.module.name}\n"
-            result_text += f"Location: {function.src_loc}\n\n"
+                parts.append(f"Module: {function.module.name}\n")
+            parts.append(f"Location: {function.src_loc}\n\n")
             
             if include_dependencies:
                 # Get function dependencies using QueryService
@@ -4122,45 +4184,45 @@ async def handle_get_location_context(arguments: Dict[str, Any]) -> List[types.T
                     non_local_types = types_used.get("non_local_types", [])
                     
                     if local_functions:
-                        result_text += f"Local Functions Used ({len(local_functions)}):\n"
+                        parts.append(f"Local Functions Used ({len(local_functions)}):\n")
                         for func in local_functions[:5]:  # Limit to first 5
-                            result_text += f"  • {func.name}\n"
+                            parts.append(f"  • {func.name}\n")
                         if len(local_functions) > 5:
-                            result_text += f"  ... and {len(local_functions) - 5} more\n"
-                        result_text += "\n"
+                            parts.append(f"  ... and {len(local_functions) - 5} more\n")
+                        parts.append("\n")
                     
                     if other_functions:
-                        result_text += f"External Functions Used ({len(other_functions)}):\n"
+                        parts.append(f"External Functions Used ({len(other_functions)}):\n")
                         for func in other_functions[:5]:  # Limit to first 5
-                            result_text += f"  • {func.get('function_name', 'Unknown')}"
+                            parts.append(f"  • {func.get('function_name', 'Unknown')}")
                             if func.get('module_name'):
-                                result_text += f" (from {func['module_name']})"
-                            result_text += "\n"
+                                parts.append(f" (from {func['module_name']})")
+                            parts.append("\n")
                         if len(other_functions) > 5:
-                            result_text += f"  ... and {len(other_functions) - 5} more\n"
-                        result_text += "\n"
+                            parts.append(f"  ... and {len(other_functions) - 5} more\n")
+                        parts.append("\n")
                     
                     if local_types:
-                        result_text += f"Local Types Used ({len(local_types)}):\n"
+                        parts.append(f"Local Types Used ({len(local_types)}):\n")
                         for type_obj in local_types[:5]:  # Limit to first 5
-                            result_text += f"  • {type_obj.type_name}\n"
+                            parts.append(f"  • {type_obj.type_name}\n")
                         if len(local_types) > 5:
-                            result_text += f"  ... and {len(local_types) - 5} more\n"
-                        result_text += "\n"
+                            parts.append(f"  ... and {len(local_types) - 5} more\n")
+                        parts.append("\n")
                     
                     if non_local_types:
-                        result_text += f"External Types Used ({len(non_local_types)}):\n"
+                        parts.append(f"External Types Used ({len(non_local_types)}):\n")
                         for type_info in non_local_types[:5]:  # Limit to first 5
-                            result_text += f"  • {type_info.get('type_name', 'Unknown')}"
+                            parts.append(f"  • {type_info.get('type_name', 'Unknown')}")
                             if type_info.get('module_name'):
-                                result_text += f" (from {type_info['module_name']})"
-                            result_text += "\n"
+                                parts.append(f" (from {type_info['module_name']})")
+                            parts.append("\n")
                         if len(non_local_types) > 5:
-                            result_text += f"  ... and {len(non_local_types) - 5} more\n"
-                        result_text += "\n"
+                            parts.append(f"  ... and {len(non_local_types) - 5} more\n")
+                        parts.append("\n")
                 
                 except Exception as dep_error:
-                    result_text += f"Note: Could not analyze dependencies: {dep_error}\n\n"
+                    parts.append(f"Note: Could not analyze dependencies: {dep_error}\n\n")
         
         # Check for types at this location
         type_def = code_service.query_service.find_type_by_src_loc(
@@ -4170,21 +4232,21 @@ async def handle_get_location_context(arguments: Dict[str, Any]) -> List[types.T
         )
         
         if type_def:
-            result_text += f"=== Type Context ===\n"
-            result_text += f"Type: {type_def.type_name}\n"
-            result_text += f"Category: {type_def.type_of_type or 'Unknown'}\n"
+            parts.append(f"=== Type Context ===\n")
+            parts.append(f"Type: {type_def.type_name}\n")
+            parts.append(f"Category: {type_def.type_of_type or 'Unknown'}\n")
             if type_def.module:
-                result_text += f"Module: {type_def.module.name}\n"
-            result_text += f"Location: {type_def.src_loc}\n"
+                parts.append(f"Module: {type_def.module.name}\n")
+            parts.append(f"Location: {type_def.src_loc}\n")
             if type_def.raw_code:
                 # Show first few lines of the type definition
                 lines = type_def.raw_code.split('\n')[:5]
-                result_text += f"Definition:\n"
+                parts.append(f"Definition:\n")
                 for line in lines:
-                    result_text += f"  {line}\n"
+                    parts.append(f"  {line}\n")
                 if len(type_def.raw_code.split('\n')) > 5:
-                    result_text += "  ...\n"
-            result_text += "\n"
+                    parts.append("  ...\n")
+            parts.append("\n")
         
         # Check for classes at this location
         class_def = code_service.query_service.find_class_by_src_loc(
@@ -4194,20 +4256,20 @@ async def handle_get_location_context(arguments: Dict[str, Any]) -> List[types.T
         )
         
         if class_def:
-            result_text += f"=== Class Context ===\n"
-            result_text += f"Class: {class_def.class_name}\n"
+            parts.append(f"=== Class Context ===\n")
+            parts.append(f"Class: {class_def.class_name}\n")
             if class_def.module:
-                result_text += f"Module: {class_def.module.name}\n"
-            result_text += f"Location: {class_def.src_location}\n"
+                parts.append(f"Module: {class_def.module.name}\n")
+            parts.append(f"Location: {class_def.src_location}\n")
             if class_def.class_definition:
                 # Show first few lines of the class definition
                 lines = class_def.class_definition.split('\n')[:3]
-                result_text += f"Definition:\n"
+                parts.append(f"Definition:\n")
                 for line in lines:
-                    result_text += f"  {line}\n"
+                    parts.append(f"  {line}\n")
                 if len(class_def.class_definition.split('\n')) > 3:
-                    result_text += "  ...\n"
-            result_text += "\n"
+                    parts.append("  ...\n")
+            parts.append("\n")
         
         # Check for imports at this location
         import_stmt = code_service.query_service.find_import_by_src_loc(
@@ -4217,20 +4279,20 @@ async def handle_get_location_context(arguments: Dict[str, Any]) -> List[types.T
         )
         
         if import_stmt:
-            result_text += f"=== Import Context ===\n"
-            result_text += f"Import: {import_stmt.module_name}\n"
+            parts.append(f"=== Import Context ===\n")
+            parts.append(f"Import: {import_stmt.module_name}\n")
             if import_stmt.package_name:
-                result_text += f"Package: {import_stmt.package_name}\n"
+                parts.append(f"Package: {import_stmt.package_name}\n")
             if import_stmt.qualified_style:
-                result_text += f"Style: Qualified\n"
+                parts.append(f"Style: Qualified\n")
             if import_stmt.as_module_name:
-                result_text += f"Alias: {import_stmt.as_module_name}\n"
-            result_text += f"Location: {import_stmt.src_loc}\n\n"
+                parts.append(f"Alias: {import_stmt.as_module_name}\n")
+            parts.append(f"Location: {import_stmt.src_loc}\n\n")
         
         if not function and not type_def and not class_def and not import_stmt:
-            result_text += "No code elements found at this location.\n"
+            parts.append("No code elements found at this location.\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
@@ -4239,13 +4301,10 @@ async def handle_get_location_context(arguments: Dict[str, Any]) -> List[types.T
 
 # Phase 1: Function Context Tool Handlers
 
-async def handle_get_function_context(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_get_function_context(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Get complete context for a function including all used types and functions"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     function_name = arguments["function_name"]
     module_name = arguments.get("module_name")
@@ -4257,7 +4316,7 @@ async def handle_get_function_context(arguments: Dict[str, Any]) -> List[types.T
         # Get the target function
         module_id = None
         if module_name:
-            module = code_service.query_service.get_module_by_name(module_name)
+            module = code_service.get_module_by_name(module_name)
             if not module:
                 return [types.TextContent(
                     type="text",
@@ -4274,19 +4333,19 @@ async def handle_get_function_context(arguments: Dict[str, Any]) -> List[types.T
         
         target_function = functions[0]
         
-        result_text = f"Complete Context for Function '{target_function.name}':\n\n"
+        parts = [f"Complete Context for Function '{target_function.name}':\n\n"]
         
         # Basic function information
-        result_text += f"=== Function Information ===\n"
-        result_text += f"Name: {target_function.name}\n"
+        parts.append(f"=== Function Information ===\n")
+        parts.append(f"Name: {target_function.name}\n")
         if target_function.function_signature:
-            result_text += f"Signature: {target_function.function_signature}\n"
+            parts.append(f"Signature: {target_function.function_signature}\n")
         if target_function.module:
-            result_text += f"Module: {target_function.module.name}\n"
-        result_text += f"Location: {target_function.src_loc}\n"
+            parts.append(f"Module: {target_function.module.name}\n")
+        parts.append(f"Location: {target_function.src_loc}\n")
         if target_function.raw_string:
-            result_text += f"Code Length: {len(target_function.raw_string)} characters\n"
-        result_text += "\n"
+            parts.append(f"Code Length: {len(target_function.raw_string)} characters\n")
+        parts.append("\n")
         
         # Get function and type usage using QueryService methods
         if include_prompts:
@@ -4295,24 +4354,24 @@ async def handle_get_function_context(arguments: Dict[str, Any]) -> List[types.T
             local_types_prompt, non_local_types_prompt = code_service.query_service.get_types_used_in_function_prompt(target_function.id)
             
             if include_local_definitions and local_functions_prompt:
-                result_text += f"=== Local Functions Used ===\n"
-                result_text += local_functions_prompt
-                result_text += "\n\n"
+                parts.append(f"=== Local Functions Used ===\n")
+                parts.append(local_functions_prompt)
+                parts.append("\n\n")
             
             if include_local_definitions and local_types_prompt:
-                result_text += f"=== Local Types Used ===\n"
-                result_text += local_types_prompt
-                result_text += "\n\n"
+                parts.append(f"=== Local Types Used ===\n")
+                parts.append(local_types_prompt)
+                parts.append("\n\n")
             
             if include_external_references and non_local_functions_prompt:
-                result_text += f"=== External Functions Used ===\n"
-                result_text += non_local_functions_prompt
-                result_text += "\n\n"
+                parts.append(f"=== External Functions Used ===\n")
+                parts.append(non_local_functions_prompt)
+                parts.append("\n\n")
             
             if include_external_references and non_local_types_prompt:
-                result_text += f"=== External Types Used ===\n"
-                result_text += non_local_types_prompt
-                result_text += "\n\n"
+                parts.append(f"=== External Types Used ===\n")
+                parts.append(non_local_types_prompt)
+                parts.append("\n\n")
         else:
             # Get raw data without prompts
             functions_used = code_service.query_service.get_functions_used(target_function.id)
@@ -4324,62 +4383,59 @@ async def handle_get_function_context(arguments: Dict[str, Any]) -> List[types.T
             non_local_types = types_used.get("non_local_types", [])
             
             if include_local_definitions and local_functions:
-                result_text += f"=== Local Functions Used ({len(local_functions)}) ===\n"
+                parts.append(f"=== Local Functions Used ({len(local_functions)}) ===\n")
                 for func in local_functions:
-                    result_text += f"• {func.name}"
+                    parts.append(f"• {func.name}")
                     if func.function_signature:
-                        result_text += f" :: {func.function_signature}"
-                    result_text += "\n"
-                result_text += "\n"
+                        parts.append(f" :: {func.function_signature}")
+                    parts.append("\n")
+                parts.append("\n")
             
             if include_local_definitions and local_types:
-                result_text += f"=== Local Types Used ({len(local_types)}) ===\n"
+                parts.append(f"=== Local Types Used ({len(local_types)}) ===\n")
                 for type_obj in local_types:
-                    result_text += f"• {type_obj.type_name}"
+                    parts.append(f"• {type_obj.type_name}")
                     if type_obj.type_of_type:
-                        result_text += f" ({type_obj.type_of_type})"
-                    result_text += "\n"
-                result_text += "\n"
+                        parts.append(f" ({type_obj.type_of_type})")
+                    parts.append("\n")
+                parts.append("\n")
             
             if include_external_references and other_functions:
-                result_text += f"=== External Functions Used ({len(other_functions)}) ===\n"
+                parts.append(f"=== External Functions Used ({len(other_functions)}) ===\n")
                 for func in other_functions:
-                    result_text += f"• {func.get('function_name', 'Unknown')}"
+                    parts.append(f"• {func.get('function_name', 'Unknown')}")
                     if func.get('module_name'):
-                        result_text += f" (from {func['module_name']})"
-                    result_text += "\n"
-                result_text += "\n"
+                        parts.append(f" (from {func['module_name']})")
+                    parts.append("\n")
+                parts.append("\n")
             
             if include_external_references and non_local_types:
-                result_text += f"=== External Types Used ({len(non_local_types)}) ===\n"
+                parts.append(f"=== External Types Used ({len(non_local_types)}) ===\n")
                 for type_info in non_local_types:
-                    result_text += f"• {type_info.get('type_name', 'Unknown')}"
+                    parts.append(f"• {type_info.get('type_name', 'Unknown')}")
                     if type_info.get('module_name'):
-                        result_text += f" (from {type_info['module_name']})"
-                    result_text += "\n"
-                result_text += "\n"
+                        parts.append(f" (from {type_info['module_name']})")
+                    parts.append("\n")
+                parts.append("\n")
         
         # Show function implementation if available
         if target_function.raw_string:
-            result_text += f"=== Function Implementation ===\n"
-            result_text += "```haskell\n"
-            result_text += target_function.raw_string
-            result_text += "\n```\n\n"
+            parts.append(f"=== Function Implementation ===\n")
+            parts.append("```haskell\n")
+            parts.append(target_function.raw_string)
+            parts.append("\n```\n\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error getting function context: {e}"
         )]
 
-async def handle_generate_function_imports(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_generate_function_imports(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Generate all necessary import statements for a function or code element"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     element_name = arguments["element_name"]
     source_module = arguments["source_module"]
@@ -4387,12 +4443,17 @@ async def handle_generate_function_imports(arguments: Dict[str, Any]) -> List[ty
     import_style = arguments.get("import_style", "haskell")
     
     try:
-        # Use QueryService's generate_imports_for_element method
-        import_statements = code_service.query_service.generate_imports_for_element(
-            element_name=element_name,
-            source_module=source_module,
-            element_type=element_type
-        )
+        # Use QueryService's generate_imports_for_element method; import_style
+        # only affects formatting, so it isn't part of the cache key
+        cache_key = (element_name, source_module, element_type)
+        import_statements = _IMPORTS_CACHE.get(cache_key)
+        if import_statements is None:
+            import_statements = tuple(code_service.query_service.generate_imports_for_element(
+                element_name=element_name,
+                source_module=source_module,
+                element_type=element_type
+            ) or ())
+            _IMPORTS_CACHE.set(cache_key, import_statements)
         
         if not import_statements:
             return [types.TextContent(
@@ -4400,20 +4461,20 @@ async def handle_generate_function_imports(arguments: Dict[str, Any]) -> List[ty
                 text=f"No import statements needed for '{element_name}' in module '{source_module}'"
             )]
         
-        result_text = f"Import Statements for '{element_name}' (type: {element_type}):\n\n"
+        parts = [f"Import Statements for '{element_name}' (type: {element_type}):\n\n"]
         
         if import_style == "haskell":
-            result_text += "```haskell\n"
+            parts.append("```haskell\n")
             for stmt in import_statements:
-                result_text += f"{stmt}\n"
-            result_text += "```\n\n"
+                parts.append(f"{stmt}\n")
+            parts.append("```\n\n")
         else:
             for i, stmt in enumerate(import_statements, 1):
-                result_text += f"{i}. {stmt}\n"
+                parts.append(f"{i}. {stmt}\n")
         
-        result_text += f"\nGenerated {len(import_statements)} import statement(s) for '{element_name}' in module '{source_module}'.\n"
+        parts.append(f"\nGenerated {len(import_statements)} import statement(s) for '{element_name}' in module '{source_module}'.\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
@@ -4422,19 +4483,23 @@ async def handle_generate_function_imports(arguments: Dict[str, Any]) -> List[ty
 
 # Phase 2: Enhanced Query Capabilities Tool Handlers
 
-async def handle_execute_custom_query(arguments: Dict[str, Any]) -> List[types.TextContent]:
+_READ_ONLY_TRANSACTION = text("SET TRANSACTION READ ONLY")
+
+def handle_execute_custom_query(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Execute custom SQL queries on the code database with parameters"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     query = arguments["query"]
     parameters = arguments.get("parameters", {})
     limit = arguments.get("limit", 100)
     
     try:
+        # Client SQL must not modify the code database. The session is fresh
+        # for this call and QueryService runs on it, so marking its
+        # transaction READ ONLY first covers the query below
+        code_service.db_session.execute(_READ_ONLY_TRANSACTION)
+        
         # Use QueryService's execute_custom_query method
         results = code_service.query_service.execute_custom_query(
             query_str=query,
@@ -4450,40 +4515,37 @@ async def handle_execute_custom_query(arguments: Dict[str, Any]) -> List[types.T
                 text="No results returned from the query"
             )]
         
-        result_text = f"Custom Query Results ({len(results)} rows):\n\n"
-        result_text += f"Query: {query}\n"
+        parts = [f"Custom Query Results ({len(results)} rows):\n\n"]
+        parts.append(f"Query: {query}\n")
         if parameters:
-            result_text += f"Parameters: {parameters}\n"
-        result_text += "\n"
+            parts.append(f"Parameters: {parameters}\n")
+        parts.append("\n")
         
         # Show column headers if available
         if results and isinstance(results[0], dict):
             headers = list(results[0].keys())
-            result_text += " | ".join(headers) + "\n"
-            result_text += "-" * (len(" | ".join(headers))) + "\n"
+            parts.append(" | ".join(headers) + "\n")
+            parts.append("-" * (len(" | ".join(headers))) + "\n")
             
             for row in results:
                 values = [str(row.get(header, "")) for header in headers]
-                result_text += " | ".join(values) + "\n"
+                parts.append(" | ".join(values) + "\n")
         else:
             # Simple list format
             for i, row in enumerate(results, 1):
-                result_text += f"{i}. {row}\n"
+                parts.append(f"{i}. {row}\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error executing custom query: {e}"
         )]
 
-async def handle_pattern_match_code(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_pattern_match_code(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Advanced pattern matching to find code structures"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     pattern_type = arguments["pattern_type"]
     pattern_config = arguments["pattern_config"]
@@ -4505,64 +4567,61 @@ async def handle_pattern_match_code(arguments: Dict[str, Any]) -> List[types.Tex
                 text=f"No {pattern_type} patterns found matching the specified criteria"
             )]
         
-        result_text = f"Pattern Matching Results ({pattern_type}):\n\n"
-        result_text += f"Configuration: {pattern_config}\n"
-        result_text += f"Found {len(results)} matches:\n\n"
+        parts = [f"Pattern Matching Results ({pattern_type}):\n\n"]
+        parts.append(f"Configuration: {pattern_config}\n")
+        parts.append(f"Found {len(results)} matches:\n\n")
         
         if pattern_type == "function_call":
             for result in results:
                 caller = result.get("caller", {})
                 callee = result.get("callee", {})
                 
-                result_text += f"• {caller.get('name', 'Unknown')}"
+                parts.append(f"• {caller.get('name', 'Unknown')}")
                 if caller.get('module'):
-                    result_text += f" (in {caller['module']})"
+                    parts.append(f" (in {caller['module']})")
                 
-                result_text += f" → {callee.get('name', 'Unknown')}"
+                parts.append(f" → {callee.get('name', 'Unknown')}")
                 if callee.get('module'):
-                    result_text += f" (in {callee['module']})"
-                result_text += "\n"
+                    parts.append(f" (in {callee['module']})")
+                parts.append("\n")
         
         elif pattern_type == "type_usage":
             for result in results:
                 function = result.get("function", {})
                 type_name = result.get("type", "Unknown")
                 
-                result_text += f"• Type '{type_name}' used in {function.get('name', 'Unknown')}"
+                parts.append(f"• Type '{type_name}' used in {function.get('name', 'Unknown')}")
                 if function.get('module'):
-                    result_text += f" (in {function['module']})"
-                result_text += "\n"
+                    parts.append(f" (in {function['module']})")
+                parts.append("\n")
         
         elif pattern_type == "code_structure":
             for result in results:
                 parent_function = result.get("parent_function", {})
                 nested_functions = result.get("nested_functions", [])
                 
-                result_text += f"• {parent_function.get('name', 'Unknown')}"
+                parts.append(f"• {parent_function.get('name', 'Unknown')}")
                 if parent_function.get('module'):
-                    result_text += f" (in {parent_function['module']})"
+                    parts.append(f" (in {parent_function['module']})")
                 
                 if nested_functions:
-                    result_text += f" - {len(nested_functions)} nested functions:\n"
+                    parts.append(f" - {len(nested_functions)} nested functions:\n")
                     for nested in nested_functions:
-                        result_text += f"    - {nested.get('name', 'Unknown')}\n"
+                        parts.append(f"    - {nested.get('name', 'Unknown')}\n")
                 else:
-                    result_text += "\n"
+                    parts.append("\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error pattern matching: {e}"
         )]
 
-async def handle_analyze_cross_module_dependencies(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_analyze_cross_module_dependencies(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Comprehensive analysis of cross-module dependencies and coupling"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     analysis_type = arguments.get("analysis_type", "dependencies")
     module_pattern = arguments.get("module_pattern")
@@ -4571,11 +4630,15 @@ async def handle_analyze_cross_module_dependencies(arguments: Dict[str, Any]) ->
     limit = arguments.get("limit", 50)
     
     try:
-        result_text = f"Cross-Module {analysis_type.title()} Analysis:\n\n"
+        parts = [f"Cross-Module {analysis_type.title()} Analysis:\n\n"]
         
         if analysis_type == "dependencies":
-            # Use QueryService's find_cross_module_dependencies method
-            dependencies = code_service.query_service.find_cross_module_dependencies()
+            # Use QueryService's find_cross_module_dependencies method; the
+            # edge aggregation covers the whole codebase, so keep it across filters
+            dependencies = _ANALYSIS_CACHE.get("cross_module_dependencies")
+            if dependencies is None:
+                dependencies = code_service.query_service.find_cross_module_dependencies()
+                _ANALYSIS_CACHE.set("cross_module_dependencies", dependencies)
             
             # Apply module pattern filter if specified
             if module_pattern:
@@ -4590,9 +4653,8 @@ async def handle_analyze_cross_module_dependencies(arguments: Dict[str, Any]) ->
             # Apply threshold filter
             dependencies = [d for d in dependencies if d["call_count"] >= threshold]
             
-            # Sort by call count and apply limit
-            dependencies.sort(key=lambda x: x["call_count"], reverse=True)
-            dependencies = dependencies[:limit]
+            # Only the top `limit` by call count are shown, so don't sort the rest
+            dependencies = heapq.nlargest(limit, dependencies, key=lambda x: x["call_count"])
             
             if not dependencies:
                 return [types.TextContent(
@@ -4600,23 +4662,26 @@ async def handle_analyze_cross_module_dependencies(arguments: Dict[str, Any]) ->
                     text=f"No cross-module dependencies found matching criteria"
                 )]
             
-            result_text += f"Found {len(dependencies)} cross-module dependencies:\n\n"
+            parts.append(f"Found {len(dependencies)} cross-module dependencies:\n\n")
             
             for dep in dependencies:
                 caller = dep["caller_module"]
                 callee = dep["callee_module"]
                 calls = dep["call_count"]
                 
-                result_text += f"• {caller['name']} → {callee['name']} ({calls} calls)\n"
+                parts.append(f"• {caller['name']} → {callee['name']} ({calls} calls)\n")
         
         elif analysis_type == "coupling":
             # Use QueryService's analyze_module_coupling method
-            coupling_analysis = code_service.query_service.analyze_module_coupling()
+            coupling_analysis = _ANALYSIS_CACHE.get("module_coupling")
+            if coupling_analysis is None:
+                coupling_analysis = code_service.query_service.analyze_module_coupling()
+                _ANALYSIS_CACHE.set("module_coupling", coupling_analysis)
             
-            result_text += f"Module Coupling Analysis:\n\n"
-            result_text += f"Total Modules: {coupling_analysis['module_count']}\n"
-            result_text += f"Total Cross-Module Calls: {coupling_analysis['total_cross_module_calls']}\n"
-            result_text += f"Total Dependencies: {coupling_analysis['dependency_count']}\n\n"
+            parts.append(f"Module Coupling Analysis:\n\n")
+            parts.append(f"Total Modules: {coupling_analysis['module_count']}\n")
+            parts.append(f"Total Cross-Module Calls: {coupling_analysis['total_cross_module_calls']}\n")
+            parts.append(f"Total Dependencies: {coupling_analysis['dependency_count']}\n\n")
             
             if include_metrics:
                 module_metrics = coupling_analysis["module_metrics"]
@@ -4629,18 +4694,22 @@ async def handle_analyze_cross_module_dependencies(arguments: Dict[str, Any]) ->
                 module_metrics = [m for m in module_metrics if m["total"] >= threshold]
                 module_metrics = module_metrics[:limit]
                 
-                result_text += f"Module Coupling Metrics (top {len(module_metrics)}):\n"
+                parts.append(f"Module Coupling Metrics (top {len(module_metrics)}):\n")
                 for module in module_metrics:
-                    result_text += f"• {module['name']}:\n"
-                    result_text += f"    Incoming: {module['incoming']} calls\n"
-                    result_text += f"    Outgoing: {module['outgoing']} calls\n"
-                    result_text += f"    Total: {module['total']} calls\n\n"
+                    parts.append(f"• {module['name']}:\n")
+                    parts.append(f"    Incoming: {module['incoming']} calls\n")
+                    parts.append(f"    Outgoing: {module['outgoing']} calls\n")
+                    parts.append(f"    Total: {module['total']} calls\n\n")
         
         elif analysis_type == "complexity":
             # Use QueryService's find_complex_functions method
-            complex_functions = code_service.query_service.find_complex_functions(
-                complexity_threshold=threshold
-            )
+            cache_key = ("complex_functions", threshold)
+            complex_functions = _ANALYSIS_CACHE.get(cache_key)
+            if complex_functions is None:
+                complex_functions = code_service.query_service.find_complex_functions(
+                    complexity_threshold=threshold
+                )
+                _ANALYSIS_CACHE.set(cache_key, complex_functions)
             
             # Apply module pattern filter if specified
             if module_pattern:
@@ -4660,39 +4729,36 @@ async def handle_analyze_cross_module_dependencies(arguments: Dict[str, Any]) ->
                     text=f"No complex functions found matching criteria"
                 )]
             
-            result_text += f"Found {len(complex_functions)} complex functions:\n\n"
+            parts.append(f"Found {len(complex_functions)} complex functions:\n\n")
             
             for func_data in complex_functions:
                 func = func_data["function"]
                 metrics = func_data["metrics"]
                 
-                result_text += f"• {func['name']}"
+                parts.append(f"• {func['name']}")
                 if func.get("module"):
-                    result_text += f" (in {func['module']})"
-                result_text += f"\n"
+                    parts.append(f" (in {func['module']})")
+                parts.append(f"\n")
                 
                 if include_metrics:
-                    result_text += f"    Cyclomatic Complexity: {metrics['cyclomatic_complexity']}\n"
-                    result_text += f"    Dependencies: {metrics['dependency_count']}\n"
-                    result_text += f"    Nested Functions: {metrics['nested_functions']}\n"
-                    result_text += f"    Total Complexity: {metrics['total_complexity']}\n"
+                    parts.append(f"    Cyclomatic Complexity: {metrics['cyclomatic_complexity']}\n")
+                    parts.append(f"    Dependencies: {metrics['dependency_count']}\n")
+                    parts.append(f"    Nested Functions: {metrics['nested_functions']}\n")
+                    parts.append(f"    Total Complexity: {metrics['total_complexity']}\n")
                 
-                result_text += "\n"
+                parts.append("\n")
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
             text=f"Error analyzing cross-module dependencies: {e}"
         )]
 
-async def handle_enhanced_function_call_graph(arguments: Dict[str, Any]) -> List[types.TextContent]:
+def handle_enhanced_function_call_graph(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Generate enhanced function call graphs with advanced options"""
     if not code_service.initialized:
-        return [types.TextContent(
-            type="text",
-            text="Error: Database not initialized. Check that FDEP_PATH is configured and restart the server."
-        )]
+        return _NOT_INITIALIZED_RESPONSE
     
     function_name = arguments["function_name"]
     module_name = arguments.get("module_name")
@@ -4705,7 +4771,7 @@ async def handle_enhanced_function_call_graph(arguments: Dict[str, Any]) -> List
         # Get the target function
         module_id = None
         if module_name:
-            module = code_service.query_service.get_module_by_name(module_name)
+            module = code_service.get_module_by_name(module_name)
             if not module:
                 return [types.TextContent(
                     type="text",
@@ -4734,16 +4800,16 @@ async def handle_enhanced_function_call_graph(arguments: Dict[str, Any]) -> List
                 text=f"No call graph available for function '{function_name}'"
             )]
         
-        result_text = f"Enhanced Call Graph for '{target_function.name}' (depth: {max_depth}, format: {graph_format}):\n\n"
+        parts = [f"Enhanced Call Graph for '{target_function.name}' (depth: {max_depth}, format: {graph_format}):\n\n"]
         
         if graph_format == "tree":
-            result_text += _format_call_graph_tree(call_graph, include_signatures, filter_modules, 0)
+            parts.append(_format_call_graph_tree(call_graph, include_signatures, filter_modules, 0))
         elif graph_format == "flat":
-            result_text += _format_call_graph_flat(call_graph, include_signatures, filter_modules)
+            parts.append(_format_call_graph_flat(call_graph, include_signatures, filter_modules))
         else:  # graph format
-            result_text += _format_call_graph_graph(call_graph, include_signatures, filter_modules)
+            parts.append(_format_call_graph_graph(call_graph, include_signatures, filter_modules))
         
-        return [types.TextContent(type="text", text=result_text)]
+        return [types.TextContent(type="text", text="".join(parts))]
     except Exception as e:
         return [types.TextContent(
             type="text",
@@ -4752,118 +4818,176 @@ async def handle_enhanced_function_call_graph(arguments: Dict[str, Any]) -> List
 
 def _format_call_graph_tree(node, include_signatures, filter_modules, indent_level):
     """Format call graph as a tree structure"""
-    indent = "  " * indent_level
-    result = f"{indent}• {node.get('name', 'Unknown')}"
-    
-    if node.get('module'):
-        # Apply module filter if specified
-        if filter_modules and not any(pattern in node['module'] for pattern in filter_modules):
-            return ""
-        result += f" (in {node['module']})"
-    
-    if include_signatures and 'signature' in node:
-        result += f" :: {node['signature']}"
+    # Every node appends to one shared list, so deep trees aren't re-copied
+    # into each ancestor's string on the way back up
+    lines = []
     
-    result += "\n"
-    
-    # Process called functions
-    calls = node.get('calls', [])
-    if calls:
-        for call in calls:
-            child_result = _format_call_graph_tree(call, include_signatures, filter_modules, indent_level + 1)
-            if child_result:  # Only add if not filtered out
-                result += child_result
+    def collect_tree(current_node, depth):
+        module = current_node.get('module')
+        
+        # Apply module filter if specified; a filtered node drops its subtree
+        if module and filter_modules and not any(pattern in module for pattern in filter_modules):
+            return
+        
+        line = f"{'  ' * depth}• {current_node.get('name', 'Unknown')}"
+        if module:
+            line += f" (in {module})"
+        if include_signatures and 'signature' in current_node:
+            line += f" :: {current_node['signature']}"
+        lines.append(line)
+        
+        # Process called functions
+        for call in current_node.get('calls') or ():
+            collect_tree(call, depth + 1)
     
-    return result
+    collect_tree(node, indent_level)
+    return "".join(line + "\n" for line in lines)
 
 def _format_call_graph_flat(node, include_signatures, filter_modules):
     """Format call graph as a flat list"""
-    result = ""
+    lines = []
     visited = set()
     
     def collect_functions(current_node, depth=0):
-        nonlocal result, visited
-        
         func_id = current_node.get('id', current_node.get('name', 'unknown'))
         if func_id in visited:
             return
         visited.add(func_id)
         
         # Apply module filter if specified
-        if filter_modules and current_node.get('module'):
-            if not any(pattern in current_node['module'] for pattern in filter_modules):
+        module = current_node.get('module')
+        if filter_modules and module:
+            if not any(pattern in module for pattern in filter_modules):
                 return
         
-        prefix = "  " * depth
-        result += f"{prefix}• {current_node.get('name', 'Unknown')}"
-        
-        if current_node.get('module'):
-            result += f" (in {current_node['module']})"
-        
+        line = f"{'  ' * depth}• {current_node.get('name', 'Unknown')}"
+        if module:
+            line += f" (in {module})"
         if include_signatures and 'signature' in current_node:
-            result += f" :: {current_node['signature']}"
-        
-        result += "\n"
+            line += f" :: {current_node['signature']}"
+        lines.append(line)
         
         # Process called functions
-        calls = current_node.get('calls', [])
-        for call in calls:
+        for call in current_node.get('calls') or ():
             collect_functions(call, depth + 1)
     
     collect_functions(node)
-    return result
+    return "".join(line + "\n" for line in lines)
 
 def _format_call_graph_graph(node, include_signatures, filter_modules):
     """Format call graph as a graph with connections"""
-    result = "Nodes:\n"
+    lines = ["Nodes:"]
     connections = []
     visited = set()
     
     def collect_graph_data(current_node):
-        nonlocal result, connections, visited
-        
         func_id = current_node.get('id', current_node.get('name', 'unknown'))
         if func_id in visited:
             return
         visited.add(func_id)
         
         # Apply module filter if specified
-        if filter_modules and current_node.get('module'):
-            if not any(pattern in current_node['module'] for pattern in filter_modules):
+        module = current_node.get('module')
+        if filter_modules and module:
+            if not any(pattern in module for pattern in filter_modules):
                 return
         
         # Add node
-        result += f"  {current_node.get('name', 'Unknown')}"
-        if current_node.get('module'):
-            result += f" (in {current_node['module']})"
+        line = f"  {current_node.get('name', 'Unknown')}"
+        if module:
+            line += f" (in {module})"
         if include_signatures and 'signature' in current_node:
-            result += f" :: {current_node['signature']}"
-        result += "\n"
+            line += f" :: {current_node['signature']}"
+        lines.append(line)
         
         # Collect connections
-        calls = current_node.get('calls', [])
-        for call in calls:
-            caller_name = current_node.get('name', 'Unknown')
-            callee_name = call.get('name', 'Unknown')
-            connections.append(f"  {caller_name} → {callee_name}")
+        caller_name = current_node.get('name', 'Unknown')
+        for call in current_node.get('calls') or ():
+            connections.append(f"  {caller_name} → {call.get('name', 'Unknown')}")
             collect_graph_data(call)
     
     collect_graph_data(node)
     
     if connections:
-        result += "\nConnections:\n"
-        for connection in connections:
-            result += connection + "\n"
+        lines.append("\nConnections:")
+        lines.extend(connections)
     
-    return result
+    return "".join(line + "\n" for line in lines)
+
+# Tool name -> handler, built once after all handlers are defined
+_DISPATCH = {
+    "list_modules": handle_list_modules,
+    "get_function_details": handle_get_function_details,
+    "search_functions": handle_search_functions,
+    "get_most_called_functions": handle_get_most_called_functions,
+    "execute_query": handle_execute_query,
+    # Phase 1: Module Enhancement Tools
+    "get_module_details": handle_get_module_details,
+    "get_functions_by_module": handle_get_functions_by_module,
+    "search_modules": handle_search_modules,
+    "get_module_dependencies": handle_get_module_dependencies,
+    # Phase 1: Function Analysis Enhancement Tools
+    "get_function_call_graph": handle_get_function_call_graph,
+    "get_function_callers": handle_get_function_callers,
+    "get_function_callees": handle_get_function_callees,
+    # Phase 1: Advanced Query Capabilities Tools
+    "execute_advanced_query": handle_execute_advanced_query,
+    "find_cross_module_calls": handle_find_cross_module_calls,
+    "analyze_function_complexity": handle_analyze_function_complexity,
+    "get_code_statistics": handle_get_code_statistics,
+    # Phase 2: Type System Analysis Tools
+    "list_types": handle_list_types,
+    "get_type_details": handle_get_type_details,
+    "search_types": handle_search_types,
+    "get_type_dependencies": handle_get_type_dependencies,
+    "analyze_type_usage": handle_analyze_type_usage,
+    # Phase 2: Class Analysis Tools
+    "list_classes": handle_list_classes,
+    "get_class_details": handle_get_class_details,
+    "search_classes": handle_search_classes,
+    # Phase 2: Import Analysis Tools
+    "analyze_imports": handle_analyze_imports,
+    "get_import_graph": handle_get_import_graph,
+    "find_unused_imports": handle_find_unused_imports,
+    "get_import_details": handle_get_import_details,
+    # Phase 1: Advanced Pattern Analysis Tools
+    "find_similar_functions": handle_find_similar_functions,
+    "find_code_patterns": handle_find_code_patterns,
+    "group_similar_functions": handle_group_similar_functions,
+    # Phase 1: Advanced Type Analysis Tools
+    "build_type_dependency_graph": handle_build_type_dependency_graph,
+    "get_nested_types": handle_get_nested_types,
+    "analyze_type_relationships": handle_analyze_type_relationships,
+    # Phase 1: Source Location Tools
+    "find_element_by_location": handle_find_element_by_location,
+    "get_location_context": handle_get_location_context,
+    # Phase 1: Function Context Tools
+    "get_function_context": handle_get_function_context,
+    "generate_function_imports": handle_generate_function_imports,
+    # Phase 2: Enhanced Query Capabilities Tools
+    "execute_custom_query": handle_execute_custom_query,
+    "pattern_match_code": handle_pattern_match_code,
+    "analyze_cross_module_dependencies": handle_analyze_cross_module_dependencies,
+    "enhanced_function_call_graph": handle_enhanced_function_call_graph,
+}
+
+# Fail at import rather than on first call if a listed tool has no handler
+_unhandled_tools = {tool.name for tool in _TOOLS} - _DISPATCH.keys()
+if _unhandled_tools:
+    raise RuntimeError(f"No handler registered for tools: {sorted(_unhandled_tools)}")
 
 
+# Caps how many tool calls run at once; created in main() because anyio
+# limiters need a running event loop
+_tool_limiter = None
 
 async def main():
     """Main entry point for the MCP server"""
+    global _tool_limiter
     logger.debug("main() function called")
     try:
         logger.info("Starting FDEP MCP Server")
+        config.log_summary(logger)
         logger.debug("FDEP MCP Server startup initiated")
         
         # Initialize code service (database connection only)
@@ -4873,6 +4997,11 @@ async def main():
         else:
             logger.warning("Failed to initialize code analysis service - tools will show errors")
         
+        # Concurrent calls beyond the connection pool would only queue for a connection
+        _tool_limiter = anyio.CapacityLimiter(
+            min(32, (os.cpu_count() or 1) * 2, config.db_pool_size + config.db_max_overflow)
+        )
+        
         logger.info("Starting MCP protocol server...")
         logger.debug("Creating stdio server context...")
         
@@ -6,7 +6,6 @@ import os
 import sys
 import argparse
 import time
-from dotenv import load_dotenv
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
@@ -17,7 +16,9 @@ from code_as_data.db.models import *
 from code_as_data.services.dump_service import DumpService
 from sqlalchemy import text
 
-from fdep_mcp.config import config  # Add the project root to the path
+from fdep_mcp.config import get_config  # Add the project root to the path
+
+config = get_config()
 
 def setup_database(drop_tables: bool = False, verbose: bool = False):
     """